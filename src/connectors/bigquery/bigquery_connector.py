@@ -1,45 +1,284 @@
+import datetime
+import uuid
+
+import google.auth
 from google.cloud import bigquery
+from google.oauth2 import service_account
 import pandas as pd
+import pyarrow as pa
+
+from src.connectors.bigquery.job_scheduler import (
+    PRIORITY_BLOCKING,
+    PRIORITY_PREFETCH,
+    BigQueryJobScheduler,
+    BigQueryQueryError,
+    QuotaExceededError,
+)
+from src.connectors.bigquery.query_builder import PartitionAwareQueryBuilder
+from src.connectors.compaction import arrow_types_mapper, compact_dataframe
+from src.connectors.materialized_table import MaterializedTable
+from src.data_quality.schema_alignment import SOURCE_SCHEMA_ATTR, bigquery_schema
+
+try:
+    from google.cloud import bigquery_storage
+except ImportError:  # Optional: results are then downloaded through the REST API
+    bigquery_storage = None
 
 
 class BigQueryConnectorContextManager:
-    def __init__(self, project_id: str, credentials_path: str = None):
+    dialect = "bigquery"
+
+    def __init__(
+            self,
+            project_id: str,
+            credentials_path: str = None,
+            max_concurrent_jobs: int = 20,
+            batch_priority: bool = False,
+            temp_dataset: str = None,
+            check_window: dict = None,
+            require_pruning: bool = False,
+            max_scan_bytes: int = None
+    ):
         """
         :param project_id: Google Cloud project ID
         :param credentials_path: Path to service account JSON file (optional).
                                  If not provided, GCP default credentials will be used.
+        :param max_concurrent_jobs: Maximum number of query jobs in flight; the actual limit adapts
+                                    downwards when BigQuery reports rate limits or quota errors.
+        :param batch_priority: Run queries with BATCH instead of INTERACTIVE priority
+                               (for non-urgent runs; batch jobs do not count against the interactive quota).
+        :param temp_dataset: Dataset ("dataset" or "project.dataset") for tables created by `materialize`.
+                             If not provided, query results are kept in BigQuery's anonymous result tables.
+        :param check_window: Partitions checks read from time-partitioned tables: {"days": N} or
+                             {"start": ..., "end": ...} (see `PartitionAwareQueryBuilder`).
+        :param require_pruning: Refuse check queries on partitioned tables that cannot be restricted
+                                to the check window instead of scanning all partitions.
+        :param max_scan_bytes: Maximum bytes billed per query; BigQuery fails larger queries without running them.
         """
         self.project_id = project_id
         self.credentials_path = credentials_path
+        self.batch_priority = batch_priority
+        self.credentials = None
         self.client = None
+        self.bqstorage_client = None
+        self.temp_dataset = temp_dataset
+        self.check_window = check_window
+        self.require_pruning = require_pruning
+        self.max_scan_bytes = max_scan_bytes
+        self.query_builder = None
+        self.scheduler = BigQueryJobScheduler(max_concurrent_jobs=max_concurrent_jobs)
+        self._materialized = {}
 
     def __enter__(self):
         try:
             if self.credentials_path:
-                self.client = bigquery.Client.from_service_account_json(
-                    self.credentials_path,
-                    project=self.project_id
-                )
+                self.credentials = service_account.Credentials.from_service_account_file(self.credentials_path)
             else:
                 # Uses environment or workstation credentials
-                self.client = bigquery.Client(project=self.project_id)
+                self.credentials, _ = google.auth.default()
+            self.client = bigquery.Client(project=self.project_id, credentials=self.credentials)
+            self.query_builder = PartitionAwareQueryBuilder(
+                self.client,
+                window=self.check_window,
+                require_pruning=self.require_pruning
+            )
 
             return self
 
         except Exception as e:
             raise ConnectionError(f"Failed to connect to BigQuery: {e}")
 
+    @property
+    def source_id(self) -> tuple:
+        """Identifies the engine a query runs on; equal ids can be joined in one SQL statement."""
+        return self.dialect, self.project_id
+
     def __exit__(self, exc_type, exc_value, exc_tb):
+        self.scheduler.shutdown()
+        if self.client and self.temp_dataset:
+            for handle in self._materialized.values():
+                self.client.delete_table(handle.table_name, not_found_ok=True)
+        self._materialized.clear()
+        if self.bqstorage_client:
+            self.bqstorage_client.transport.close()
         if self.client:
             self.client.close()
 
-    def get_data_sql(self, sql: str) -> pd.DataFrame:
+    def _get_bqstorage_client(self):
+        """Lazily create the BigQuery Storage read client (None if the package is missing)."""
+        if self.bqstorage_client is None and bigquery_storage is not None:
+            # Same credentials as the main client
+            self.bqstorage_client = bigquery_storage.BigQueryReadClient(credentials=self.credentials)
+        return self.bqstorage_client
+
+    def _run_query(self, sql: str, priority: int = PRIORITY_BLOCKING, destination: str = None,
+                   dry_run: bool = False):
+        """
+        Runs a query job through the job scheduler and waits for it to finish.
+
+        Args:
+            sql (str): Query to run.
+            priority (int, optional): Scheduler priority, PRIORITY_BLOCKING by default.
+            destination (str, optional): Table to write the result to (overwritten if it exists).
+            dry_run (bool, optional): Only validate the query and estimate the bytes it would process.
+
+        Returns:
+            bigquery.QueryJob: The finished job, ready for downloading its result.
+
+        Raises:
+            QuotaExceededError: If the job kept hitting rate limits after all retries.
+            BigQueryQueryError: If the job failed for any other reason.
+        """
+        job_config = bigquery.QueryJobConfig(
+            priority=bigquery.QueryPriority.BATCH if self.batch_priority else bigquery.QueryPriority.INTERACTIVE
+        )
+        if dry_run:
+            job_config.dry_run = True
+            job_config.use_query_cache = False
+        elif self.max_scan_bytes:
+            job_config.maximum_bytes_billed = self.max_scan_bytes
+        if destination:
+            job_config.destination = destination
+            job_config.write_disposition = bigquery.WriteDisposition.WRITE_TRUNCATE
+
+        def job():
+            query_job = self.client.query(sql, job_config=job_config)
+            if not dry_run:
+                query_job.result()
+            return query_job
+
+        try:
+            return self.scheduler.run(job, priority)
+        except QuotaExceededError:
+            raise
+        except Exception as e:
+            raise BigQueryQueryError(f"Failed to execute SQL query: {e}") from e
+
+    def table_expression(self, table_name: str) -> str:
+        """FROM-clause expression for a table, restricted to the check window if it is partitioned."""
+        return self.query_builder.table_expression(table_name)
+
+    def select_sql(self, table_name: str, columns: list = None, where: str = None) -> str:
+        """
+        Query reading only the given columns of a table, within the check window if it is partitioned.
+
+        Args:
+            table_name (str): Full table name.
+            columns (list, optional): Columns to read. If None, all columns are read.
+            where (str, optional): Additional SQL filter condition.
+
+        Returns:
+            str: The query.
+
+        Raises:
+            UnprunedQueryError: If the table is partitioned, the window does not apply to it and
+                pruning is required.
+        """
+        return self.query_builder.select(table_name, columns, where)
+
+    def get_data_sql(self, sql: str, compact: bool = False) -> pd.DataFrame:
         """
         Executes a SQL query on BigQuery and returns a pandas DataFrame.
+
+        With `compact=True` the result is fetched as Arrow and converted without Python string
+        objects, low-cardinality columns become categoricals and integers are downcast
+        (see `compact_dataframe`); the per-column footprint is in `df.attrs["memory_footprint"]`.
+        The BigQuery column types are kept in `df.attrs["source_schema"]` for type alignment.
         """
+        return self._get_data(sql, compact, PRIORITY_BLOCKING)
+
+    def _get_data(self, sql: str, compact: bool, priority: int) -> pd.DataFrame:
+        query_job = self._run_query(sql, priority)
         try:
-            query_job = self.client.query(sql)
-            df = query_job.to_dataframe()
+            rows = query_job.result()
+            if compact:
+                table = rows.to_arrow(bqstorage_client=self._get_bqstorage_client())
+                df = compact_dataframe(table.to_pandas(types_mapper=arrow_types_mapper))
+            else:
+                df = rows.to_dataframe()
+            df.attrs[SOURCE_SCHEMA_ATTR] = bigquery_schema(rows.schema)
             return df
         except Exception as e:
-            raise RuntimeError(f"Failed to execute SQL query: {e}")
+            raise BigQueryQueryError(f"Failed to download query result: {e}") from e
+
+    def prefetch(self, sql: str, compact: bool = False):
+        """
+        Starts a query in the background with prefetch priority, behind any query a test is waiting for.
+
+        Returns:
+            concurrent.futures.Future: Resolves to the same DataFrame `get_data_sql` would return.
+        """
+        return self.scheduler.submit(self._get_data, sql, compact, PRIORITY_PREFETCH)
+
+    def materialize(self, sql: str, expiration_hours: int = 24) -> MaterializedTable:
+        """
+        Runs an expensive query once per session and keeps its result in a temporary table.
+
+        The result is written to a table in `temp_dataset` that expires after `expiration_hours`
+        and is deleted when the connector exits; without `temp_dataset` BigQuery's anonymous
+        result table of the query job is used (it expires on its own after about 24 hours).
+        Materializing the same SQL again returns the existing handle.
+
+        Args:
+            sql (str): Query to materialize.
+            expiration_hours (int, optional): Lifetime of the temporary table. Default is 24.
+
+        Returns:
+            MaterializedTable: Handle for cheap follow-up queries on the result.
+        """
+        if sql in self._materialized:
+            return self._materialized[sql]
+
+        destination = None
+        if self.temp_dataset:
+            dataset = self.temp_dataset if "." in self.temp_dataset else f"{self.project_id}.{self.temp_dataset}"
+            destination = f"{dataset}.dq_tmp_{uuid.uuid4().hex}"
+        query_job = self._run_query(sql, destination=destination)
+
+        if destination:
+            table = self.client.get_table(destination)
+            table.expires = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(hours=expiration_hours)
+            self.client.update_table(table, ["expires"])
+        else:
+            dest = query_job.destination
+            destination = f"{dest.project}.{dest.dataset_id}.{dest.table_id}"
+
+        handle = MaterializedTable(self, destination, sql)
+        self._materialized[sql] = handle
+        return handle
+
+    def dry_run(self, sql: str) -> int:
+        """Bytes a query would process, from a BigQuery dry run (nothing is billed or executed)."""
+        return self._run_query(sql, dry_run=True).total_bytes_processed
+
+    def get_arrow_sql(self, sql: str) -> pa.Table:
+        """
+        Executes a SQL query on BigQuery and returns the result as a pyarrow Table, read through
+        the BigQuery Storage API when available. The Table can be passed to `DataQualityLibrary`
+        checks directly, without conversion to pandas.
+        """
+        query_job = self._run_query(sql)
+        try:
+            return query_job.to_arrow(bqstorage_client=self._get_bqstorage_client())
+        except Exception as e:
+            raise BigQueryQueryError(f"Failed to download query result: {e}") from e
+
+    def iter_data_sql(self, sql: str, chunk_size: int = 100_000):
+        """
+        Executes a SQL query on BigQuery and yields the result as pandas DataFrame chunks,
+        so large results never have to be held in memory at once. Rows are read through the
+        BigQuery Storage API when google-cloud-bigquery-storage is installed.
+
+        Args:
+            sql (str): Query to execute.
+            chunk_size (int, optional): Rows fetched per page. Default is 100 000.
+
+        Yields:
+            pd.DataFrame: Consecutive chunks of the result.
+        """
+        rows = self._run_query(sql).result(page_size=chunk_size)
+        try:
+            for df in rows.to_dataframe_iterable(bqstorage_client=self._get_bqstorage_client()):
+                yield df
+        except Exception as e:
+            raise BigQueryQueryError(f"Failed to download query result: {e}") from e
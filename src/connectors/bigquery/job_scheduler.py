@@ -0,0 +1,145 @@
+import heapq
+import itertools
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+# Job priorities: lower runs first
+PRIORITY_BLOCKING = 0  # a test is waiting for the result
+PRIORITY_PREFETCH = 1  # result is only needed later
+
+# Transient limits worth retrying; `quotaExceeded` (e.g. daily bytes quota) will not clear on its own
+RATE_LIMIT_REASONS = {"rateLimitExceeded", "jobRateLimitExceeded"}
+
+
+class BigQueryQueryError(RuntimeError):
+    """A BigQuery query failed."""
+
+
+class QuotaExceededError(BigQueryQueryError):
+    """A BigQuery query kept hitting rate limits after all retries."""
+
+
+def is_rate_limit_error(error: Exception) -> bool:
+    """True for errors BigQuery returns when a rate limit is hit; exhausted quotas are not retried."""
+    # Deferred: google.api_core pulls in grpc, which test collection does not need
+    from google.api_core import exceptions as api_exceptions
+
+    reasons = {err.get("reason") for err in getattr(error, "errors", None) or [] if isinstance(err, dict)}
+    if "quotaExceeded" in reasons:
+        return False
+    return isinstance(error, api_exceptions.TooManyRequests) or bool(reasons & RATE_LIMIT_REASONS)
+
+
+class BigQueryJobScheduler:
+    """
+    Limits the number of BigQuery jobs in flight and retries jobs rejected by rate limits.
+
+    The concurrency limit adapts like TCP congestion control: it grows by one after a full
+    window of successful jobs and is halved whenever BigQuery answers with
+    `rateLimitExceeded`/`jobRateLimitExceeded`, after which the job is retried with exponential
+    backoff and full jitter. Waiting jobs are admitted by priority, so jobs a test is blocked
+    on go ahead of prefetch jobs.
+    """
+
+    def __init__(
+            self,
+            max_concurrent_jobs: int = 20,
+            min_concurrent_jobs: int = 1,
+            max_retries: int = 8,
+            base_delay: float = 1.0,
+            max_delay: float = 64.0
+    ):
+        """
+        :param max_concurrent_jobs: Upper bound for jobs in flight (project concurrent query quota).
+        :param min_concurrent_jobs: Lower bound the adaptive limit never drops below.
+        :param max_retries: Retries of a rate-limited job before giving up.
+        :param base_delay: First backoff delay in seconds.
+        :param max_delay: Maximum backoff delay in seconds.
+        """
+        self.max_concurrent_jobs = max_concurrent_jobs
+        self.min_concurrent_jobs = min_concurrent_jobs
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+
+        self.limit = max_concurrent_jobs
+        self.in_flight = 0
+        self._successes = 0
+        self._waiting = []
+        self._sequence = itertools.count()
+        self._condition = threading.Condition()
+        self._executor = None
+
+    def _acquire(self, priority: int):
+        with self._condition:
+            ticket = (priority, next(self._sequence))
+            heapq.heappush(self._waiting, ticket)
+            while not (self.in_flight < self.limit and self._waiting[0] == ticket):
+                self._condition.wait()
+            heapq.heappop(self._waiting)
+            self.in_flight += 1
+            # The next waiter may fit as well
+            self._condition.notify_all()
+
+    def _release(self, rate_limited: bool):
+        with self._condition:
+            self.in_flight -= 1
+            if rate_limited:
+                self.limit = max(self.min_concurrent_jobs, self.limit // 2)
+                self._successes = 0
+            else:
+                self._successes += 1
+                if self._successes >= self.limit and self.limit < self.max_concurrent_jobs:
+                    self.limit += 1
+                    self._successes = 0
+            self._condition.notify_all()
+
+    def run(self, job, priority: int = PRIORITY_BLOCKING):
+        """
+        Run `job()` once a slot is free, retrying it while BigQuery rejects it with a rate limit.
+
+        Args:
+            job (callable): Starts a BigQuery job and waits for it to finish.
+            priority (int, optional): PRIORITY_BLOCKING (default) or PRIORITY_PREFETCH.
+
+        Returns:
+            The return value of `job()`.
+
+        Raises:
+            QuotaExceededError: If the job is still rate-limited after `max_retries` retries.
+        """
+        for attempt in range(self.max_retries + 1):
+            self._acquire(priority)
+            try:
+                result = job()
+            except Exception as e:
+                self._release(rate_limited=is_rate_limit_error(e))
+                if not is_rate_limit_error(e):
+                    raise
+                if attempt == self.max_retries:
+                    raise QuotaExceededError(
+                        f"BigQuery rate limit still exceeded after {self.max_retries} retries: {e}"
+                    ) from e
+                time.sleep(random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt)))
+            else:
+                self._release(rate_limited=False)
+                return result
+
+    def submit(self, task, *args):
+        """
+        Run `task(*args)` on a background thread; returns a `concurrent.futures.Future`.
+        The task takes its job slots through `run` itself, typically with PRIORITY_PREFETCH.
+        """
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrent_jobs, thread_name_prefix="bq-job"
+            )
+        return self._executor.submit(task, *args)
+
+    def shutdown(self):
+        """Wait for background jobs and release their threads."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=True)
+            self._executor = None
@@ -0,0 +1,177 @@
+import datetime
+import threading
+
+from src.connectors.bigquery.job_scheduler import BigQueryQueryError
+
+# Literal type of the partition filter bound, by partition column type
+_BOUND_TYPES = {"TIMESTAMP": "TIMESTAMP", "DATE": "DATE", "DATETIME": "DATETIME"}
+
+
+class UnprunedQueryError(BigQueryQueryError):
+    """A query on a partitioned table would scan every partition and pruning is required."""
+
+
+class TableLayout:
+    """Partitioning and clustering of a BigQuery table, read from its metadata."""
+
+    def __init__(self, table):
+        """
+        :param table: `google.cloud.bigquery.Table` as returned by `client.get_table`.
+        """
+        self.table_name = f"{table.project}.{table.dataset_id}.{table.table_id}"
+        self.column_types = {field.name: field.field_type.upper() for field in table.schema}
+        self.clustering_fields = list(table.clustering_fields or [])
+        self.require_partition_filter = bool(table.require_partition_filter)
+        self.partition_type = None
+        self.partition_column = None
+        if table.time_partitioning is not None:
+            self.partition_type = table.time_partitioning.type_
+            # Ingestion-time partitioned tables are filtered on the pseudo column
+            self.partition_column = table.time_partitioning.field or "_PARTITIONTIME"
+        elif table.range_partitioning is not None:
+            self.partition_type = "RANGE"
+            self.partition_column = table.range_partitioning.field
+
+    @property
+    def is_partitioned(self) -> bool:
+        return self.partition_column is not None
+
+    @property
+    def partition_column_type(self) -> str:
+        if self.partition_column == "_PARTITIONTIME":
+            return "TIMESTAMP"
+        return self.column_types.get(self.partition_column)
+
+    def describe(self) -> str:
+        """One-line summary, e.g. "partitioned by bq_load_dttm (DAY), clustered by Code"."""
+        parts = [
+            f"partitioned by {self.partition_column} ({self.partition_type})" if self.is_partitioned
+            else "not partitioned"
+        ]
+        if self.clustering_fields:
+            parts.append(f"clustered by {', '.join(self.clustering_fields)}")
+        return ", ".join(parts)
+
+
+class PartitionAwareQueryBuilder:
+    """
+    Builds the queries checks run on BigQuery tables so that they scan only the partitions of
+    the configured check window and only the columns they select.
+
+    The window applies to time-partitioned tables (column or ingestion time). Tables that are
+    not partitioned, or are partitioned by an integer range, are queried in full. With
+    `require_pruning` a query on a partitioned table that cannot be restricted to the window
+    is refused instead of scanning every partition; tables created with
+    `require_partition_filter` are always treated that way, as BigQuery would reject the query.
+    """
+
+    def __init__(self, client, window: dict = None, require_pruning: bool = False):
+        """
+        :param client: `google.cloud.bigquery.Client` used to read table metadata.
+        :param window: Check window, either {"days": N} (partitions of the last N days up to now)
+                       or {"start": ..., "end": ...} (dates or timestamps; `end` is exclusive and optional).
+        :param require_pruning: Refuse queries on partitioned tables no partition filter can be added to.
+        """
+        self.client = client
+        self.window = window or {}
+        self.require_pruning = require_pruning
+        self._layouts = {}
+        self._lock = threading.Lock()
+
+    def layout(self, table_name: str) -> TableLayout:
+        """Partitioning and clustering of a table, read once per table and session."""
+        with self._lock:
+            layout = self._layouts.get(table_name)
+        if layout is None:
+            # Fetched outside the lock, so other tables are not held up; a concurrent first
+            # fetch of the same table just yields the same layout twice
+            layout = TableLayout(self.client.get_table(table_name))
+            with self._lock:
+                layout = self._layouts.setdefault(table_name, layout)
+        return layout
+
+    def window_bounds(self) -> tuple:
+        """Start and (exclusive, possibly None) end of the check window as datetimes; (None, None) without a window."""
+        if "days" in self.window:
+            today = datetime.datetime.now(datetime.timezone.utc).replace(hour=0, minute=0, second=0, microsecond=0)
+            return today - datetime.timedelta(days=int(self.window["days"]) - 1), None
+        start, end = self.window.get("start"), self.window.get("end")
+        return _as_datetime(start), _as_datetime(end)
+
+    def partition_filter(self, table_name: str):
+        """
+        SQL condition restricting a table to the partitions of the check window.
+
+        Returns:
+            str: The condition, or None if the table is not partitioned by time or there is no window.
+        """
+        layout = self.layout(table_name)
+        bound_type = _BOUND_TYPES.get(layout.partition_column_type)
+        start, end = self.window_bounds()
+        if bound_type is None or (start is None and end is None):
+            return None
+        column = layout.partition_column if layout.partition_column == "_PARTITIONTIME" \
+            else f"`{layout.partition_column}`"
+        conditions = []
+        if start is not None:
+            conditions.append(f"{column} >= {_bound_literal(bound_type, start)}")
+        if end is not None:
+            conditions.append(f"{column} < {_bound_literal(bound_type, end)}")
+        return " AND ".join(conditions)
+
+    def table_expression(self, table_name: str) -> str:
+        """
+        FROM-clause expression for a table: the table itself, or a subquery restricted to the
+        check window if the table is partitioned. BigQuery prunes both the partitions and the
+        columns through the subquery, so only columns the outer query references are scanned.
+
+        Raises:
+            UnprunedQueryError: If the table is partitioned, no window filter applies to it and
+                pruning is required.
+        """
+        layout = self.layout(table_name)
+        condition = self.partition_filter(table_name)
+        if condition is None:
+            if layout.is_partitioned and (self.require_pruning or layout.require_partition_filter):
+                raise UnprunedQueryError(
+                    f"Query on {table_name} ({layout.describe()}) would scan all partitions: "
+                    f"configure a check_window that restricts {layout.partition_column}"
+                )
+            return f"`{table_name}`"
+        return f"(SELECT * FROM `{table_name}` WHERE {condition})"
+
+    def select(self, table_name: str, columns: list = None, where: str = None) -> str:
+        """
+        Query reading the given columns of a table within the check window.
+
+        Args:
+            table_name (str): Full table name.
+            columns (list, optional): Columns to read. If None, all columns are read.
+            where (str, optional): Additional SQL filter condition.
+
+        Returns:
+            str: The query.
+        """
+        select_list = ", ".join(f"`{col}`" for col in columns) if columns else "*"
+        sql = f"SELECT {select_list} FROM {self.table_expression(table_name)}"
+        if where:
+            sql += f" WHERE {where}"
+        return sql
+
+
+def _as_datetime(value):
+    if value is None or isinstance(value, datetime.datetime):
+        return value
+    if isinstance(value, datetime.date):
+        return datetime.datetime.combine(value, datetime.time())
+    return datetime.datetime.fromisoformat(str(value))
+
+
+def _bound_literal(bound_type: str, value: datetime.datetime) -> str:
+    if bound_type == "DATE":
+        return f"DATE '{value.date().isoformat()}'"
+    if bound_type == "DATETIME":
+        return f"DATETIME '{value.replace(tzinfo=None).isoformat(sep=' ')}'"
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=datetime.timezone.utc)
+    return f"TIMESTAMP '{value.isoformat(sep=' ')}'"
@@ -0,0 +1,93 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+STRING_DTYPE = pd.StringDtype("pyarrow")
+
+_INT_TYPES = [
+    (np.int8, "Int8", pa.int8()),
+    (np.int16, "Int16", pa.int16()),
+    (np.int32, "Int32", pa.int32()),
+    (np.int64, "Int64", pa.int64()),
+]
+
+
+# Nullable pandas dtypes for Arrow integers and booleans, as `QueryJob.to_dataframe` uses them:
+# columns with nulls stay integer (instead of float64, which loses precision above 2**53)
+_NULLABLE_DTYPES = {
+    pa.int8(): pd.Int8Dtype(), pa.int16(): pd.Int16Dtype(), pa.int32(): pd.Int32Dtype(), pa.int64(): pd.Int64Dtype(),
+    pa.uint8(): pd.UInt8Dtype(), pa.uint16(): pd.UInt16Dtype(), pa.uint32(): pd.UInt32Dtype(),
+    pa.uint64(): pd.UInt64Dtype(), pa.bool_(): pd.BooleanDtype(),
+}
+
+
+def arrow_types_mapper(arrow_type):
+    """
+    `types_mapper` for `pyarrow.Table.to_pandas` that keeps strings Arrow-backed instead of Python
+    objects and maps integers and booleans to pandas nullable dtypes.
+    """
+    if pa.types.is_string(arrow_type) or pa.types.is_large_string(arrow_type):
+        return STRING_DTYPE
+    return _NULLABLE_DTYPES.get(arrow_type)
+
+
+def _smallest_int_dtype(series: pd.Series):
+    """Smallest signed integer dtype holding the observed range, in the same dtype family."""
+    if series.dropna().empty:
+        return None
+    low, high = int(series.min()), int(series.max())
+    for numpy_type, nullable_name, arrow_type in _INT_TYPES:
+        info = np.iinfo(numpy_type)
+        if info.min <= low and high <= info.max:
+            if isinstance(series.dtype, pd.ArrowDtype):
+                return pd.ArrowDtype(arrow_type)
+            if isinstance(series.dtype, np.dtype):
+                return np.dtype(numpy_type)
+            return nullable_name
+    return None
+
+
+def compact_dataframe(df: pd.DataFrame, category_ratio: float = 0.5) -> pd.DataFrame:
+    """
+    Reduce the memory footprint of a DataFrame.
+
+    - Python-object string columns become Arrow-backed `string[pyarrow]`.
+    - String columns whose share of distinct values is at most `category_ratio` become categoricals.
+    - Integer columns are downcast to the smallest integer type holding their observed range.
+
+    Other columns (floats, decimals, timestamps, ...) are left unchanged. The per-column
+    footprint in bytes is stored in `df.attrs["memory_footprint"]`.
+
+    Args:
+        df (pd.DataFrame): DataFrame to compact.
+        category_ratio (float, optional): Maximum distinct/total ratio for categorical conversion.
+
+    Returns:
+        pd.DataFrame: The compacted DataFrame.
+    """
+    columns = {}
+    for col in df.columns:
+        series = df[col]
+        if pd.api.types.is_object_dtype(series) and pd.api.types.infer_dtype(series, skipna=True) == "string":
+            series = series.astype(STRING_DTYPE)
+        if isinstance(series.dtype, pd.StringDtype) or (
+                isinstance(series.dtype, pd.ArrowDtype) and pa.types.is_string(series.dtype.pyarrow_dtype)):
+            if len(series) and series.nunique(dropna=True) <= category_ratio * len(series):
+                series = series.astype("category")
+            elif isinstance(series.dtype, pd.ArrowDtype):
+                series = series.astype(STRING_DTYPE)
+        elif pd.api.types.is_integer_dtype(series) and not pd.api.types.is_bool_dtype(series):
+            target = _smallest_int_dtype(series)
+            if target is not None and target != series.dtype:
+                series = series.astype(target)
+        columns[col] = series
+
+    compacted = pd.DataFrame(columns, index=df.index)
+    compacted.attrs = dict(df.attrs)
+    compacted.attrs["memory_footprint"] = memory_footprint(compacted)
+    return compacted
+
+
+def memory_footprint(df: pd.DataFrame) -> dict:
+    """Memory used by each column in bytes (deep, i.e. including Python string objects)."""
+    return {col: int(size) for col, size in df.memory_usage(deep=True, index=False).items()}
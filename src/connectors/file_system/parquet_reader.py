@@ -1,5 +1,10 @@
 import os
 import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.connectors.compaction import arrow_types_mapper, compact_dataframe
+from src.data_quality.schema_alignment import SOURCE_SCHEMA_ATTR, STRING, arrow_schema
 
 
 class ParquetReader:
@@ -7,16 +12,21 @@ class ParquetReader:
     A utility class to read Parquet files from a given path, supporting both single files and directories with partitioned subfolders.
     """
 
-    def process(self, path: str) -> pd.DataFrame:
+    def process(self, path: str, columns: list = None, compact: bool = False) -> pd.DataFrame:
         """
         Read Parquet file(s) from the given path. If the path is a directory, it will recursively read all Parquet files,
         infer partition columns from folder names (e.g., 'partition_date=2000-01'), and concatenate the data.
 
         Args:
             path (str): Path to the Parquet file or directory.
+            columns (list, optional): Columns to read, including partition columns. If None, all columns are read.
+            compact (bool, optional): If True, read strings as `string[pyarrow]`, turn low-cardinality
+                columns (such as partition values) into categoricals and downcast integers.
+                The per-column footprint is stored in `df.attrs["memory_footprint"]`.
 
         Returns:
-            pd.DataFrame: DataFrame containing the file's or directory's data.
+            pd.DataFrame: DataFrame containing the file's or directory's data; the Parquet column
+                types are kept in `df.attrs["source_schema"]` for type alignment.
         """
         if not os.path.exists(path):
             raise FileNotFoundError(f"Path does not exist: {path}")
@@ -25,7 +35,7 @@ class ParquetReader:
 
         if os.path.isfile(path):
             try:
-                df = pd.read_parquet(path)
+                df = self._read_file(path, columns, compact)
                 dfs.append(df)
             except Exception as e:
                 raise RuntimeError(f"Failed to read Parquet file {path}: {e}")
@@ -35,7 +45,10 @@ class ParquetReader:
                     if file.endswith(('.parquet', '.pq')):
                         file_path = os.path.join(root, file)
                         try:
-                            df = pd.read_parquet(file_path)
+                            file_columns = None
+                            if columns is not None:
+                                file_columns = [c for c in columns if c not in self._partition_keys(root, path)]
+                            df = self._read_file(file_path, file_columns, compact)
                             # Infer partition columns from the relative path
                             rel_path = os.path.relpath(root, path)
                             if rel_path != '.':
@@ -43,7 +56,8 @@ class ParquetReader:
                                 for part in partitions:
                                     if '=' in part:
                                         key, value = part.split('=', 1)
-                                        df[key] = value
+                                        if columns is None or key in columns:
+                                            df[key] = value
                             dfs.append(df)
                         except Exception as e:
                             raise RuntimeError(f"Failed to read Parquet file {file_path}: {e}")
@@ -52,4 +66,107 @@ class ParquetReader:
         else:
             raise ValueError(f"Path is neither a file nor a directory: {path}")
 
-        return pd.concat(dfs, ignore_index=True)
\ No newline at end of file
+        df = pd.concat(dfs, ignore_index=True)
+        if compact:
+            df = compact_dataframe(df)
+        df.attrs[SOURCE_SCHEMA_ATTR] = self._source_schema(path)
+        return df
+
+    def read_table(self, path: str, columns: list = None) -> pa.Table:
+        """
+        Read Parquet file(s) into a pyarrow Table without converting to pandas. Partition columns
+        are inferred from folder names like in `process` and added as string columns.
+
+        Args:
+            path (str): Path to the Parquet file or directory.
+            columns (list, optional): Columns to read, including partition columns. If None, all columns are read.
+
+        Returns:
+            pa.Table: Table containing the file's or directory's data.
+        """
+        tables = []
+        for file_path, partitions in self._parquet_files(path):
+            file_columns = [c for c in columns if c not in partitions] if columns is not None else None
+            try:
+                table = pq.ParquetFile(file_path).read(columns=file_columns)
+            except Exception as e:
+                raise RuntimeError(f"Failed to read Parquet file {file_path}: {e}")
+            for key, value in partitions.items():
+                if columns is None or key in columns:
+                    table = table.append_column(key, pa.array([value] * table.num_rows, pa.string()))
+            tables.append(table)
+        return pa.concat_tables(tables, promote_options="default")
+
+    @staticmethod
+    def _source_schema(path: str) -> dict:
+        """Type families of the Parquet columns (from the first file's footer) and of the partition columns."""
+        file_path, partitions = ParquetReader._parquet_files(path)[0]
+        schema = arrow_schema(pq.read_schema(file_path))
+        # Partition values are read from folder names as strings
+        schema.update({key: STRING for key in partitions})
+        return schema
+
+    @staticmethod
+    def _parquet_files(path: str) -> list:
+        """List `(file_path, partitions)` pairs for a Parquet file or a partitioned directory."""
+        if not os.path.exists(path):
+            raise FileNotFoundError(f"Path does not exist: {path}")
+
+        if os.path.isfile(path):
+            return [(path, {})]
+        if not os.path.isdir(path):
+            raise ValueError(f"Path is neither a file nor a directory: {path}")
+
+        files = []
+        for root, dirs, file_names in os.walk(path):
+            rel_path = os.path.relpath(root, path)
+            partitions = {}
+            if rel_path != '.':
+                partitions = dict(part.split('=', 1) for part in rel_path.split(os.sep) if '=' in part)
+            for file in file_names:
+                if file.endswith(('.parquet', '.pq')):
+                    files.append((os.path.join(root, file), partitions))
+        if not files:
+            raise RuntimeError(f"No Parquet files found in directory: {path}")
+        return files
+
+    @staticmethod
+    def _read_file(file_path: str, columns: list, compact: bool) -> pd.DataFrame:
+        """Read one Parquet file; when compacting, strings stay Arrow-backed instead of Python objects."""
+        if compact:
+            return pq.ParquetFile(file_path).read(columns=columns).to_pandas(types_mapper=arrow_types_mapper)
+        return pd.read_parquet(file_path, columns=columns)
+
+    def iter_batches(self, path: str, columns: list = None, batch_size: int = 100_000):
+        """
+        Read Parquet file(s) batch by batch (within row groups) instead of loading everything at once.
+        Partition columns are inferred from folder names like in `process`.
+
+        Args:
+            path (str): Path to the Parquet file or directory.
+            columns (list, optional): Columns to read, including partition columns. If None, all columns are read.
+            batch_size (int, optional): Maximum rows per batch. Default is 100 000.
+
+        Yields:
+            pd.DataFrame: Consecutive batches of the file's or directory's data.
+        """
+        for file_path, partitions in self._parquet_files(path):
+            file_columns = [c for c in columns if c not in partitions] if columns is not None else None
+            try:
+                parquet_file = pq.ParquetFile(file_path)
+                for batch in parquet_file.iter_batches(batch_size=batch_size, columns=file_columns):
+                    df = batch.to_pandas()
+                    for key, value in partitions.items():
+                        if columns is None or key in columns:
+                            df[key] = value
+                    yield df
+            except Exception as e:
+                raise RuntimeError(f"Failed to read Parquet file {file_path}: {e}")
+
+    @staticmethod
+    def _partition_keys(root: str, path: str) -> set:
+        """Partition column names encoded in the folder names between `path` and `root`."""
+        rel_path = os.path.relpath(root, path)
+        if rel_path == '.':
+            return set()
+        return {part.split('=', 1)[0] for part in rel_path.split(os.sep) if '=' in part}
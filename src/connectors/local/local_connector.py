@@ -0,0 +1,260 @@
+import hashlib
+import os
+import re
+import uuid
+
+import duckdb
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from src.connectors.compaction import arrow_types_mapper, compact_dataframe
+from src.connectors.materialized_table import MaterializedTable
+from src.data_quality.schema_alignment import SOURCE_SCHEMA_ATTR, arrow_schema
+from src.data_quality.sources import quote_table
+
+# BigQuery spellings DuckDB does not understand
+_BIGQUERY_REWRITES = [
+    (re.compile(r"`([^`]*)`"), r'"\1"'),
+    (re.compile(r"\bSAFE_CAST\s*\(", re.IGNORECASE), "TRY_CAST("),
+    (re.compile(r"\bFLOAT64\b", re.IGNORECASE), "DOUBLE"),
+]
+
+
+def recording_key(sql: str) -> str:
+    """File name stem of a recorded query result: hash of the query with whitespace normalized."""
+    return hashlib.sha1(" ".join(sql.split()).encode("utf-8")).hexdigest()
+
+
+class LocalConnectorContextManager:
+    """
+    Offline stand-in for the BigQuery and Postgres connectors, backed by an in-process DuckDB
+    database over local Parquet files.
+
+    Every Parquet file `<data_dir>/<table name>.parquet` (or directory `<data_dir>/<table name>/`
+    of hive-partitioned files) is exposed as a view under its full table name, e.g.
+    `scalov.pieces.AGT.parquet` answers queries on `scalov.pieces.AGT`. Queries written for
+    BigQuery are rewritten for DuckDB (backtick identifiers, SAFE_CAST, FLOAT64).
+
+    With `recordings_dir`, results recorded from a live connector are replayed first, which also
+    covers queries DuckDB cannot run (BigQuery-only functions such as APPROX_QUANTILES). Passing
+    `record_from` runs every query on that connector instead and records (or re-records) its
+    result. A recorder otherwise behaves exactly like offline replay: it offers none of the live
+    connector's extras (`client`, `query_builder`, `dry_run`, ...), so the checks generate the
+    same queries while recording as offline and every recording is found again. Queries on
+    tables created by `materialize` always run locally and are never recorded.
+    """
+
+    def __init__(
+            self,
+            data_dir: str,
+            recordings_dir: str = None,
+            record_from=None,
+            dialect: str = "bigquery"
+    ):
+        """
+        :param data_dir: Directory with one Parquet file or directory per table.
+        :param recordings_dir: Directory with recorded query results (`<sha1 of query>.parquet`).
+        :param record_from: Live connector to run and record every query on (requires `recordings_dir`).
+        :param dialect: SQL dialect the checks should generate: "bigquery" or "postgres"
+                        (that of `record_from` when recording).
+        """
+        self.data_dir = data_dir
+        self.recordings_dir = recordings_dir
+        self.record_from = record_from
+        self.dialect = getattr(record_from, "dialect", dialect)
+        self.conn = None
+        self._materialized = {}
+
+    def __enter__(self):
+        try:
+            self.conn = duckdb.connect()
+        except Exception as e:
+            raise ConnectionError(f"Failed to start the local DuckDB engine: {e}")
+        if os.path.isdir(self.data_dir):
+            for table_name, path in self._table_files():
+                self._register(table_name, path)
+        return self
+
+    def __exit__(self, exc_type, exc_value, exc_tb):
+        self._materialized.clear()
+        if self.conn:
+            self.conn.close()
+            self.conn = None
+
+    @property
+    def source_id(self) -> tuple:
+        """Identifies the engine a query runs on; equal ids can be joined in one SQL statement."""
+        # Per dialect: the BigQuery and Postgres stand-ins may share data_dir, but the live
+        # engines they replace cannot be joined
+        return "local", self.dialect, os.path.abspath(self.data_dir)
+
+    def _table_files(self):
+        recordings = os.path.abspath(self.recordings_dir) if self.recordings_dir else None
+        for entry in sorted(os.listdir(self.data_dir)):
+            path = os.path.join(self.data_dir, entry)
+            if os.path.isfile(path) and entry.endswith((".parquet", ".pq")):
+                yield os.path.splitext(entry)[0], path
+            elif os.path.isdir(path) and os.path.abspath(path) != recordings:
+                yield entry, path
+
+    def _register(self, table_name: str, path: str):
+        """Expose a Parquet file or directory as a view named after the table."""
+        if os.path.isdir(path):
+            source = f"read_parquet({self._literal(os.path.join(path, '**', '*.parquet'))}, hive_partitioning = true)"
+        else:
+            source = f"read_parquet({self._literal(path)})"
+        self.conn.execute(f"CREATE OR REPLACE VIEW {self._identifier(table_name)} AS SELECT * FROM {source}")
+        parts = table_name.split(".")
+        if len(parts) == 2:
+            # Unquoted schema-qualified Postgres names (public.visits) resolve through a real schema
+            self.conn.execute(f"CREATE SCHEMA IF NOT EXISTS {self._identifier(parts[0])}")
+            self.conn.execute(
+                f"CREATE OR REPLACE VIEW {self._identifier(parts[0])}.{self._identifier(parts[1])} "
+                f"AS SELECT * FROM {source}"
+            )
+
+    @staticmethod
+    def _identifier(name: str) -> str:
+        return '"' + name.replace('"', '""') + '"'
+
+    @staticmethod
+    def _literal(value: str) -> str:
+        return "'" + value.replace("'", "''") + "'"
+
+    def _translate(self, sql: str) -> str:
+        if self.dialect == "bigquery":
+            for pattern, replacement in _BIGQUERY_REWRITES:
+                sql = pattern.sub(replacement, sql)
+        return sql
+
+    def _recording_path(self, sql: str) -> str:
+        return os.path.join(self.recordings_dir, recording_key(sql) + ".parquet")
+
+    def _reads_materialized(self, sql: str) -> bool:
+        """True if `sql` reads a temporary table of `materialize`, which only exists in DuckDB."""
+        return any(handle.table_name in sql for handle in self._materialized.values())
+
+    def _recorded(self, sql: str):
+        """
+        Recorded result of `sql` as a pyarrow Table; None if unavailable. In recording mode the
+        query always runs on the live connector and its result replaces any earlier recording.
+        """
+        if not self.recordings_dir or self._reads_materialized(sql):
+            return None
+        path = self._recording_path(sql)
+        if self.record_from is None:
+            return pq.read_table(path) if os.path.exists(path) else None
+
+        if hasattr(self.record_from, "get_arrow_sql"):
+            table = self.record_from.get_arrow_sql(sql)
+        else:
+            table = pa.Table.from_pandas(self.record_from.get_data_sql(sql), preserve_index=False)
+        os.makedirs(self.recordings_dir, exist_ok=True)
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        pq.write_table(table, tmp_path)
+        os.replace(tmp_path, path)
+        # The query next to its result, for reviewing what a recording contains
+        with open(os.path.splitext(path)[0] + ".sql", "w", encoding="utf-8") as f:
+            f.write(sql)
+        return table
+
+    def get_arrow_sql(self, sql: str) -> pa.Table:
+        """
+        Executes a SQL query locally (or replays its recording) and returns a pyarrow Table.
+        """
+        table = self._recorded(sql)
+        if table is not None:
+            return table
+        try:
+            return self.conn.execute(self._translate(sql)).to_arrow_table()
+        except Exception as e:
+            raise RuntimeError(f"Failed to execute SQL query locally: {e}")
+
+    def get_data_sql(self, sql: str, compact: bool = False) -> pd.DataFrame:
+        """
+        Executes a SQL query locally (or replays its recording) and returns a pandas DataFrame.
+
+        With `compact=True` strings stay Arrow-backed, low-cardinality columns become categoricals
+        and integers are downcast, as in the live connectors (see `compact_dataframe`).
+        """
+        table = self.get_arrow_sql(sql)
+        if compact:
+            df = compact_dataframe(table.to_pandas(types_mapper=arrow_types_mapper))
+        else:
+            df = table.to_pandas()
+        df.attrs[SOURCE_SCHEMA_ATTR] = arrow_schema(table.schema)
+        return df
+
+    def iter_data_sql(self, sql: str, chunk_size: int = 100_000):
+        """
+        Executes a SQL query locally (or replays its recording) and yields the result
+        as pandas DataFrame chunks.
+
+        Args:
+            sql (str): Query to execute.
+            chunk_size (int, optional): Rows per chunk. Default is 100 000.
+
+        Yields:
+            pd.DataFrame: Consecutive chunks of the result.
+        """
+        table = self._recorded(sql)
+        if table is not None:
+            batches = table.to_batches(max_chunksize=chunk_size)
+        else:
+            try:
+                batches = self.conn.execute(self._translate(sql)).to_arrow_reader(chunk_size)
+            except Exception as e:
+                raise RuntimeError(f"Failed to execute SQL query locally: {e}")
+        for batch in batches:
+            yield batch.to_pandas()
+
+    def materialize(self, sql: str) -> MaterializedTable:
+        """
+        Keeps the result of a query in a DuckDB temporary table, like `materialize` of the live connectors.
+
+        Args:
+            sql (str): Query to materialize.
+
+        Returns:
+            MaterializedTable: Handle for cheap follow-up queries on the result.
+        """
+        if sql in self._materialized:
+            return self._materialized[sql]
+
+        table_name = f"dq_tmp_{uuid.uuid4().hex}"
+        recorded = self._recorded(sql)
+        if recorded is not None:
+            self.conn.register(f"{table_name}_recorded", recorded)
+            self.conn.execute(f"CREATE TEMP TABLE {table_name} AS SELECT * FROM {table_name}_recorded")
+            self.conn.unregister(f"{table_name}_recorded")
+        else:
+            self.conn.execute(f"CREATE TEMP TABLE {table_name} AS {self._translate(sql)}")
+
+        handle = MaterializedTable(self, table_name, sql)
+        self._materialized[sql] = handle
+        return handle
+
+    def record_table(self, connector, table_name: str, where: str = None):
+        """
+        Copy a live table (or the rows matching `where`) to `<data_dir>/<table_name>.parquet`
+        and expose it locally, so arbitrary queries on it run offline at realistic volumes.
+
+        Args:
+            connector: Live connector the table is read from.
+            table_name (str): Full table name, as used in the queries.
+            where (str, optional): SQL filter condition limiting the copied rows.
+        """
+        sql = f"SELECT * FROM {quote_table(connector, table_name)}"
+        if where:
+            sql += f" WHERE {where}"
+        if hasattr(connector, "get_arrow_sql"):
+            table = connector.get_arrow_sql(sql)
+        else:
+            table = pa.Table.from_pandas(connector.get_data_sql(sql), preserve_index=False)
+
+        os.makedirs(self.data_dir, exist_ok=True)
+        path = os.path.join(self.data_dir, f"{table_name}.parquet")
+        pq.write_table(table, path)
+        if self.conn:
+            self._register(table_name, path)
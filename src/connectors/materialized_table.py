@@ -0,0 +1,70 @@
+import pandas as pd
+
+from src.data_quality.sources import quote_identifier, quote_table
+
+
+class MaterializedTable:
+    """
+    Handle to the result of an expensive query, stored once per session in a temporary table
+    by a connector's `materialize` method. Checks can query it again cheaply, reading only the
+    columns they need or pushing aggregates down instead of downloading the whole result.
+    """
+
+    def __init__(self, connector, table_name: str, sql: str):
+        """
+        :param connector: Connector that owns the temporary table.
+        :param table_name: Name of the temporary table.
+        :param sql: Query the table was materialized from.
+        """
+        self.connector = connector
+        self.table_name = table_name
+        self.sql = sql
+
+    @property
+    def source(self) -> tuple:
+        """`(connector, table_name)` pair accepted by table-level checks such as `check_referential_integrity`."""
+        return self.connector, self.table_name
+
+    def _from(self, where: str = None) -> str:
+        sql = f"FROM {quote_table(self.connector, self.table_name)}"
+        if where:
+            sql += f" WHERE {where}"
+        return sql
+
+    def get_data(self, columns: list = None, where: str = None, compact: bool = False) -> pd.DataFrame:
+        """
+        Read (part of) the materialized result.
+
+        Args:
+            columns (list, optional): Columns to read. If None, all columns are read.
+            where (str, optional): SQL filter condition.
+            compact (bool, optional): Passed on to the connector's `get_data_sql`.
+
+        Returns:
+            pd.DataFrame: The selected rows and columns.
+        """
+        select_list = ", ".join(quote_identifier(self.connector, col) for col in columns) if columns else "*"
+        return self.connector.get_data_sql(f"SELECT {select_list} {self._from(where)}", compact=compact)
+
+    def count(self, where: str = None) -> int:
+        """Row count, computed in the engine."""
+        df = self.connector.get_data_sql(f"SELECT COUNT(*) AS row_count {self._from(where)}")
+        return int(df["row_count"].iloc[0])
+
+    def aggregate(self, expressions: dict, where: str = None) -> dict:
+        """
+        Compute aggregates in the engine and return them as a dict.
+
+        Args:
+            expressions (dict): Result name -> SQL aggregate expression,
+                e.g. {"null_codes": "COUNTIF(Code IS NULL)", "max_thickness": "MAX(Thickness)"}.
+            where (str, optional): SQL filter condition.
+
+        Returns:
+            dict: Result name -> value.
+        """
+        select_list = ", ".join(
+            f"{expression} AS {quote_identifier(self.connector, name)}" for name, expression in expressions.items()
+        )
+        df = self.connector.get_data_sql(f"SELECT {select_list} {self._from(where)}")
+        return df.iloc[0].to_dict()
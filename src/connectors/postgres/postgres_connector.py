@@ -1,9 +1,17 @@
+import uuid
+
 import psycopg2
 import pandas as pd
 from psycopg2.extras import RealDictCursor
 
+from src.connectors.compaction import compact_dataframe
+from src.connectors.materialized_table import MaterializedTable
+from src.data_quality.schema_alignment import SOURCE_SCHEMA_ATTR, postgres_schema
+
 
 class PostgresConnectorContextManager:
+    dialect = "postgres"
+
     def __init__(self, db_host: str, db_user: str, db_password: str, db_port: int, db_name='mydatabase', ):
         self.db_host = db_host
         self.db_name = db_name
@@ -11,6 +19,7 @@ class PostgresConnectorContextManager:
         self.db_password = db_password
         self.db_port = db_port
         self.conn = None
+        self._materialized = {}
 
     def __enter__(self):
         try:
@@ -26,14 +35,94 @@ class PostgresConnectorContextManager:
         except Exception as e:
             raise ConnectionError(f"Failed to connect to PostgreSQL: {e}")
 
+    @property
+    def source_id(self) -> tuple:
+        """Identifies the engine a query runs on; equal ids can be joined in one SQL statement."""
+        return self.dialect, self.db_host, self.db_port, self.db_name
+
     def __exit__(self, exc_type, exc_value, exc_tb):
         if self.conn:
+            if self._materialized and not self.conn.closed:
+                self.conn.rollback()
+                with self.conn.cursor() as cur:
+                    for handle in self._materialized.values():
+                        cur.execute(f"DROP TABLE IF EXISTS {handle.table_name}")
+                self.conn.commit()
             self.conn.close()
+        self._materialized.clear()
+
+    def get_data_sql(self, sql: str, compact: bool = False) -> pd.DataFrame:
+        """
+        Executes a SQL query and returns a pandas DataFrame.
 
-    def get_data_sql(self, sql: str) -> pd.DataFrame:
+        With `compact=True` string columns become `string[pyarrow]` or categoricals and integers
+        are downcast (see `compact_dataframe`); the per-column footprint is in `df.attrs["memory_footprint"]`.
+        The Postgres column types are kept in `df.attrs["source_schema"]` for type alignment.
+        """
         with self.conn.cursor() as cur:
             cur.execute(sql)
             data = cur.fetchall()
             columns = [desc[0] for desc in cur.description]
             df = pd.DataFrame(data, columns=columns)
+            if compact:
+                df = compact_dataframe(df)
+            df.attrs[SOURCE_SCHEMA_ATTR] = postgres_schema(cur.description)
             return df
+
+    def column_types(self, sql: str) -> dict:
+        """
+        Column name -> Postgres type OID of a query's result, from `cursor.description`
+        (the query is wrapped so that no rows are read).
+        """
+        with self.conn.cursor() as cur:
+            cur.execute(f"SELECT * FROM ({sql}) AS q LIMIT 0")
+            return {desc[0]: desc[1] for desc in cur.description}
+
+    def iter_data_sql(self, sql: str, chunk_size: int = 100_000):
+        """
+        Executes a SQL query through a server-side cursor and yields the result as
+        pandas DataFrame chunks, so large results never have to be held in memory at once.
+
+        Args:
+            sql (str): Query to execute.
+            chunk_size (int, optional): Rows fetched per round trip. Default is 100 000.
+
+        Yields:
+            pd.DataFrame: Consecutive chunks of the result.
+        """
+        with self.conn.cursor(name=f"dq_stream_{uuid.uuid4().hex}") as cur:
+            cur.itersize = chunk_size
+            cur.execute(sql)
+            while True:
+                data = cur.fetchmany(chunk_size)
+                if not data:
+                    break
+                # A named cursor only knows its description after the first fetch
+                columns = [desc[0] for desc in cur.description]
+                yield pd.DataFrame(data, columns=columns)
+
+    def materialize(self, sql: str) -> MaterializedTable:
+        """
+        Runs an expensive query once per session and keeps its result in a `TEMP TABLE`,
+        which is dropped when the connector exits. Materializing the same SQL again returns
+        the existing handle.
+
+        Args:
+            sql (str): Query to materialize.
+
+        Returns:
+            MaterializedTable: Handle for cheap follow-up queries on the result.
+        """
+        if sql in self._materialized:
+            return self._materialized[sql]
+
+        table_name = f"dq_tmp_{uuid.uuid4().hex}"
+        with self.conn.cursor() as cur:
+            cur.execute(f"CREATE TEMP TABLE {table_name} AS {sql}")
+            # Gives the planner statistics for the follow-up queries
+            cur.execute(f"ANALYZE {table_name}")
+        self.conn.commit()
+
+        handle = MaterializedTable(self, table_name, sql)
+        self._materialized[sql] = handle
+        return handle
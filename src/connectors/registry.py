@@ -0,0 +1,39 @@
+import importlib
+
+# Connector name -> "module:class". Modules are imported on first use only, so e.g. a run that
+# never touches BigQuery does not pay for importing the Google SDK.
+CONNECTORS = {
+    "bigquery": "src.connectors.bigquery.bigquery_connector:BigQueryConnectorContextManager",
+    "postgres": "src.connectors.postgres.postgres_connector:PostgresConnectorContextManager",
+    "local": "src.connectors.local.local_connector:LocalConnectorContextManager",
+    "parquet": "src.connectors.file_system.parquet_reader:ParquetReader",
+}
+
+_classes = {}
+
+
+def register_connector(name: str, target: str):
+    """
+    Register (or replace) a connector.
+
+    Args:
+        name (str): Connector name, as used in `get_connector_class`.
+        target (str): Import path of the connector class as "module:class".
+    """
+    CONNECTORS[name] = target
+    _classes.pop(name, None)
+
+
+def get_connector_class(name: str):
+    """
+    Return the connector class registered under `name`, importing its module on first use.
+
+    Raises:
+        ValueError: If no connector is registered under `name`.
+    """
+    if name not in _classes:
+        if name not in CONNECTORS:
+            raise ValueError(f"Unknown connector: {name} (known: {', '.join(sorted(CONNECTORS))})")
+        module_name, class_name = CONNECTORS[name].split(":")
+        _classes[name] = getattr(importlib.import_module(module_name), class_name)
+    return _classes[name]
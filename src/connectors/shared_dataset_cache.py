@@ -0,0 +1,128 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import time
+from contextlib import contextmanager
+
+# Schema metadata key under which a DataFrame's `attrs` (source_schema, memory_footprint) are stored
+_ATTRS_KEY = b"dq_attrs"
+
+
+class SharedDatasetCache:
+    """
+    Cross-process dataset cache backed by Arrow IPC files in shared memory (`/dev/shm`).
+
+    The first process asking for a key runs the loader and writes the result; every other
+    process (e.g. another pytest-xdist worker) memory-maps the file instead of querying the
+    source again. Writers are serialized per key with a lock file, so a dataset is loaded once
+    per run even if several workers need it at the same time.
+    """
+
+    def __init__(self, run_id: str, root: str = None, lock_timeout: float = 3600):
+        """
+        :param run_id: Identifier shared by all processes of one test run.
+        :param root: Directory for the cache (defaults to /dev/shm, or the temp dir where it is missing).
+        :param lock_timeout: Seconds after which a lock left by a crashed process is considered stale.
+        """
+        if root is None:
+            root = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+        self.directory = os.path.join(root, f"dq_datasets_{run_id}")
+        self.lock_timeout = lock_timeout
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, key: str) -> str:
+        # Keys are typically whole queries, far longer than a file name may be
+        return os.path.join(self.directory, hashlib.sha1(key.encode("utf-8")).hexdigest() + ".arrow")
+
+    def get_or_load(self, key: str, loader):
+        """
+        Return the dataset stored under `key`, calling `loader()` only if no process has stored it yet.
+
+        Args:
+            key (str): Dataset identifier, e.g. the table name or the query.
+            loader (callable): Returns a pandas DataFrame or a pyarrow Table.
+
+        Returns:
+            The dataset, as the same type the loader returns (pyarrow Tables are memory-mapped, zero-copy).
+        """
+        path = self._path(key)
+        if not os.path.exists(path):
+            with self._lock(path + ".lock"):
+                if not os.path.exists(path):
+                    self._write(path, loader())
+        return self._read(path)
+
+    @staticmethod
+    def _write(path: str, data):
+        import pandas as pd
+        import pyarrow as pa
+
+        if isinstance(data, pd.DataFrame):
+            table = pa.Table.from_pandas(data, preserve_index=False)
+            if data.attrs:
+                metadata = dict(table.schema.metadata or {})
+                metadata[_ATTRS_KEY] = json.dumps(data.attrs).encode()
+                table = table.replace_schema_metadata(metadata)
+        else:
+            table = data
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with pa.OSFile(tmp_path, "wb") as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        # Readers only ever see complete files
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def _read(path: str):
+        import pyarrow as pa
+
+        table = pa.ipc.open_file(pa.memory_map(path, "r")).read_all()
+        if table.schema.pandas_metadata is not None:
+            df = table.to_pandas()
+            attrs = (table.schema.metadata or {}).get(_ATTRS_KEY)
+            if attrs is not None:
+                df.attrs.update(json.loads(attrs))
+            return df
+        return table
+
+    @contextmanager
+    def _lock(self, lock_path: str):
+        """Portable inter-process lock: exclusive creation of a lock file."""
+        while True:
+            try:
+                os.close(os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY))
+                break
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(lock_path) > self.lock_timeout:
+                        os.remove(lock_path)
+                except FileNotFoundError:
+                    pass
+                time.sleep(0.1)
+        try:
+            yield
+        finally:
+            try:
+                os.remove(lock_path)
+            except FileNotFoundError:
+                pass
+
+    def cleanup(self):
+        """Remove all cached datasets of this run."""
+        shutil.rmtree(self.directory, ignore_errors=True)
+
+
+class LocalDatasetCache:
+    """
+    Same interface as `SharedDatasetCache` for runs without pytest-xdist workers: there is no
+    other process to share with, so `loader()` is called directly and nothing is written.
+    Module- and session-scoped fixtures already load each dataset once per process.
+    """
+
+    def get_or_load(self, key: str, loader):
+        return loader()
+
+    def cleanup(self):
+        pass
@@ -0,0 +1,169 @@
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from src.data_quality.column_executor import map_columns
+from src.data_quality.schema_alignment import align
+from src.data_quality.violations import raise_violations
+
+
+def is_arrow(data) -> bool:
+    """Return True for pyarrow Tables and RecordBatches, which are checked by `ArrowDataQualityBackend`."""
+    return isinstance(data, (pa.Table, pa.RecordBatch))
+
+
+def _as_table(data) -> pa.Table:
+    if isinstance(data, pa.RecordBatch):
+        return pa.Table.from_batches([data])
+    if isinstance(data, pd.DataFrame):
+        return pa.Table.from_pandas(data, preserve_index=False)
+    return data
+
+
+class ArrowDataQualityBackend:
+    """
+    Arrow-native implementations of the `DataQualityLibrary` checks.
+
+    Checks run directly on `pyarrow.Table`/`RecordBatch` data with `pyarrow.compute` kernels
+    (multithreaded, no conversion to pandas). Only the small failure reports are converted
+    to pandas for printing. `DataQualityLibrary` dispatches here automatically for Arrow input.
+    """
+
+    @staticmethod
+    def check_duplicates(data, column_names=None, check_each_column=False, sink=None, executor=None):
+        """Arrow variant of `DataQualityLibrary.check_duplicates`, using `Table.group_by` counts."""
+        table = _as_table(data)
+        if column_names:
+            if check_each_column:
+                all_dup_counts = map_columns(
+                    lambda col: ArrowDataQualityBackend._duplicate_counts(table, [col]), column_names, executor
+                )
+                for col, dup_counts in zip(column_names, all_dup_counts):
+                    raise_violations(f"Duplicate values found in column '{col}':", [dup_counts], "duplicates", sink)
+            else:
+                dup_counts = ArrowDataQualityBackend._duplicate_counts(table, column_names)
+                raise_violations(
+                    f"Duplicate rows found on combination of columns {column_names}:", [dup_counts], "duplicates", sink
+                )
+        else:
+            dup_counts = ArrowDataQualityBackend._duplicate_counts(table, table.column_names)
+            raise_violations("Duplicate full rows found:", [dup_counts], "duplicates", sink)
+
+    @staticmethod
+    def _duplicate_counts(table: pa.Table, columns: list) -> pa.Table:
+        counts = table.group_by(columns, use_threads=True).aggregate([([], "count_all")])
+        counts = counts.rename_columns(columns + ["count"])
+        counts = counts.filter(pc.greater(counts["count"], 1))
+        return counts.sort_by([("count", "descending")])
+
+    @staticmethod
+    def check_count(data1, data2):
+        """Check that two datasets have the same number of rows."""
+        rows1, rows2 = len(data1), len(data2)
+        assert rows1 == rows2, f"Row count mismatch: {rows1} != {rows2}"
+
+    @staticmethod
+    def check_data_full_data_set(data1, data2, subset_columns=None, sink=None, aligner=None):
+        """
+        Arrow variant of `DataQualityLibrary.check_data_full_data_set`.
+
+        Both sides are reduced to per-key row counts with `group_by` and the key sets are compared
+        in a second `group_by`, which (like the pandas merge) treats nulls as equal keys.
+        Column types are aligned with Arrow casts only (cached by `aligner`, a `SchemaAligner`,
+        when given); the inputs are never modified.
+        """
+        table1, table2 = _as_table(data1), _as_table(data2)
+        columns = subset_columns or table1.column_names
+        table1, table2 = aligner.align(table1, table2, columns) if aligner else align(table1, table2, columns)
+
+        side_counts = []
+        for side, table in ((1, table1), (2, table2)):
+            counts = table.group_by(columns, use_threads=True).aggregate([([], "count_all")])
+            side_counts.append(counts.append_column("side", pa.array([side] * counts.num_rows, pa.int8())))
+        combined = pa.concat_tables(side_counts).group_by(columns, use_threads=True).aggregate(
+            [("side", "min"), ("side", "max"), ("count_all", "sum")]
+        )
+        differences = combined.filter(pc.equal(combined["side_min"], combined["side_max"]))
+
+        diff_type = pc.if_else(
+            pc.equal(differences["side_min"], 1),
+            "in source not in target",
+            "in target not in source",
+        )
+        diff_counts = differences.select(columns).append_column("diff_type", diff_type).append_column(
+            "count", differences["count_all_sum"]
+        ).sort_by([(col, "ascending") for col in columns + ["diff_type"]])
+        raise_violations("Datasets do not match! Differences found:", [diff_counts], "full_data_set", sink)
+
+    @staticmethod
+    def check_dataset_is_not_empty(data):
+        """Check that the dataset is not empty."""
+        assert data.num_rows > 0, "DataFrame is empty"
+
+    @staticmethod
+    def check_not_null_values(data, column_names=None, executor=None):
+        """Check that specified columns do not contain null (or NaN) values."""
+        table = _as_table(data)
+        columns = column_names or table.column_names
+        null_counts = map_columns(lambda col: ArrowDataQualityBackend._null_count(table[col]), columns, executor)
+        null_columns = [col for col, nulls in zip(columns, null_counts) if nulls]
+        if column_names:
+            assert not null_columns, (
+                f"Null values found in column{'s' if len(null_columns) > 1 else ''}: {', '.join(null_columns)}"
+            )
+        else:
+            assert not null_columns, f"Null values found in DataFrame (columns: {', '.join(null_columns)})"
+
+    @staticmethod
+    def _null_count(column) -> int:
+        if pa.types.is_floating(column.type):
+            # pandas treats NaN as null as well
+            return pc.sum(pc.is_null(column, nan_is_null=True)).as_py() or 0
+        return column.null_count
+
+    @staticmethod
+    def check_column_validity(data, column_rules: dict, sink=None, executor=None):
+        """
+        Arrow variant of `DataQualityLibrary.check_column_validity`. "min", "max" and
+        "allowed_values" run as compute kernels; "condition" callables are applied to the
+        single column converted to pandas.
+        """
+        table = _as_table(data)
+
+        def column_invalid_rows(column):
+            rules = column_rules[column]
+            values = table[column]
+            if pa.types.is_dictionary(values.type):
+                # Compare the values, not the dictionary indices
+                values = values.cast(values.type.value_type)
+            masks = []
+
+            if "min" in rules:
+                masks.append(pc.fill_null(pc.less(values, rules["min"]), False))
+            if "max" in rules:
+                masks.append(pc.fill_null(pc.greater(values, rules["max"]), False))
+            if "allowed_values" in rules:
+                allowed = pa.array(rules["allowed_values"], type=values.type)
+                masks.append(pc.invert(pc.is_in(values, value_set=allowed)))
+            if "condition" in rules:
+                valid = values.to_pandas().apply(rules["condition"]).to_numpy(dtype=bool)
+                masks.append(pc.invert(pa.array(valid)))
+            if not masks:
+                return None
+
+            invalid_mask = masks[0]
+            for mask in masks[1:]:
+                invalid_mask = pc.or_(invalid_mask, mask)
+            # Long format like the pandas backend: row position, column, value as string
+            rows = pc.indices_nonzero(invalid_mask)
+            return pa.table({
+                "row": pc.cast(rows, pa.int64()),
+                "invalid_column": pa.array([column] * len(rows), pa.string()),
+                "value": pc.cast(pc.take(values, rows), pa.string()),
+            })
+
+        invalid_rows = (
+            part for part in map_columns(column_invalid_rows, list(column_rules), executor) if part is not None
+        )
+        raise_violations("Invalid values found in the following columns:", invalid_rows, "column_validity", sink)
+        return table.slice(0, 0)
@@ -0,0 +1,61 @@
+import os
+from collections import deque
+from concurrent.futures import Executor, ThreadPoolExecutor
+
+_DONE = object()
+
+
+class ColumnExecutor(ThreadPoolExecutor):
+    """Thread pool for per-column checks that exposes its size, which bounds the columns in flight."""
+
+    def __init__(self, workers: int):
+        """
+        :param workers: Number of threads.
+        """
+        super().__init__(max_workers=workers, thread_name_prefix="dq-column")
+        self.workers = workers
+
+
+def map_columns(func, columns: list, executor: Executor = None, window: int = None):
+    """
+    Apply `func` to every column name, on `executor` when one is given.
+
+    pandas and pyarrow kernels release the GIL for most of their work, so independent columns
+    evaluated on a thread pool run on several cores. Results are returned in column order, as a
+    lazy iterator, so callers can report (and stream) them exactly as in a serial run.
+
+    At most `window` columns are in flight at a time: the next column is submitted only when the
+    oldest result is taken, so the results (e.g. per-column duplicate tables) of a wide dataset
+    are not all held in memory at once.
+
+    Args:
+        func (callable): Function of one column name.
+        columns (list): Column names.
+        executor (Executor, optional): E.g. a `ThreadPoolExecutor`. If None, columns are evaluated serially.
+        window (int, optional): Columns submitted ahead of the one being returned. Defaults to
+            the worker count of a `ColumnExecutor`, otherwise the number of CPUs.
+
+    Returns:
+        Iterator over `func(column)` for each column, in order.
+    """
+    if executor is None or len(columns) < 2:
+        return map(func, columns)
+    if window is None:
+        window = getattr(executor, "workers", None) or os.cpu_count() or 1
+    return _map_window(func, columns, executor, max(1, window))
+
+
+def _map_window(func, columns: list, executor: Executor, window: int):
+    pending = deque(executor.submit(func, col) for col in columns[:window])
+    remaining = iter(columns[window:])
+    try:
+        while pending:
+            result = pending.popleft().result()
+            col = next(remaining, _DONE)
+            if col is not _DONE:
+                pending.append(executor.submit(func, col))
+            yield result
+    finally:
+        # The caller stopped early (or a column failed): drop the columns not started yet
+        for future in pending:
+            future.cancel()
@@ -1,5 +1,18 @@
+from concurrent.futures import Executor
+
 import pandas as pd
 
+from src.data_quality.arrow_backend import ArrowDataQualityBackend, is_arrow
+from src.data_quality.column_executor import map_columns
+from src.data_quality.distribution_drift import DISTANCES, MissingBaselineError, detect_kind, profile_column
+from src.data_quality.key_hashing import build_key_set, hash_keys, isin_key_set
+from src.data_quality.schema_alignment import SchemaAligner
+from src.data_quality.streaming import run_streaming_checks
+from src.data_quality.sources import (
+    iter_chunks, quote_identifier, quote_table, same_engine, table_expression, window_note
+)
+from src.data_quality.violations import ViolationSink, raise_violations
+
 
 class DataQualityLibrary:
     """
@@ -8,8 +21,27 @@ class DataQualityLibrary:
     This class is intended to be used in a PyTest-based testing framework to validate
     the quality of data in DataFrames. Each method performs a specific data quality
     check and uses assertions to ensure that the data meets the expected conditions.
+
+    The DataFrame checks also accept `pyarrow.Table`/`RecordBatch` input, which is checked
+    by `ArrowDataQualityBackend` with `pyarrow.compute` kernels, without conversion to pandas.
+
+    Checks that can report many violating rows (`check_duplicates`, `check_data_full_data_set`,
+    `check_column_validity`) raise a `ViolationError` with the count and a small sample. When
+    `violation_sink` is set, the full output is streamed to a Parquet file under `reports/`
+    and the error carries its path.
+
+    Per-column checks (`check_not_null_values`, `check_duplicates(check_each_column=True)`,
+    `check_column_validity`) evaluate independent columns on `column_executor` when it is set,
+    e.g. a `ColumnExecutor` (a thread pool); results are reported in column order.
+
+    `check_data_full_data_set` never modifies its inputs: `schema_aligner` casts the compared
+    column pairs to a common type once and keeps the aligned views while the inputs are alive.
     """
 
+    violation_sink: ViolationSink = None
+    column_executor: Executor = None
+    schema_aligner: SchemaAligner = SchemaAligner()
+
     @staticmethod
     def check_duplicates(df: pd.DataFrame, column_names=None, check_each_column=False):
         """
@@ -23,60 +55,69 @@ class DataQualityLibrary:
                 check duplicates **per column individually**.
 
         Raises:
-            AssertionError: If duplicates are found, showing counts.
+            ViolationError: If duplicates are found, showing counts (an AssertionError).
         """
+        if is_arrow(df):
+            return ArrowDataQualityBackend.check_duplicates(
+                df, column_names, check_each_column,
+                sink=DataQualityLibrary.violation_sink, executor=DataQualityLibrary.column_executor
+            )
+        sink = DataQualityLibrary.violation_sink
         if column_names:
             if check_each_column:
                 # Check duplicates individually for each column
-                for col in column_names:
-                    duplicates = df[df.duplicated(subset=[col], keep=False)]
-                    if not duplicates.empty:
-                        dup_counts = (
-                            duplicates.groupby([col])
-                            .size()
-                            .reset_index(name='count')
-                            .sort_values('count', ascending=False)
-                        )
-                        raise AssertionError(
-                            f"Duplicate values found in column '{col}':\n{dup_counts}"
-                        )
+                def column_duplicates(col):
+                    duplicates = df.loc[df[col].duplicated(keep=False), [col]]
+                    return (
+                        duplicates.groupby([col], observed=True, dropna=False)
+                        .size()
+                        .reset_index(name='count')
+                        .sort_values('count', ascending=False)
+                    )
+
+                for col, dup_counts in zip(
+                        column_names, map_columns(column_duplicates, column_names, DataQualityLibrary.column_executor)
+                ):
+                    raise_violations(f"Duplicate values found in column '{col}':", [dup_counts], "duplicates", sink)
             else:
                 # Check duplicates based on combination of columns
                 duplicates = df[df.duplicated(subset=column_names, keep=False)]
                 if not duplicates.empty:
                     dup_counts = (
-                        duplicates.groupby(column_names)
+                        duplicates.groupby(column_names, observed=True, dropna=False)
                         .size()
                         .reset_index(name='count')
                         .sort_values('count', ascending=False)
                     )
-                    raise AssertionError(
-                        f"Duplicate rows found on combination of columns {column_names}:\n{dup_counts}"
+                    raise_violations(
+                        f"Duplicate rows found on combination of columns {column_names}:",
+                        [dup_counts], "duplicates", sink
                     )
         else:
             # Full-row duplicates
             duplicates = df[df.duplicated(keep=False)]
             if not duplicates.empty:
                 dup_counts = (
-                    duplicates.groupby(list(df.columns))
+                    duplicates.groupby(list(df.columns), observed=True, dropna=False)
                     .size()
                     .reset_index(name='count')
                     .sort_values('count', ascending=False)
                 )
-                raise AssertionError(
-                    f"Duplicate full rows found:\n{dup_counts}"
-                )
+                raise_violations("Duplicate full rows found:", [dup_counts], "duplicates", sink)
 
     @staticmethod
     def check_count(df1: pd.DataFrame, df2: pd.DataFrame):
         """Check that two DataFrames have the same number of rows."""
+        if is_arrow(df1) or is_arrow(df2):
+            return ArrowDataQualityBackend.check_count(df1, df2)
         assert len(df1) == len(df2), f"Row count mismatch: {len(df1)} != {len(df2)}"
 
     @staticmethod
     def check_data_full_data_set(df1, df2,subset_columns=None):
         """
         Check that two datasets match exactly, like UNION ALL of EXCEPT in SQL.
-        Automatically aligns column types for comparison (e.g., datetime vs object).
+        Automatically aligns column types for comparison (e.g., datetime vs object), using the
+        connector schemas when the DataFrames carry them (see `SchemaAligner`); the inputs are not modified.
         Shows which rows are in one dataset but not the other, with counts.
 
         Args:
@@ -85,59 +126,62 @@ class DataQualityLibrary:
             subset_columns (list, optional): Columns to compare. If None, compare all columns.
 
         Raises:
-            AssertionError: If any row mismatches exist.
+            ViolationError: If any row mismatches exist (an AssertionError).
         """
+        if is_arrow(df1) or is_arrow(df2):
+            return ArrowDataQualityBackend.check_data_full_data_set(
+                df1, df2, subset_columns, sink=DataQualityLibrary.violation_sink,
+                aligner=DataQualityLibrary.schema_aligner
+            )
         # Columns to compare
         columns = subset_columns or df1.columns.tolist()
 
-        # Align column types
-        for col in columns:
-            if col not in df2.columns:
-                raise ValueError(f"Column '{col}' not found in df2")
-            # If either column is datetime, convert both to datetime
-            if pd.api.types.is_datetime64_any_dtype(df1[col]) or pd.api.types.is_datetime64_any_dtype(df2[col]):
-                df1[col] = pd.to_datetime(df1[col], errors='coerce')
-                df2[col] = pd.to_datetime(df2[col], errors='coerce')
-            # If either column is numeric but different type, convert both to float
-            elif pd.api.types.is_numeric_dtype(df1[col]) or pd.api.types.is_numeric_dtype(df2[col]):
-                df1[col] = pd.to_numeric(df1[col], errors='coerce')
-                df2[col] = pd.to_numeric(df2[col], errors='coerce')
-            # Otherwise, compare as string
-            else:
-                df1[col] = df1[col].astype(str)
-                df2[col] = df2[col].astype(str)
-
-        # Rows in df1 but not in df2
-        diff1 = df1.merge(df2, on=columns, how='left', indicator=True).query('_merge == "left_only"')[columns].copy()
-        diff1['diff_type'] = 'in source not in target'
-
-        # Rows in df2 but not in df1
-        diff2 = df2.merge(df1, on=columns, how='left', indicator=True).query('_merge == "left_only"')[columns].copy()
-        diff2['diff_type'] = 'in target not in source'
-
-        # Combine differences
-        differences = pd.concat([diff1, diff2], ignore_index=True)
-
-        if not differences.empty:
-            # Count duplicates for clarity
-            diff_counts = differences.groupby(columns + ['diff_type']).size().reset_index(name='count')
-            raise AssertionError(
-                f"Datasets do not match! Differences found:\n{diff_counts.to_string(index=False)}"
-            )
+        # Aligned copies of the compared columns (the fixtures passed in stay untouched),
+        # cast once per DataFrame pair
+        df1, df2 = DataQualityLibrary.schema_aligner.align(df1, df2, columns)
+
+        def differences():
+            # Rows in df1 but not in df2, then rows in df2 but not in df1, with counts for clarity
+            for left, right, diff_type in (
+                    (df1, df2, 'in source not in target'),
+                    (df2, df1, 'in target not in source'),
+            ):
+                diff = left.merge(right, on=columns, how='left', indicator=True).query('_merge == "left_only"')
+                diff_counts = diff.groupby(columns, observed=True, dropna=False).size().reset_index(name='count')
+                diff_counts.insert(len(columns), 'diff_type', diff_type)
+                yield diff_counts
+
+        raise_violations(
+            "Datasets do not match! Differences found:", differences(), "full_data_set",
+            DataQualityLibrary.violation_sink
+        )
 
     @staticmethod
     def check_dataset_is_not_empty(df: pd.DataFrame):
         """Check that the DataFrame is not empty."""
+        if is_arrow(df):
+            return ArrowDataQualityBackend.check_dataset_is_not_empty(df)
         assert not df.empty, "DataFrame is empty"
 
     @staticmethod
     def check_not_null_values(df: pd.DataFrame, column_names=None):
-        """Check that specified columns do not contain null values."""
+        """
+        Check that specified columns (all columns if None) do not contain null values.
+        All columns containing nulls are reported together.
+        """
+        if is_arrow(df):
+            return ArrowDataQualityBackend.check_not_null_values(
+                df, column_names, executor=DataQualityLibrary.column_executor
+            )
+        columns = column_names or list(df.columns)
+        has_nulls = map_columns(lambda col: df[col].isna().any(), columns, DataQualityLibrary.column_executor)
+        null_columns = [col for col, nulls in zip(columns, has_nulls) if nulls]
         if column_names:
-            for col in column_names:
-                assert df[col].notnull().all(), f"Null values found in column: {col}"
+            assert not null_columns, (
+                f"Null values found in column{'s' if len(null_columns) > 1 else ''}: {', '.join(null_columns)}"
+            )
         else:
-            assert df.notnull().all().all(), "Null values found in DataFrame"
+            assert not null_columns, f"Null values found in DataFrame (columns: {', '.join(null_columns)})"
 
     @staticmethod
     def check_column_validity(
@@ -163,7 +207,8 @@ class DataQualityLibrary:
             pd.DataFrame: DataFrame of invalid rows (empty if all rows are valid).
 
         Raises:
-            AssertionError: If any invalid values are found.
+            ViolationError: If any invalid values are found (an AssertionError), listing the
+                row index, column and value of each violation.
 
         Example:
             ```python
@@ -193,16 +238,26 @@ class DataQualityLibrary:
             )
             ```
         """
-        all_invalid_rows = []
+        if is_arrow(df):
+            return ArrowDataQualityBackend.check_column_validity(
+                df, column_rules,
+                sink=DataQualityLibrary.violation_sink, executor=DataQualityLibrary.column_executor
+            )
 
-        for column, rules in column_rules.items():
+        def column_invalid_rows(column):
+            rules = column_rules[column]
             invalid_mask = pd.Series(False, index=df.index)
 
             # --- Numeric range checks ---
-            if "min" in rules:
-                invalid_mask |= df[column] < rules["min"]
-            if "max" in rules:
-                invalid_mask |= df[column] > rules["max"]
+            if "min" in rules or "max" in rules:
+                values = df[column]
+                if isinstance(values.dtype, pd.CategoricalDtype) and not values.dtype.ordered:
+                    # Unordered categoricals (compact DataFrames) do not support < and >
+                    values = values.astype(values.cat.categories.dtype)
+                if "min" in rules:
+                    invalid_mask |= values < rules["min"]
+                if "max" in rules:
+                    invalid_mask |= values > rules["max"]
 
             # --- Allowed values check ---
             if "allowed_values" in rules:
@@ -212,21 +267,20 @@ class DataQualityLibrary:
             if "condition" in rules:
                 invalid_mask |= ~df[column].apply(rules["condition"])
 
-            # Collect invalid rows
-            invalid_rows = df.loc[invalid_mask, [column]]
-            if not invalid_rows.empty:
-                invalid_rows = invalid_rows.assign(invalid_column=column)
-                all_invalid_rows.append(invalid_rows)
-
-        # Combine invalid rows across all columns
-        if all_invalid_rows:
-            invalid_df = pd.concat(all_invalid_rows)
-            raise AssertionError(
-                f"Invalid values found in the following columns:\n{invalid_df.head(20)}\n"
-                f"(Total {len(invalid_df)} invalid rows)"
-            )
-        else:
-            return pd.DataFrame(columns=df.columns)
+            # Invalid rows in long format, so all columns fit one report
+            invalid_values = df.loc[invalid_mask, column]
+            return pd.DataFrame({
+                "row": invalid_values.index,
+                "invalid_column": column,
+                "value": invalid_values.astype(str).to_numpy(),
+            })
+
+        invalid_rows = map_columns(column_invalid_rows, list(column_rules), DataQualityLibrary.column_executor)
+        raise_violations(
+            "Invalid values found in the following columns:", invalid_rows, "column_validity",
+            DataQualityLibrary.violation_sink
+        )
+        return pd.DataFrame(columns=df.columns)
 
     @staticmethod
     def check_table_exists(connector, table_name: str):
@@ -262,9 +316,10 @@ class DataQualityLibrary:
         Raises:
             AssertionError: If the table is empty.
         """
-        sql = f"SELECT * FROM `{table_name}` LIMIT {limit}"
+        # No columns referenced, so BigQuery scans nothing; within the check window if one is configured
+        sql = f"SELECT 1 AS present FROM {table_expression(connector, table_name)} LIMIT {limit}"
         df = connector.get_data_sql(sql)
-        assert not df.empty, f"Table {table_name} is empty"
+        assert not df.empty, f"Table {table_name} is empty{window_note((connector, table_name))}"
 
     @staticmethod
     def check_table_schema(bq_connector, table_name: str, expected_schema: dict):
@@ -347,4 +402,245 @@ class DataQualityLibrary:
                 "\n".join(errors)
             )
 
+    @staticmethod
+    def check_referential_integrity(
+            child,
+            child_cols: list,
+            parent,
+            parent_cols: list,
+            sample_size: int = 20,
+            chunk_size: int = 100_000
+    ) -> dict:
+        """
+        Check that every key in the child dataset exists in the parent dataset (foreign-key check).
+
+        When both sides are tables in the same engine (same BigQuery project or Postgres database)
+        the check runs as a single SQL anti-join and only the orphan summary is downloaded.
+        Otherwise the parent keys are streamed into a compact array of 64-bit key hashes and the
+        child is streamed against it chunk by chunk, so neither side is held in memory in full.
+        Child rows with a null in any key column are not considered orphans, like in SQL.
+        Hashed keys of different types match by value: an integer, an integral float and a canonical
+        integer text ("42") are the same key; other values match by their text (see `key_column_hashes`).
 
+        Args:
+            child: Child dataset - a pandas DataFrame, a `(connector, table_name)` pair
+                or an iterable of DataFrame chunks.
+            child_cols (list): Foreign-key columns in the child dataset.
+            parent: Parent dataset, in any of the forms accepted for `child`.
+            parent_cols (list): Referenced key columns in the parent dataset, in the same order.
+            sample_size (int, optional): Maximum number of distinct orphan keys reported. Default is 20.
+            chunk_size (int, optional): Rows per chunk when streaming. Default is 100 000.
+
+        Returns:
+            dict: `orphan_count` (0) and an empty `sample` DataFrame when no orphans are found.
+
+        Raises:
+            AssertionError: If orphan rows are found, showing their count and a sample of orphan keys.
+
+        Example:
+            ```python
+            DataQualityLibrary.check_referential_integrity(
+                child=(db_connection, "visits"),
+                child_cols=["facility_id"],
+                parent=(db_connection, "facilities"),
+                parent_cols=["id"]
+            )
+            ```
+        """
+        if len(child_cols) != len(parent_cols):
+            raise ValueError(
+                f"Key column count mismatch: {child_cols} vs {parent_cols}"
+            )
+
+        if same_engine(child, parent):
+            orphan_count, sample = DataQualityLibrary._referential_integrity_sql(
+                child, child_cols, parent, parent_cols, sample_size
+            )
+        else:
+            orphan_count, sample = DataQualityLibrary._referential_integrity_hashed(
+                child, child_cols, parent, parent_cols, sample_size, chunk_size
+            )
+
+        if orphan_count:
+            raise AssertionError(
+                f"Orphan rows found{window_note(child)}: {orphan_count} rows in child {child_cols} "
+                f"have no matching parent {parent_cols}. Sample of orphan keys:\n"
+                f"{sample.to_string(index=False)}"
+            )
+        return {"orphan_count": orphan_count, "sample": sample}
+
+    @staticmethod
+    def check_distribution_drift(
+            source,
+            column: str,
+            baseline_store,
+            baseline_name: str = None,
+            method: str = "psi",
+            threshold: float = None,
+            kind: str = "auto",
+            bins: int = 10,
+            top_k: int = 20,
+            update_baseline: bool = False
+    ) -> dict:
+        """
+        Check that the distribution of a column has not shifted compared with a stored baseline.
+
+        Only compact summaries are computed and compared: quantile-bin counts for numeric columns
+        and most-frequent-value counts for categorical ones. For `(connector, table_name)` sources
+        the summary is computed in the engine with one aggregate query (`APPROX_QUANTILES` /
+        `APPROX_TOP_COUNT` in BigQuery), so no rows are downloaded. A missing baseline raises
+        `MissingBaselineError` unless `update_baseline=True`, which stores the current summary as
+        the baseline.
+
+        Args:
+            source: A pandas DataFrame or a `(connector, table_name)` pair.
+            column (str): Column to check.
+            baseline_store: Store with `load(name)` / `save(name, profile)`, e.g. `BaselineStore`.
+            baseline_name (str, optional): Baseline key. Defaults to "<table>.<column>" for table
+                sources and to the column name for DataFrames.
+            method (str, optional): "psi" (population stability index) or "ks" (largest gap of the
+                bucketed cumulative distributions). Default is "psi".
+            threshold (float, optional): Maximum allowed distance. Defaults to 0.2 for PSI and 0.1 for KS.
+            kind (str, optional): "numeric", "categorical" or "auto" to detect it from the column type.
+            bins (int, optional): Quantile bins used when a numeric baseline is created. Default is 10.
+            top_k (int, optional): Most frequent values kept when a categorical baseline is created. Default is 20.
+            update_baseline (bool, optional): If True, create the baseline if it is missing, or replace
+                it with the current summary after the comparison.
+
+        Returns:
+            dict: `distance`, `threshold`, `method`, `baseline_created` and the current `profile`.
+
+        Raises:
+            AssertionError: If the distance exceeds the threshold.
+            MissingBaselineError: If there is no baseline and `update_baseline` is False.
+        """
+        if method not in DISTANCES:
+            raise ValueError(f"Unknown drift method '{method}', expected one of {list(DISTANCES)}")
+        distance_func, default_threshold = DISTANCES[method]
+        threshold = default_threshold if threshold is None else threshold
+
+        if baseline_name is None:
+            baseline_name = f"{source[1]}.{column}" if isinstance(source, tuple) else column
+        baseline = baseline_store.load(baseline_name)
+
+        if baseline is None:
+            if not update_baseline:
+                location = baseline_store.location(baseline_name) if hasattr(baseline_store, "location") \
+                    else baseline_name
+                raise MissingBaselineError(
+                    f"No baseline yet for column '{column}' ('{baseline_name}', {location}): "
+                    f"run with --dq_update_baselines (update_baseline=True) to create it, then commit it."
+                )
+            kind = detect_kind(source, column) if kind == "auto" else kind
+            profile = profile_column(source, column, kind, bins=bins, top_k=top_k)
+            baseline_store.save(baseline_name, profile)
+            return {"distance": 0.0, "threshold": threshold, "method": method,
+                    "baseline_created": True, "profile": profile}
+
+        profile = profile_column(source, column, baseline["kind"], baseline=baseline)
+        distance = distance_func(baseline, profile)
+        if update_baseline:
+            baseline_store.save(baseline_name, profile_column(source, column, baseline["kind"], bins=bins, top_k=top_k))
+
+        if distance > threshold:
+            raise AssertionError(
+                f"Distribution drift detected in column '{column}'{window_note(source)} (baseline '{baseline_name}'): "
+                f"{method.upper()} = {distance:.4f} > {threshold}\n"
+                f"Baseline counts: {baseline['counts']} (nulls: {baseline['nulls']})\n"
+                f"Current counts:  {profile['counts']} (nulls: {profile['nulls']})"
+            )
+        return {"distance": distance, "threshold": threshold, "method": method,
+                "baseline_created": False, "profile": profile}
+
+    @staticmethod
+    def check_stream(chunks, checks: list, fail_fast: bool = False) -> list:
+        """
+        Run checks over a stream of chunks with bounded memory, for datasets that do not fit
+        in one pandas DataFrame.
+
+        Each check keeps only a small mergeable state (row counts, null counts, hashed key sets,
+        capped samples of violations), so memory is bounded by one chunk plus that state.
+
+        Args:
+            chunks: Iterable of pandas DataFrames or pyarrow RecordBatches, e.g.
+                `bq_connector.iter_data_sql(sql)` (BigQuery Storage API),
+                `db_connection.iter_data_sql(sql)` (Postgres server-side cursor) or
+                `parquet_reader.iter_batches(path)` (Parquet row groups).
+            checks (list): States from `src.data_quality.streaming`: `RowCountState`,
+                `NotNullState`, `DuplicateState`, `ColumnValidityState`.
+            fail_fast (bool, optional): If True, stop reading at the first batch with a violation.
+
+        Returns:
+            list: The final check states.
+
+        Raises:
+            AssertionError: If any check fails.
+
+        Example:
+            ```python
+            DataQualityLibrary.check_stream(
+                bq_connector.iter_data_sql(f"SELECT Code, Kromka FROM `{table_AGT}`"),
+                [NotNullState(["Kromka"]), DuplicateState(["Code"])],
+                fail_fast=True
+            )
+            ```
+        """
+        return run_streaming_checks(chunks, checks, fail_fast=fail_fast)
+
+    @staticmethod
+    def _referential_integrity_sql(child, child_cols, parent, parent_cols, sample_size):
+        """Pushed-down anti-join returning the orphan row count and a capped sample of orphan keys."""
+        connector, child_table = child
+        parent_table = parent[1]
+        q = lambda name: quote_identifier(connector, name)
+
+        key_select = ", ".join(f"c.{q(col)}" for col in child_cols)
+        not_null = " AND ".join(f"c.{q(col)} IS NOT NULL" for col in child_cols)
+        join_condition = " AND ".join(
+            f"p.{q(p_col)} = c.{q(c_col)}" for c_col, p_col in zip(child_cols, parent_cols)
+        )
+        group_by = ", ".join(str(i + 1) for i in range(len(child_cols)))
+        sql = f"""
+        SELECT {key_select}, COUNT(*) AS orphan_rows, SUM(COUNT(*)) OVER () AS total_orphan_rows
+        FROM {table_expression(connector, child_table)} AS c
+        WHERE {not_null}
+          AND NOT EXISTS (
+            -- parents are read in full: children in the check window may reference older parent rows
+            SELECT 1 FROM {quote_table(connector, parent_table)} AS p
+            WHERE {join_condition}
+          )
+        GROUP BY {group_by}
+        ORDER BY orphan_rows DESC
+        LIMIT {int(sample_size)}
+        """
+        df = connector.get_data_sql(sql)
+        if df.empty:
+            return 0, df[child_cols + ["orphan_rows"]]
+        orphan_count = int(df["total_orphan_rows"].iloc[0])
+        return orphan_count, df[child_cols + ["orphan_rows"]].reset_index(drop=True)
+
+    @staticmethod
+    def _referential_integrity_hashed(child, child_cols, parent, parent_cols, sample_size, chunk_size):
+        """Streaming hash semi-join: keeps only the parent key hashes and a capped orphan sample in memory."""
+        # Parents are read in full: children in the check window may reference older parent rows
+        parent_keys = build_key_set(iter_chunks(parent, parent_cols, chunk_size, windowed=False), parent_cols)
+
+        orphan_count = 0
+        sample_counts = {}
+        for chunk in iter_chunks(child, child_cols, chunk_size):
+            keys = chunk[child_cols].dropna()
+            if keys.empty:
+                continue
+            orphans = keys[~isin_key_set(hash_keys(keys, child_cols), parent_keys)]
+            if orphans.empty:
+                continue
+            orphan_count += len(orphans)
+            for key, count in orphans.value_counts(sort=False).items():
+                key = key if isinstance(key, tuple) else (key,)
+                if key in sample_counts or len(sample_counts) < sample_size:
+                    sample_counts[key] = sample_counts.get(key, 0) + int(count)
+
+        sample = pd.DataFrame(list(sample_counts.keys()), columns=child_cols)
+        sample["orphan_rows"] = list(sample_counts.values())
+        sample = sample.sort_values("orphan_rows", ascending=False, ignore_index=True)
+        return orphan_count, sample
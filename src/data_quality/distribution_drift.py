@@ -0,0 +1,294 @@
+import json
+import os
+import re
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+
+from src.data_quality.sources import is_table_source, quote_identifier, quote_literal, quote_table, table_expression
+
+NULL_BUCKET = "__null__"
+OTHER_BUCKET = "__other__"
+PSI_EPSILON = 1e-4
+# Postgres type OIDs profiled as numeric: int8, int2, int4, float4, float8, numeric
+POSTGRES_NUMERIC_TYPES = {20, 21, 23, 700, 701, 1700}
+
+
+class MissingBaselineError(AssertionError):
+    """A drift check has no baseline to compare with yet; the pytest suite reports it as skipped."""
+
+
+class BaselineStore:
+    """
+    Stores distribution profiles (a few hundred bytes each) as JSON files, one file per baseline:
+    `<directory>/<baseline name>.json`.
+
+    The pytest fixture uses `baselines_dir` of the environment in env_config.yaml (default
+    "baselines", relative to the working directory). Baselines are reference data: commit them
+    (or keep them on storage that outlives CI workspaces): a drift check without its baseline
+    checks nothing (it raises `MissingBaselineError`, a skip in the pytest suite) until the
+    baseline is created with `update_baseline=True` (`pytest --dq_update_baselines`).
+    """
+
+    def __init__(self, directory: str = "baselines"):
+        self.directory = directory
+
+    def _path(self, name: str) -> str:
+        file_name = re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+        return os.path.join(self.directory, f"{file_name}.json")
+
+    def location(self, name: str) -> str:
+        """Where the baseline `name` is stored."""
+        return self._path(name)
+
+    def load(self, name: str):
+        """Return the stored profile, or None if no baseline exists yet."""
+        path = self._path(name)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+
+    def save(self, name: str, profile: dict):
+        """Store `profile` as the baseline `name`, replacing any previous one."""
+        os.makedirs(self.directory, exist_ok=True)
+        with open(self._path(name), "w", encoding="utf-8") as f:
+            json.dump(profile, f, indent=2)
+
+
+def detect_kind(source, column: str) -> str:
+    """
+    Return 'numeric' or 'categorical' for a column from its declared type, without loading its data.
+
+    Raises:
+        ValueError: If the source has no column `column`.
+    """
+    if is_table_source(source):
+        connector, table_name = source
+        if hasattr(connector, "client"):
+            # BigQuery: read the type from table metadata, no scan needed
+            field = next((f for f in connector.client.get_table(table_name).schema if f.name == column), None)
+            if field is None:
+                raise ValueError(f"Column '{column}' not found in {table_name}")
+            numeric_types = {"INTEGER", "INT64", "FLOAT", "FLOAT64", "NUMERIC", "BIGNUMERIC"}
+            return "numeric" if field.field_type.upper() in numeric_types else "categorical"
+        sql = f"SELECT * FROM {quote_table(connector, table_name)}"
+        if hasattr(connector, "column_types"):
+            # Postgres: type OIDs from cursor.description of a query returning no rows
+            types = connector.column_types(sql)
+            if column not in types:
+                raise ValueError(f"Column '{column}' not found in {table_name}")
+            return "numeric" if types[column] in POSTGRES_NUMERIC_TYPES else "categorical"
+        # Other engines (local DuckDB): the Arrow type of an empty result
+        schema = connector.get_arrow_sql(f"{sql} LIMIT 0").schema
+        if column not in schema.names:
+            raise ValueError(f"Column '{column}' not found in {table_name}")
+        arrow_type = schema.field(column).type
+        numeric = pa.types.is_integer(arrow_type) or pa.types.is_floating(arrow_type) or pa.types.is_decimal(arrow_type)
+        return "numeric" if numeric else "categorical"
+    if column not in source.columns:
+        raise ValueError(f"Column '{column}' not found in the DataFrame")
+    series = source[column]
+    if pd.api.types.is_numeric_dtype(series) and not pd.api.types.is_bool_dtype(series):
+        return "numeric"
+    return "categorical"
+
+
+def profile_column(source, column: str, kind: str, baseline: dict = None, bins: int = 10, top_k: int = 20) -> dict:
+    """
+    Build the compact distribution profile of one column.
+
+    Without a baseline, bucket boundaries are derived from the data itself (quantile edges for
+    numeric columns, most frequent values for categorical ones). With a baseline, the data is
+    counted into the baseline's buckets so the two profiles can be compared.
+
+    Args:
+        source: A pandas DataFrame or a `(connector, table_name)` pair. Table sources are
+            summarized by one aggregate query; only the bucket counts are downloaded.
+        column (str): Column to profile.
+        kind (str): 'numeric' or 'categorical'.
+        baseline (dict, optional): Profile whose buckets should be reused.
+        bins (int, optional): Number of quantile bins for new numeric profiles.
+        top_k (int, optional): Number of most frequent values kept for new categorical profiles.
+
+    Returns:
+        dict: Profile with `kind`, `edges` or `categories`, bucket `counts` and `nulls`.
+    """
+    if is_table_source(source):
+        if kind == "numeric":
+            return _numeric_profile_sql(source, column, baseline, bins)
+        return _categorical_profile_sql(source, column, baseline, top_k)
+    if kind == "numeric":
+        return _numeric_profile_frame(source[column], baseline, bins)
+    return _categorical_profile_frame(source[column], baseline, top_k)
+
+
+def _numeric_profile_frame(series: pd.Series, baseline, bins):
+    values = pd.to_numeric(series, errors="coerce").to_numpy(dtype="float64", na_value=np.nan)
+    null_mask = np.isnan(values)
+    values = values[~null_mask]
+    if baseline is None:
+        if values.size:
+            edges = np.quantile(values, np.linspace(0, 1, bins + 1)[1:-1]).tolist()
+        else:
+            edges = []
+    else:
+        edges = baseline["edges"]
+    counts = np.bincount(np.searchsorted(np.asarray(edges, dtype="float64"), values, side="right"),
+                         minlength=len(edges) + 1)
+    return {"kind": "numeric", "edges": edges, "counts": counts.tolist(), "nulls": int(null_mask.sum())}
+
+
+def _categorical_profile_frame(series: pd.Series, baseline, top_k):
+    nulls = int(series.isna().sum())
+    values = series.dropna().astype(str)
+    value_counts = values.value_counts()
+    if baseline is None:
+        categories = value_counts.index[:top_k].tolist()
+    else:
+        categories = baseline["categories"]
+    counts = [int(value_counts.get(category, 0)) for category in categories]
+    counts.append(int(len(values) - sum(counts)))
+    return {"kind": "categorical", "categories": categories, "counts": counts, "nulls": nulls}
+
+
+def _numeric_profile_sql(source, column, baseline, bins):
+    connector, table_name = source
+    col = quote_identifier(connector, column)
+    table = table_expression(connector, table_name)
+    if connector.dialect == "bigquery":
+        if baseline is None:
+            edges_select = (
+                f"SELECT ARRAY(SELECT x FROM UNNEST(quantiles) AS x WITH OFFSET AS o "
+                f"WHERE o BETWEEN 1 AND {bins - 1} ORDER BY o) AS e "
+                f"FROM (SELECT APPROX_QUANTILES(v, {bins}) AS quantiles FROM src)"
+            )
+        else:
+            edges_select = f"SELECT ARRAY<FLOAT64>[{', '.join(map(repr, map(float, baseline['edges'])))}] AS e"
+        sql = f"""
+        WITH src AS (SELECT SAFE_CAST({col} AS FLOAT64) AS v FROM {table}),
+        edges AS ({edges_select})
+        SELECT IF(v IS NULL, -1, RANGE_BUCKET(v, edges.e)) AS bucket, COUNT(*) AS n, ANY_VALUE(edges.e) AS edges
+        FROM src CROSS JOIN edges
+        GROUP BY bucket
+        """
+    else:
+        if baseline is None:
+            fractions = ", ".join(str(i / bins) for i in range(1, bins))
+            edges_select = f"SELECT percentile_cont(ARRAY[{fractions}]) WITHIN GROUP (ORDER BY v) AS e FROM src"
+        else:
+            edges_select = (
+                f"SELECT ARRAY[{', '.join(map(repr, map(float, baseline['edges'])))}]::double precision[] AS e"
+            )
+        sql = f"""
+        WITH src AS (SELECT CAST({col} AS double precision) AS v FROM {table}),
+        edges AS ({edges_select})
+        SELECT CASE WHEN v IS NULL THEN -1 ELSE width_bucket(v, edges.e) END AS bucket, COUNT(*) AS n,
+               MIN(edges.e) AS edges
+        FROM src CROSS JOIN edges
+        GROUP BY 1
+        """
+    df = connector.get_data_sql(sql)
+
+    if baseline is not None:
+        edges = baseline["edges"]
+    else:
+        non_empty = df["edges"].dropna()
+        edges = [float(e) for e in non_empty.iloc[0]] if not non_empty.empty else []
+    counts = [0] * (len(edges) + 1)
+    nulls = 0
+    for bucket, n in zip(df["bucket"], df["n"]):
+        if pd.isna(bucket):
+            continue
+        if int(bucket) == -1:
+            nulls += int(n)
+        else:
+            counts[int(bucket)] += int(n)
+    return {"kind": "numeric", "edges": edges, "counts": counts, "nulls": nulls}
+
+
+def _categorical_profile_sql(source, column, baseline, top_k):
+    connector, table_name = source
+    col = quote_identifier(connector, column)
+    table = table_expression(connector, table_name)
+    text_type = "STRING" if connector.dialect == "bigquery" else "text"
+
+    if baseline is None:
+        if connector.dialect == "bigquery":
+            sql = f"""
+            SELECT APPROX_TOP_COUNT(CAST({col} AS STRING), {top_k + 1}) AS top,
+                   COUNT(*) AS total, COUNTIF({col} IS NULL) AS nulls
+            FROM {table}
+            """
+            row = connector.get_data_sql(sql).iloc[0]
+            top = [(item["value"], int(item["count"])) for item in row["top"] if item["value"] is not None]
+            total, nulls = int(row["total"]), int(row["nulls"])
+        else:
+            sql = f"""
+            SELECT value, n, total FROM (
+                SELECT CAST({col} AS text) AS value, COUNT(*) AS n, SUM(COUNT(*)) OVER () AS total
+                FROM {table}
+                GROUP BY 1
+            ) g
+            ORDER BY (value IS NULL) DESC, n DESC
+            LIMIT {top_k + 1}
+            """
+            df = connector.get_data_sql(sql)
+            total = int(df["total"].iloc[0]) if not df.empty else 0
+            nulls = int(df.loc[df["value"].isna(), "n"].sum())
+            top = [(value, int(n)) for value, n in zip(df["value"], df["n"]) if value is not None]
+        top = top[:top_k]
+        categories = [value for value, _ in top]
+        counts = [n for _, n in top]
+        counts.append(total - nulls - sum(counts))
+        return {"kind": "categorical", "categories": categories, "counts": counts, "nulls": nulls}
+
+    categories = baseline["categories"]
+    in_list = ", ".join(quote_literal(connector, category) for category in categories) or None
+    known = f"CAST({col} AS {text_type}) IN ({in_list})" if in_list else "FALSE"
+    sql = f"""
+    SELECT CASE
+             WHEN {col} IS NULL THEN '{NULL_BUCKET}'
+             WHEN {known} THEN CAST({col} AS {text_type})
+             ELSE '{OTHER_BUCKET}'
+           END AS value,
+           COUNT(*) AS n
+    FROM {table}
+    GROUP BY 1
+    """
+    df = connector.get_data_sql(sql)
+    found = {value: int(n) for value, n in zip(df["value"], df["n"])}
+    counts = [found.get(category, 0) for category in categories]
+    counts.append(found.get(OTHER_BUCKET, 0))
+    return {"kind": "categorical", "categories": categories, "counts": counts, "nulls": found.get(NULL_BUCKET, 0)}
+
+
+def _shares(profile: dict) -> np.ndarray:
+    counts = np.asarray(profile["counts"] + [profile["nulls"]], dtype="float64")
+    total = counts.sum()
+    return counts / total if total else counts
+
+
+def population_stability_index(baseline: dict, current: dict) -> float:
+    """PSI over the baseline buckets (including the null bucket); > 0.2 is usually read as a major shift."""
+    expected = np.clip(_shares(baseline), PSI_EPSILON, None)
+    actual = np.clip(_shares(current), PSI_EPSILON, None)
+    return float(np.sum((actual - expected) * np.log(actual / expected)))
+
+
+def ks_distance(baseline: dict, current: dict) -> float:
+    """
+    KS-type distance: the largest gap between the bucketed cumulative distributions.
+    For categorical profiles, where buckets have no order, the largest per-bucket share gap is used.
+    """
+    expected, actual = _shares(baseline), _shares(current)
+    if baseline["kind"] == "numeric":
+        return float(np.max(np.abs(np.cumsum(actual) - np.cumsum(expected))))
+    return float(np.max(np.abs(actual - expected)))
+
+
+DISTANCES = {
+    "psi": (population_stability_index, 0.2),
+    "ks": (ks_distance, 0.1),
+}
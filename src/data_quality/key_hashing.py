@@ -0,0 +1,175 @@
+import decimal
+
+import numpy as np
+import pandas as pd
+
+# Canonical decimal text of an integer: no sign other than "-", no leading zeros, no "+"
+_INTEGER_TEXT = r"-?(?:0|[1-9][0-9]*)"
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+# Hash of a missing value (None, NaN, NaT, NA): all nulls are equal to each other
+_NULL_HASH = np.uint64(0x9E3779B97F4A7C15)
+
+
+def _hash_ints(values: np.ndarray) -> np.ndarray:
+    return pd.util.hash_array(values.astype(np.int64, copy=False))
+
+
+def _hash_texts(values) -> np.ndarray:
+    return pd.util.hash_array(np.asarray(values, dtype=object))
+
+
+def _value_text(value) -> str:
+    """Text form of one key value of an object column (integral numbers without a fraction)."""
+    if isinstance(value, (bool, np.bool_)):
+        return str(int(value))
+    if isinstance(value, (int, np.integer)):
+        return str(int(value))
+    if isinstance(value, (float, np.floating)):
+        return str(int(value)) if np.isfinite(value) and value == int(value) else repr(float(value))
+    if isinstance(value, decimal.Decimal):
+        return str(int(value)) if value == value.to_integral_value() else str(value.normalize())
+    return str(value)
+
+
+def _hash_text_column(texts: pd.Series) -> np.ndarray:
+    """Hash text keys, hashing canonical integer texts ("42", "-7") as the integers they spell."""
+    texts = texts.astype(object)
+    hashes = np.empty(len(texts), dtype=np.uint64)
+    is_int = texts.str.fullmatch(_INTEGER_TEXT).fillna(False).to_numpy(dtype=bool)
+    ints = texts[is_int]
+    short = ints.str.len().to_numpy() <= 18
+    int_values = np.empty(len(ints), dtype=np.int64)
+    int_values[short] = ints[short].astype(np.int64).to_numpy()
+    # 19+ digit texts: exact Python ints, integers only if they fit into INT64
+    fits = short.copy()
+    for i in np.flatnonzero(~short):
+        value = int(ints.iloc[i])
+        if _INT64_MIN <= value <= _INT64_MAX:
+            int_values[i] = value
+            fits[i] = True
+    int_positions = np.flatnonzero(is_int)
+    hashes[int_positions[fits]] = _hash_ints(int_values[fits])
+    text_positions = np.concatenate([np.flatnonzero(~is_int), int_positions[~fits]])
+    hashes[text_positions] = _hash_texts(texts.to_numpy()[text_positions])
+    return hashes
+
+
+def key_column_hashes(series: pd.Series) -> np.ndarray:
+    """
+    Hash every value of a key column so that equal keys hash equally across sources and dtypes.
+
+    One rule applies to every value, whatever the column dtype: a value that is an integer
+    (integer and boolean types, floats without a fractional part, `Decimal`s and canonical
+    integer texts such as "42" but not "042" or "+42") is hashed as an INT64, exactly, so
+    distinct keys above 2**53 stay distinct. Every other value is hashed as its text, floats
+    in their shortest repr ("1.5"). So 1, 1.0 and "1" match, "1.50" and 1.5 do not.
+    Datetimes are hashed as INT64 nanoseconds since the epoch in UTC; nulls share one hash.
+
+    Args:
+        series (pd.Series): Key column.
+
+    Returns:
+        np.ndarray: Array of uint64 hashes, one per value.
+    """
+    nulls = series.isna().to_numpy()
+    if nulls.any():
+        hashes = np.full(len(series), _NULL_HASH, dtype=np.uint64)
+        hashes[~nulls] = key_column_hashes(series[~nulls])
+        return hashes
+    if pd.api.types.is_datetime64_any_dtype(series):
+        if getattr(series.dt, "tz", None) is not None:
+            series = series.dt.tz_convert("UTC").dt.tz_localize(None)
+        return _hash_ints(series.astype("datetime64[ns]").astype("int64").to_numpy())
+    if pd.api.types.is_bool_dtype(series) or pd.api.types.is_integer_dtype(series):
+        return _hash_ints(series.to_numpy(dtype=np.int64))
+    if pd.api.types.is_float_dtype(series):
+        values = series.to_numpy(dtype=np.float64)
+        with np.errstate(invalid="ignore"):
+            integral = np.isfinite(values) & (values == np.floor(values)) & (np.abs(values) < 2.0 ** 63)
+        hashes = np.empty(len(values), dtype=np.uint64)
+        hashes[integral] = _hash_ints(values[integral].astype(np.int64))
+        hashes[~integral] = _hash_texts([repr(float(value)) for value in values[~integral]])
+        return hashes
+    if series.dtype == object:
+        series = series.map(_value_text)
+    return _hash_text_column(series.astype(str))
+
+
+def hash_keys(df: pd.DataFrame, columns: list) -> np.ndarray:
+    """
+    Hash the key columns of each row into one uint64 value (see `key_column_hashes` for
+    when values of different types count as equal).
+
+    Args:
+        df (pd.DataFrame): Rows to hash.
+        columns (list): Key columns, in key order.
+
+    Returns:
+        np.ndarray: Array of uint64 hashes, one per row.
+    """
+    column_hashes = pd.DataFrame(
+        {i: key_column_hashes(df[col]) for i, col in enumerate(columns)},
+        index=df.index,
+    )
+    return pd.util.hash_pandas_object(column_hashes, index=False).to_numpy()
+
+
+def build_key_set(chunks, columns: list) -> np.ndarray:
+    """
+    Build the compact set of key hashes of a chunked source.
+
+    Rows with a null in any key column are skipped. Only the sorted, unique uint64 hashes
+    are kept in memory (8 bytes per distinct key).
+    """
+    parts = []
+    for chunk in chunks:
+        keys = chunk[columns].dropna()
+        if not keys.empty:
+            parts.append(np.unique(hash_keys(keys, columns)))
+    if not parts:
+        return np.empty(0, dtype=np.uint64)
+    return np.unique(np.concatenate(parts))
+
+
+def isin_key_set(hashes: np.ndarray, key_set: np.ndarray) -> np.ndarray:
+    """Vectorized membership test of hashes against a sorted key set built by `build_key_set`."""
+    if key_set.size == 0:
+        return np.zeros(hashes.shape, dtype=bool)
+    positions = np.searchsorted(key_set, hashes)
+    positions[positions == key_set.size] = 0
+    return key_set[positions] == hashes
+
+
+class HashKeySet:
+    """
+    Growing set of uint64 key hashes kept as a few sorted runs (merged like a binary counter),
+    so adding n keys costs O(n log n) overall and membership is a handful of binary searches.
+    """
+
+    def __init__(self):
+        self.runs = []
+
+    def __len__(self):
+        return sum(run.size for run in self.runs)
+
+    def contains(self, hashes: np.ndarray) -> np.ndarray:
+        """Vectorized membership test; returns a boolean mask aligned with `hashes`."""
+        mask = np.zeros(hashes.shape, dtype=bool)
+        for run in self.runs:
+            mask |= isin_key_set(hashes, run)
+        return mask
+
+    def add(self, hashes: np.ndarray):
+        """Add hashes to the set."""
+        run = np.unique(hashes)
+        if run.size == 0:
+            return
+        self.runs.append(run)
+        while len(self.runs) > 1 and self.runs[-2].size <= 2 * self.runs[-1].size:
+            last = self.runs.pop()
+            self.runs[-1] = np.union1d(self.runs[-1], last)
+
+    def merge(self, other: "HashKeySet"):
+        """Add every hash of another set."""
+        for run in other.runs:
+            self.add(run)
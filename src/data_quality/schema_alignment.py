@@ -0,0 +1,217 @@
+import threading
+import weakref
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Type families columns are compared in: a column pair is cast to the family of its "widest" side
+TIMESTAMP = "timestamp"
+NUMERIC = "numeric"
+STRING = "string"
+
+# attrs key under which connectors store the family of each result column
+SOURCE_SCHEMA_ATTR = "source_schema"
+
+_BIGQUERY_FAMILIES = {
+    "TIMESTAMP": TIMESTAMP, "DATETIME": TIMESTAMP, "DATE": TIMESTAMP,
+    "INTEGER": NUMERIC, "INT64": NUMERIC, "FLOAT": NUMERIC, "FLOAT64": NUMERIC,
+    "NUMERIC": NUMERIC, "BIGNUMERIC": NUMERIC, "DECIMAL": NUMERIC, "BIGDECIMAL": NUMERIC,
+    # Booleans count as numbers, as pandas treats bool columns
+    "BOOLEAN": NUMERIC, "BOOL": NUMERIC,
+}
+
+# Postgres type OIDs (pg_type.oid) as reported in cursor.description
+_POSTGRES_FAMILIES = {
+    16: NUMERIC,  # bool
+    20: NUMERIC, 21: NUMERIC, 23: NUMERIC, 26: NUMERIC,  # int8, int2, int4, oid
+    700: NUMERIC, 701: NUMERIC, 1700: NUMERIC,  # float4, float8, numeric
+    1082: TIMESTAMP, 1114: TIMESTAMP, 1184: TIMESTAMP,  # date, timestamp, timestamptz
+}
+
+
+def bigquery_schema(fields) -> dict:
+    """Column -> type family for BigQuery `SchemaField`s (e.g. `query_job.result().schema`)."""
+    return {field.name: _BIGQUERY_FAMILIES.get(field.field_type.upper(), STRING) for field in fields}
+
+
+def postgres_schema(description) -> dict:
+    """Column -> type family for a psycopg2 `cursor.description`."""
+    return {column[0]: _POSTGRES_FAMILIES.get(column[1], STRING) for column in description}
+
+
+def arrow_schema(schema: pa.Schema) -> dict:
+    """Column -> type family for a pyarrow (Parquet) schema."""
+    return {field.name: _arrow_family(field.type) for field in schema}
+
+
+def _arrow_family(arrow_type) -> str:
+    if pa.types.is_dictionary(arrow_type):
+        arrow_type = arrow_type.value_type
+    if pa.types.is_timestamp(arrow_type) or pa.types.is_date(arrow_type):
+        return TIMESTAMP
+    if pa.types.is_integer(arrow_type) or pa.types.is_floating(arrow_type) \
+            or pa.types.is_decimal(arrow_type) or pa.types.is_boolean(arrow_type):
+        return NUMERIC
+    return STRING
+
+
+def _pandas_family(series: pd.Series) -> str:
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return TIMESTAMP
+    if pd.api.types.is_numeric_dtype(series):
+        return NUMERIC
+    return STRING
+
+
+def column_families(data, columns: list) -> dict:
+    """
+    Type family of each column: from the connector schema a DataFrame carries in
+    `df.attrs["source_schema"]`, otherwise from the pandas dtype or the Arrow type.
+    """
+    if isinstance(data, pa.Table):
+        return {col: _arrow_family(data.schema.field(col).type) for col in columns}
+    source = data.attrs.get(SOURCE_SCHEMA_ATTR) or {}
+    return {col: source.get(col) or _pandas_family(data[col]) for col in columns}
+
+
+def target_types(data1, data2, columns: list) -> dict:
+    """
+    Common type family of each column pair that has to be cast before the two datasets can be
+    compared; pairs that already have the same type are left out.
+
+    Args:
+        data1: First dataset (pandas DataFrame or pyarrow Table).
+        data2: Second dataset of the same kind.
+        columns (list): Columns to compare.
+
+    Returns:
+        dict: Column -> TIMESTAMP, NUMERIC or STRING.
+    """
+    families1, families2 = column_families(data1, columns), column_families(data2, columns)
+    targets = {}
+    for col in columns:
+        family1, family2 = families1[col], families2[col]
+        if TIMESTAMP in (family1, family2):
+            target = TIMESTAMP
+        elif NUMERIC in (family1, family2):
+            target = NUMERIC
+        else:
+            target = STRING
+        if _column_type(data1, col) != _column_type(data2, col) or family1 != target or family2 != target:
+            targets[col] = target
+    return targets
+
+
+def _column_type(data, col):
+    return data.schema.field(col).type if isinstance(data, pa.Table) else data[col].dtype
+
+
+def _cast_pandas(series1: pd.Series, series2: pd.Series, target: str) -> tuple:
+    if target == TIMESTAMP:
+        # Tz-aware against naive (BigQuery TIMESTAMP vs Postgres timestamp) is compared in UTC
+        utc = isinstance(series1.dtype, pd.DatetimeTZDtype) or isinstance(series2.dtype, pd.DatetimeTZDtype)
+        return (pd.to_datetime(series1, errors="coerce", utc=utc),
+                pd.to_datetime(series2, errors="coerce", utc=utc))
+    if target == NUMERIC:
+        series1, series2 = pd.to_numeric(series1, errors="coerce"), pd.to_numeric(series2, errors="coerce")
+        if series1.dtype != series2.dtype:
+            series1, series2 = series1.astype("float64"), series2.astype("float64")
+        return series1, series2
+    # Missing values stay missing instead of becoming the strings "None"/"nan"
+    string_dtype = pd.StringDtype("pyarrow")
+    return series1.astype(string_dtype), series2.astype(string_dtype)
+
+
+def _arrow_target_type(type1, type2, target: str):
+    if target == NUMERIC:
+        return pa.float64()
+    if target == STRING:
+        return pa.string()
+    timestamps = [t for t in (type1, type2) if pa.types.is_timestamp(t)]
+    with_tz = [t for t in timestamps if t.tz is not None]
+    return (with_tz or timestamps or [pa.timestamp("us")])[0]
+
+
+def align(data1, data2, columns: list) -> tuple:
+    """
+    Views of two datasets restricted to `columns`, with every column pair cast to a common type.
+
+    Only pairs whose types differ are cast; the inputs are never modified. pandas DataFrames are
+    aligned with pandas casts, pyarrow Tables with `pyarrow.compute.cast`.
+
+    Args:
+        data1: First dataset (pandas DataFrame or pyarrow Table).
+        data2: Second dataset of the same kind.
+        columns (list): Columns to compare.
+
+    Returns:
+        tuple: The two aligned datasets.
+
+    Raises:
+        ValueError: If a column is missing from `data2`.
+    """
+    names2 = data2.column_names if isinstance(data2, pa.Table) else data2.columns
+    for col in columns:
+        if col not in names2:
+            raise ValueError(f"Column '{col}' not found in df2")
+    targets = target_types(data1, data2, columns)
+
+    if isinstance(data1, pa.Table):
+        table1, table2 = data1.select(columns), data2.select(columns)
+        for col, target in targets.items():
+            arrow_type = _arrow_target_type(table1.schema.field(col).type, table2.schema.field(col).type, target)
+            table1 = table1.set_column(
+                table1.schema.get_field_index(col), col, pc.cast(table1[col], arrow_type, safe=False)
+            )
+            table2 = table2.set_column(
+                table2.schema.get_field_index(col), col, pc.cast(table2[col], arrow_type, safe=False)
+            )
+        return table1, table2
+
+    casts1, casts2 = {}, {}
+    for col, target in targets.items():
+        casts1[col], casts2[col] = _cast_pandas(data1[col], data2[col], target)
+    return _pandas_view(data1, columns, casts1), _pandas_view(data2, columns, casts2)
+
+
+def _pandas_view(df: pd.DataFrame, columns: list, casts: dict) -> pd.DataFrame:
+    if not casts and list(df.columns) == list(columns):
+        return df
+    return pd.DataFrame({col: casts[col] if col in casts else df[col] for col in columns}, index=df.index)
+
+
+class SchemaAligner:
+    """
+    Caches the aligned views of dataset pairs, so repeated comparisons of the same source and
+    target (module-scoped fixtures, several `subset_columns`) cast each column once.
+
+    Entries are keyed by the identity of the inputs and dropped as soon as either input is
+    garbage collected. The checks never modify their inputs, so a cached view only goes stale
+    if the caller modifies an input in place between two comparisons.
+    """
+
+    def __init__(self):
+        self._views = {}
+        self._lock = threading.Lock()
+
+    def align(self, data1, data2, columns: list) -> tuple:
+        """Cached `align(data1, data2, columns)`."""
+        key = (id(data1), id(data2), tuple(columns))
+        with self._lock:
+            views = self._views.get(key)
+        if views is not None:
+            return views
+        views = align(data1, data2, columns)
+        if views[0] is data1 or views[1] is data2:
+            # Nothing was cast, and caching an input would keep it alive
+            return views
+        with self._lock:
+            self._views[key] = views
+        for data in (data1, data2):
+            weakref.finalize(data, self._views.pop, key, None)
+        return views
+
+    def clear(self):
+        with self._lock:
+            self._views.clear()
@@ -0,0 +1,117 @@
+import pandas as pd
+
+
+def is_table_source(source) -> bool:
+    """Return True if `source` is a `(connector, table_name)` pair rather than in-memory data."""
+    return (
+        isinstance(source, tuple)
+        and len(source) == 2
+        and hasattr(source[0], "get_data_sql")
+        and isinstance(source[1], str)
+    )
+
+
+def same_engine(source1, source2) -> bool:
+    """
+    Check whether two table sources live in the same SQL engine (same BigQuery project or
+    same Postgres database), so they can be combined in a single pushed-down statement.
+    """
+    if not (is_table_source(source1) and is_table_source(source2)):
+        return False
+    id1 = getattr(source1[0], "source_id", None)
+    id2 = getattr(source2[0], "source_id", None)
+    return id1 is not None and id1 == id2
+
+
+def quote_identifier(connector, name: str) -> str:
+    """Quote a column name for the connector's SQL dialect."""
+    if getattr(connector, "dialect", "bigquery") == "bigquery":
+        return f"`{name}`"
+    return '"' + name.replace('"', '""') + '"'
+
+
+def quote_table(connector, table_name: str) -> str:
+    """Quote a (possibly qualified) table name for the connector's SQL dialect."""
+    if getattr(connector, "dialect", "bigquery") == "bigquery":
+        return f"`{table_name}`"
+    # Postgres table names may be schema-qualified and are used as given
+    return table_name
+
+
+def table_expression(connector, table_name: str) -> str:
+    """
+    FROM-clause expression checks should read a table through: the quoted table, or for connectors
+    with a check window (BigQuery `check_window`) a subquery restricted to the window's partitions.
+    """
+    if hasattr(connector, "table_expression"):
+        return connector.table_expression(table_name)
+    return quote_table(connector, table_name)
+
+
+def window_note(source) -> str:
+    """
+    " within the check window" if `source` is a `(connector, table_name)` pair whose table is read
+    through a check window (see `table_expression`), else "". Appended to failure messages, so a
+    failure on a windowed read says which rows were checked.
+    """
+    if not is_table_source(source):
+        return ""
+    connector, table_name = source
+    return " within the check window" if table_expression(connector, table_name) != quote_table(connector, table_name) \
+        else ""
+
+
+def select_sql(connector, table_name: str, columns: list = None, where: str = None, windowed: bool = True) -> str:
+    """
+    Query reading only the given columns of a table (all if None), within the connector's check window.
+
+    Args:
+        connector: Connector the query is for.
+        table_name (str): Full table name.
+        columns (list, optional): Columns to read. If None, all columns are read.
+        where (str, optional): Additional SQL filter condition.
+        windowed (bool, optional): Restrict the query to the check window. Default is True.
+
+    Returns:
+        str: The query.
+    """
+    if windowed and hasattr(connector, "select_sql"):
+        return connector.select_sql(table_name, columns, where)
+    select_list = ", ".join(quote_identifier(connector, col) for col in columns) if columns else "*"
+    sql = f"SELECT {select_list} FROM {quote_table(connector, table_name)}"
+    if where:
+        sql += f" WHERE {where}"
+    return sql
+
+
+def iter_chunks(source, columns=None, chunk_size: int = 100_000, windowed: bool = True):
+    """
+    Iterate over a data source in DataFrame chunks.
+
+    Args:
+        source: A pandas DataFrame, a `(connector, table_name)` pair or an iterable of DataFrames.
+        columns (list, optional): Columns to read. If None, all columns are read.
+        chunk_size (int, optional): Maximum rows per chunk for sources that can be split.
+        windowed (bool, optional): Read table sources within the connector's check window. Default is True.
+
+    Yields:
+        pd.DataFrame: Consecutive chunks of the source.
+    """
+    if isinstance(source, pd.DataFrame):
+        df = source[columns] if columns else source
+        for start in range(0, max(len(df), 1), chunk_size):
+            yield df.iloc[start:start + chunk_size]
+    elif is_table_source(source):
+        connector, table_name = source
+        sql = select_sql(connector, table_name, columns, windowed=windowed)
+        yield from connector.iter_data_sql(sql, chunk_size=chunk_size)
+    else:
+        for chunk in source:
+            yield chunk[columns] if columns else chunk
+
+
+def quote_literal(connector, value: str) -> str:
+    """Quote a string literal for the connector's SQL dialect."""
+    if getattr(connector, "dialect", "bigquery") == "bigquery":
+        return "'" + value.replace("\\", "\\\\").replace("'", "\\'") + "'"
+    return "'" + value.replace("'", "''") + "'"
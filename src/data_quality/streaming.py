@@ -0,0 +1,220 @@
+import numpy as np
+import pandas as pd
+
+from src.data_quality.key_hashing import HashKeySet, hash_keys
+
+SAMPLE_SIZE = 20
+
+
+def to_frame(chunk) -> pd.DataFrame:
+    """Convert a DataFrame chunk or a pyarrow RecordBatch/Table into a pandas DataFrame."""
+    if isinstance(chunk, pd.DataFrame):
+        return chunk
+    return chunk.to_pandas()
+
+
+class RowCountState:
+    """
+    Streaming row count. Fails when fewer than `min_rows` rows were read
+    or, if given, when the total differs from `expected_rows`.
+    """
+
+    def __init__(self, min_rows: int = None, expected_rows: int = None):
+        self.min_rows = min_rows
+        self.expected_rows = expected_rows
+        self.rows = 0
+
+    def update(self, chunk: pd.DataFrame):
+        self.rows += len(chunk)
+
+    def merge(self, other: "RowCountState"):
+        self.rows += other.rows
+
+    def violation(self, final: bool = False):
+        if self.expected_rows is not None and self.rows > self.expected_rows:
+            return f"Row count mismatch: more than {self.expected_rows} rows read ({self.rows})"
+        if not final:
+            return None
+        if self.expected_rows is not None and self.rows != self.expected_rows:
+            return f"Row count mismatch: {self.rows} != {self.expected_rows}"
+        if self.min_rows is not None and self.rows < self.min_rows:
+            return "DataFrame is empty" if self.min_rows == 1 else f"Expected at least {self.min_rows} rows, got {self.rows}"
+        return None
+
+
+class NotNullState:
+    """Streaming null counts for the given columns (all columns if None)."""
+
+    def __init__(self, column_names=None):
+        self.column_names = column_names
+        self.null_counts = {}
+
+    def update(self, chunk: pd.DataFrame):
+        columns = self.column_names or list(chunk.columns)
+        for col, count in chunk[columns].isna().sum().items():
+            self.null_counts[col] = self.null_counts.get(col, 0) + int(count)
+
+    def merge(self, other: "NotNullState"):
+        for col, count in other.null_counts.items():
+            self.null_counts[col] = self.null_counts.get(col, 0) + count
+
+    def violation(self, final: bool = False):
+        failing = {col: count for col, count in self.null_counts.items() if count}
+        if failing:
+            return f"Null values found in columns (null counts): {failing}"
+        return None
+
+
+class DuplicateState:
+    """
+    Streaming duplicate detection on hashed keys. Only 8 bytes per distinct key are kept,
+    plus a capped sample of duplicated keys for the report.
+
+    Args:
+        column_names (list, optional): Key columns. If None, full rows are compared.
+        check_each_column (bool, optional): If True, each column in `column_names` is checked on its own.
+    """
+
+    def __init__(self, column_names=None, check_each_column=False):
+        self.column_names = column_names
+        self.check_each_column = check_each_column
+        self.key_sets = {}
+        self.duplicate_rows = {}
+        self.samples = {}
+
+    def _key_groups(self, chunk):
+        if not self.column_names:
+            return [tuple(chunk.columns)]
+        if self.check_each_column:
+            return [(col,) for col in self.column_names]
+        return [tuple(self.column_names)]
+
+    def update(self, chunk: pd.DataFrame):
+        for key in self._key_groups(chunk):
+            key_set = self.key_sets.setdefault(key, HashKeySet())
+            hashes = hash_keys(chunk, list(key))
+            # Duplicates within the chunk: every occurrence after the first
+            _, first_index = np.unique(hashes, return_index=True)
+            repeated = np.ones(hashes.shape, dtype=bool)
+            repeated[first_index] = False
+            # Duplicates across chunks: keys already seen in earlier chunks
+            repeated |= key_set.contains(hashes)
+            key_set.add(hashes)
+            if repeated.any():
+                self._record(key, chunk.loc[repeated, list(key)])
+
+    def _record(self, key, rows: pd.DataFrame):
+        self.duplicate_rows[key] = self.duplicate_rows.get(key, 0) + len(rows)
+        sample = self.samples.get(key)
+        if sample is None or len(sample) < SAMPLE_SIZE:
+            sample = pd.concat([sample, rows]) if sample is not None else rows
+            self.samples[key] = sample.drop_duplicates().head(SAMPLE_SIZE)
+
+    def merge(self, other: "DuplicateState"):
+        for key, other_set in other.key_sets.items():
+            key_set = self.key_sets.setdefault(key, HashKeySet())
+            if other_set.runs:
+                # Keys seen on both sides: the first occurrence on the other side is a repeat too
+                other_keys = np.unique(np.concatenate(other_set.runs))
+                cross = int(key_set.contains(other_keys).sum())
+                if cross:
+                    self.duplicate_rows[key] = self.duplicate_rows.get(key, 0) + cross
+            key_set.merge(other_set)
+        for key, count in other.duplicate_rows.items():
+            self.duplicate_rows[key] = self.duplicate_rows.get(key, 0) + count
+        for key, rows in other.samples.items():
+            sample = self.samples.get(key)
+            self.samples[key] = rows if sample is None else pd.concat([sample, rows]).drop_duplicates().head(SAMPLE_SIZE)
+
+    def violation(self, final: bool = False):
+        messages = []
+        for key, count in self.duplicate_rows.items():
+            if count:
+                label = f"column '{key[0]}'" if len(key) == 1 else f"combination of columns {list(key)}"
+                message = f"Duplicate values found in {label}: {count} repeated rows."
+                if key in self.samples:
+                    message += f" Sample of duplicated keys:\n{self.samples[key].to_string(index=False)}"
+                messages.append(message)
+        return "\n".join(messages) or None
+
+
+class ColumnValidityState:
+    """
+    Streaming variant of `DataQualityLibrary.check_column_validity`: counts invalid values per column
+    and keeps a capped sample of invalid rows. Supports the same rule keys.
+    """
+
+    def __init__(self, column_rules: dict):
+        self.column_rules = column_rules
+        self.invalid_counts = {}
+        self.sample = None
+
+    def update(self, chunk: pd.DataFrame):
+        for column, rules in self.column_rules.items():
+            values = chunk[column]
+            invalid_mask = pd.Series(False, index=chunk.index)
+            if "min" in rules:
+                invalid_mask |= values < rules["min"]
+            if "max" in rules:
+                invalid_mask |= values > rules["max"]
+            if "allowed_values" in rules:
+                invalid_mask |= ~values.isin(rules["allowed_values"])
+            if "condition" in rules:
+                invalid_mask |= ~values.apply(rules["condition"])
+            count = int(invalid_mask.sum())
+            if count:
+                self.invalid_counts[column] = self.invalid_counts.get(column, 0) + count
+                self._record(chunk.loc[invalid_mask, [column]].assign(invalid_column=column))
+
+    def _record(self, rows: pd.DataFrame):
+        if self.sample is None or len(self.sample) < SAMPLE_SIZE:
+            self.sample = pd.concat([self.sample, rows]).head(SAMPLE_SIZE) if self.sample is not None else rows.head(SAMPLE_SIZE)
+
+    def merge(self, other: "ColumnValidityState"):
+        for column, count in other.invalid_counts.items():
+            self.invalid_counts[column] = self.invalid_counts.get(column, 0) + count
+        if other.sample is not None:
+            self._record(other.sample)
+
+    def violation(self, final: bool = False):
+        if self.invalid_counts:
+            return (
+                f"Invalid values found in the following columns:\n{self.sample}\n"
+                f"(Total {sum(self.invalid_counts.values())} invalid rows: {self.invalid_counts})"
+            )
+        return None
+
+
+def run_streaming_checks(chunks, checks: list, fail_fast: bool = False) -> list:
+    """
+    Feed every chunk of a stream to each check state, holding one chunk in memory at a time.
+
+    Args:
+        chunks: Iterable of pandas DataFrames or pyarrow RecordBatches/Tables.
+        checks (list): Check states (e.g. `NotNullState`, `DuplicateState`).
+        fail_fast (bool, optional): If True, stop reading at the first chunk that produces a violation.
+
+    Returns:
+        list: The check states, for inspection or merging with states from other streams.
+
+    Raises:
+        AssertionError: With the messages of all violated checks.
+    """
+    for batch_number, chunk in enumerate(chunks):
+        chunk = to_frame(chunk)
+        for check in checks:
+            check.update(chunk)
+        if fail_fast:
+            violations = [v for v in (check.violation() for check in checks) if v]
+            if violations:
+                close = getattr(chunks, "close", None)
+                if close:
+                    close()
+                raise AssertionError(
+                    f"Stopped at batch {batch_number}:\n" + "\n".join(violations)
+                )
+
+    violations = [v for v in (check.violation(final=True) for check in checks) if v]
+    if violations:
+        raise AssertionError("\n".join(violations))
+    return checks
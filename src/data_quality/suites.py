@@ -0,0 +1,491 @@
+import datetime
+
+import yaml
+
+from src.data_quality.data_quality_validation_library import DataQualityLibrary
+from src.data_quality.sources import quote_identifier, quote_literal, quote_table, table_expression, window_note
+from src.data_quality.violations import ViolationError
+
+# Ways of answering the checks of one table, cheapest first when nothing is known about the table
+METADATA = "metadata"  # table metadata only, no data scanned
+PUSHDOWN = "pushdown"  # one aggregate statement in the engine, only the counts are downloaded
+SAMPLE = "sample"  # a sample of the needed columns is loaded and checked in pandas
+FULL = "full"  # the needed columns are loaded in full and checked in pandas
+MODES = [METADATA, PUSHDOWN, SAMPLE, FULL]
+
+# Relative cost of downloading a byte compared to scanning it in the engine
+TRANSFER_WEIGHT = 1.0
+
+SAMPLE_SIZE = 20
+
+# Postgres SQLSTATEs of a missing or inaccessible table: undefined_table, insufficient_privilege
+_POSTGRES_MISSING_TABLE = {"42P01", "42501"}
+
+
+def load_suites(path: str) -> dict:
+    """Read the declarative check suites (suite name -> suite definition) from a YAML file."""
+    with open(path, encoding="utf-8") as f:
+        return yaml.safe_load(f) or {}
+
+
+class DeclaredCheck:
+    """One check of a suite, e.g. `{"check": "not_null", "columns": ["Code"]}`."""
+
+    # Check type -> modes it can be answered with
+    SUPPORTED_MODES = {
+        "table_exists": {METADATA, PUSHDOWN, SAMPLE, FULL},
+        "not_empty": {METADATA, PUSHDOWN, SAMPLE, FULL},
+        "schema": {METADATA},
+        "not_null": {PUSHDOWN, SAMPLE, FULL},
+        "duplicates": {PUSHDOWN, SAMPLE, FULL},
+        "column_validity": {PUSHDOWN, SAMPLE, FULL},
+    }
+
+    def __init__(self, group, index: int, spec: dict):
+        """
+        :param group: The `CheckGroup` (table) the check belongs to.
+        :param index: Position of the check in the suite.
+        :param spec: Check definition from the YAML file.
+        """
+        self.group = group
+        self.index = index
+        self.spec = spec
+        self.check = spec["check"]
+        if self.check not in self.SUPPORTED_MODES:
+            raise ValueError(
+                f"Unknown check '{self.check}' in suite '{group.suite}' "
+                f"(known: {', '.join(sorted(self.SUPPORTED_MODES))})"
+            )
+        self.tcid = spec.get("tcid")
+        self.name = spec.get("name") or f"{group.suite}-{index}-{self.check}"
+
+    @property
+    def columns(self) -> list:
+        """Columns the check reads; None means all columns."""
+        if self.check == "column_validity":
+            return list(self.spec["rules"])
+        if self.check in ("not_null", "duplicates"):
+            return self.spec.get("columns")
+        return []
+
+    @property
+    def modes(self) -> set:
+        """Modes the check can be answered with, given its parameters."""
+        modes = set(self.SUPPORTED_MODES[self.check])
+        if self.check == "duplicates" and not self.spec.get("columns"):
+            # Full-row duplicates need every column, which has no aggregate form
+            modes.discard(PUSHDOWN)
+        if self.check == "not_empty" and self.spec.get("min_rows", 1) > (self.group.sample_rows or 0):
+            modes.discard(SAMPLE)
+        if not self.group.sample_rows:
+            # Sampled verification is opt-in per suite
+            modes.discard(SAMPLE)
+        return modes
+
+    def __repr__(self):
+        return self.name
+
+
+class CheckGroup:
+    """All declared checks on one table. The planner serves each group with one data access."""
+
+    def __init__(self, suite: str, table_name: str, connector: str, sample_rows: int = None):
+        """
+        :param suite: Suite name.
+        :param table_name: Full table name.
+        :param connector: Name of the connector fixture that reads the table.
+        :param sample_rows: Rows the suite allows row-level checks to be verified on (None: no sampling).
+        """
+        self.suite = suite
+        self.table_name = table_name
+        self.connector = connector
+        self.sample_rows = sample_rows
+        self.checks = []
+
+    @property
+    def key(self) -> str:
+        return f"{self.connector}:{self.table_name}"
+
+
+def build_groups(suites: dict, tables: dict = None) -> list:
+    """
+    Turn suite definitions into check groups, one per table.
+
+    Args:
+        suites (dict): Suite name -> {"table", "connector", "sample_rows", "checks"}.
+        tables (dict, optional): Table aliases of the environment (`tables` in env_config.yaml);
+            a suite's `table` is looked up there first and used as given otherwise.
+
+    Returns:
+        list: `CheckGroup`s with their `DeclaredCheck`s.
+    """
+    tables = tables or {}
+    groups = {}
+    for suite, definition in suites.items():
+        table_name = tables.get(definition["table"], definition["table"])
+        connector = definition.get("connector", "bq_connector")
+        group = groups.get((connector, table_name))
+        if group is None:
+            group = groups[(connector, table_name)] = CheckGroup(
+                suite, table_name, connector, definition.get("sample_rows")
+            )
+        for spec in definition.get("checks", []):
+            group.checks.append(DeclaredCheck(group, len(group.checks), spec))
+    return list(groups.values())
+
+
+class GroupPlan:
+    """
+    Chosen access for a check group: metadata checks are answered from one metadata lookup,
+    all other checks from one data access in the cheapest mode they all support.
+    """
+
+    def __init__(self, group: CheckGroup, connector):
+        self.group = group
+        self.connector = connector
+        self.has_metadata = hasattr(connector, "client")
+        self.metadata = None
+        self.stats = self._stats()
+        self.metadata_checks = []
+        self.data_checks = []
+        self.unsupported = []
+        for check in group.checks:
+            if METADATA in check.modes and self._answers_from_metadata(check):
+                self.metadata_checks.append(check)
+            elif check.modes - {METADATA}:
+                self.data_checks.append(check)
+            else:
+                self.unsupported.append(check)
+
+        self.columns = self._columns()
+        self.costs = self._costs()
+        self.mode = min(self.costs, key=lambda mode: (self.costs[mode], MODES.index(mode))) \
+            if self.data_checks else METADATA
+
+    def _answers_from_metadata(self, check) -> bool:
+        """
+        True if table metadata answers the check. Row counts are only kept for tables: views,
+        external tables and snapshots report none, so `not_empty` on them reads the data.
+        """
+        if not self.has_metadata:
+            return False
+        if check.check == "not_empty" and not isinstance(self.metadata, Exception):
+            return self.metadata.table_type == "TABLE"
+        return True
+
+    def _columns(self):
+        columns = []
+        for check in self.data_checks:
+            if check.columns is None:
+                return None
+            columns += [col for col in check.columns if col not in columns]
+        return columns
+
+    def _stats(self):
+        """Row count, size in bytes and column count from table metadata, if the connector has it."""
+        if not self.has_metadata:
+            return None
+        try:
+            self.metadata = self.connector.client.get_table(self.group.table_name)
+        except Exception as e:
+            if not is_missing_table_error(e):
+                raise
+            # Reported by the checks of the group
+            self.metadata = e
+            return None
+        table = self.metadata
+        if table.table_type != "TABLE":
+            # No storage statistics: modes are ranked as for connectors without metadata
+            return None
+        return {"rows": table.num_rows or 0, "bytes": table.num_bytes or 0, "fields": len(table.schema) or 1}
+
+    def _costs(self) -> dict:
+        """Estimated cost (bytes, or ranks without statistics) of each mode all data checks support."""
+        if not self.data_checks:
+            return {}
+        candidates = set.intersection(*(check.modes for check in self.data_checks)) - {METADATA}
+        if not self.stats:
+            return {mode: MODES.index(mode) for mode in candidates}
+
+        column_share = 1.0 if self.columns is None else max(len(self.columns), 1) / self.stats["fields"]
+        scan = self.stats["bytes"] * column_share
+        fraction = min(1.0, (self.group.sample_rows or 0) / self.stats["rows"]) if self.stats["rows"] else 1.0
+        estimates = {
+            PUSHDOWN: scan,
+            SAMPLE: scan * fraction * (1 + TRANSFER_WEIGHT),
+            FULL: scan * (1 + TRANSFER_WEIGHT),
+        }
+        return {mode: estimates[mode] for mode in candidates}
+
+    def _partition_filter(self):
+        query_builder = getattr(self.connector, "query_builder", None)
+        return query_builder.partition_filter(self.group.table_name) if query_builder else None
+
+    def _window_rows(self) -> int:
+        """
+        Rows within the check window: the table's row count, or a COUNT(*) over the window's
+        partitions (reading at most the partitioning column) if a window filter applies.
+        """
+        if "window_rows" not in self.stats:
+            condition = self._partition_filter()
+            if condition is None:
+                self.stats["window_rows"] = self.stats["rows"]
+            else:
+                sql = f"SELECT COUNT(*) AS dq_rows FROM {quote_table(self.connector, self.group.table_name)} " \
+                      f"WHERE {condition}"
+                self.stats["window_rows"] = int(self.connector.get_data_sql(sql)["dq_rows"].iloc[0])
+        return self.stats["window_rows"]
+
+    def load_sql(self) -> str:
+        """Query loading the needed columns for SAMPLE/FULL mode."""
+        c = self.connector
+        table = self.group.table_name
+        select_list = "*" if not self.columns else ", ".join(quote_identifier(c, col) for col in self.columns)
+        rows = self._window_rows() if self.mode == SAMPLE and self.stats and c.dialect == "bigquery" else None
+        if rows:
+            # TABLESAMPLE only applies to a table, so the check window filter goes into WHERE
+            percent = min(100.0, 100.0 * self.group.sample_rows / rows)
+            sql = f"SELECT {select_list} FROM {quote_table(c, table)} TABLESAMPLE SYSTEM ({percent:.4f} PERCENT)"
+            condition = self._partition_filter()
+            if condition:
+                sql += f" WHERE {condition}"
+            return sql + f" LIMIT {self.group.sample_rows}"
+        sql = f"SELECT {select_list} FROM {table_expression(c, table)}"
+        return sql + f" LIMIT {self.group.sample_rows}" if self.mode == SAMPLE else sql
+
+    def pushdown_sql(self) -> str:
+        """One statement computing the counts of every data check in a single scan."""
+        c = self.connector
+        select_list = [quote_identifier(c, col) for col in self.columns or []]
+        aggregates = ["COUNT(*) AS dq_rows"]
+        for check in self.data_checks:
+            alias = f"dq_check_{check.index}"
+            if check.check == "not_null":
+                for i, col in enumerate(check.columns):
+                    aggregates.append(f"{_count_if(quote_identifier(c, col) + ' IS NULL')} AS {alias}_{i}")
+            elif check.check == "duplicates":
+                keys = [check.columns] if not check.spec.get("each_column") else [[col] for col in check.columns]
+                for i, key in enumerate(keys):
+                    partition = ", ".join(quote_identifier(c, col) for col in key)
+                    select_list.append(f"COUNT(*) OVER (PARTITION BY {partition}) AS {alias}_{i}")
+                    aggregates.append(f"{_count_if(f'{alias}_{i} > 1')} AS {alias}_{i}")
+            elif check.check == "column_validity":
+                for i, (col, rules) in enumerate(check.spec["rules"].items()):
+                    aggregates.append(f"{_count_if(_invalid_condition(c, col, rules))} AS {alias}_{i}")
+        source = f"SELECT {', '.join(select_list) or '1 AS dq_one'} FROM {table_expression(c, self.group.table_name)}"
+        return f"WITH src AS ({source}) SELECT {', '.join(aggregates)} FROM src"
+
+    def explain(self) -> str:
+        """Human-readable plan, shown by `--dq-explain`."""
+        table = self.group.table_name
+        lines = [f"{self.group.suite}: {table} via {self.group.connector}"]
+        if getattr(self.connector, "query_builder", None) and not isinstance(self.metadata, Exception):
+            lines.append(f"  layout: {self.connector.query_builder.layout(table).describe()}")
+        if self.metadata_checks:
+            lines.append(f"  metadata: {', '.join(check.name for check in self.metadata_checks)}")
+        if self.data_checks:
+            columns = "all columns" if self.columns is None else ", ".join(self.columns) or "no columns"
+            lines.append(f"  {self.mode}: {', '.join(check.name for check in self.data_checks)} ({columns})")
+            sql = self.pushdown_sql() if self.mode == PUSHDOWN else self.load_sql()
+            lines.append(f"    sql: {sql}")
+            if hasattr(self.connector, "dry_run"):
+                lines.append(f"    bytes processed (dry run): {self.connector.dry_run(sql):,}")
+            unit = " bytes" if self.stats else " (rank)"
+            lines.append("    estimated cost: " + ", ".join(
+                f"{mode}={cost:,.0f}{unit}" for mode, cost in sorted(self.costs.items(), key=lambda item: item[1])
+            ))
+        if self.unsupported:
+            lines.append(f"  unsupported by {self.group.connector}: "
+                         f"{', '.join(check.name for check in self.unsupported)}")
+        return "\n".join(lines)
+
+
+def is_missing_table_error(error: Exception) -> bool:
+    """
+    True if `error` (or an error it was raised from) says the table does not exist or may not be
+    read: BigQuery NotFound or Forbidden with reason `accessDenied`, Postgres undefined_table /
+    insufficient_privilege, or a DuckDB catalog error. Anything else is a real failure, including
+    BigQuery's other 403s (`rateLimitExceeded`, `quotaExceeded`), syntax errors and timeouts.
+    """
+    try:
+        from google.api_core import exceptions as api_exceptions
+    except ImportError:  # Optional: only needed to classify BigQuery errors
+        api_exceptions = None
+    seen = set()
+    while error is not None and id(error) not in seen:
+        seen.add(id(error))
+        if api_exceptions is not None and isinstance(error, api_exceptions.NotFound):
+            return True
+        if api_exceptions is not None and isinstance(error, api_exceptions.Forbidden) \
+                and _error_reasons(error) == {"accessDenied"}:
+            return True
+        if getattr(error, "pgcode", None) in _POSTGRES_MISSING_TABLE:
+            return True
+        if type(error).__name__ == "CatalogException":
+            return True
+        error = error.__cause__ or error.__context__
+    return False
+
+
+def _error_reasons(error: Exception) -> set:
+    return {err.get("reason") for err in getattr(error, "errors", None) or [] if isinstance(err, dict)}
+
+
+def _count_if(condition: str) -> str:
+    return f"SUM(CASE WHEN {condition} THEN 1 ELSE 0 END)"
+
+
+def _sql_value(connector, value) -> str:
+    """SQL literal for a rule value from YAML (number, string, date or timestamp)."""
+    if isinstance(value, datetime.datetime):
+        return f"TIMESTAMP {quote_literal(connector, value.isoformat(sep=' '))}"
+    if isinstance(value, datetime.date):
+        return f"DATE {quote_literal(connector, value.isoformat())}"
+    if isinstance(value, str):
+        return quote_literal(connector, value)
+    return repr(value)
+
+
+def _invalid_condition(connector, column: str, rules: dict) -> str:
+    """SQL condition true for rows violating `rules`, with the null semantics of `check_column_validity`."""
+    col = quote_identifier(connector, column)
+    conditions = []
+    if "min" in rules:
+        conditions.append(f"{col} < {_sql_value(connector, rules['min'])}")
+    if "max" in rules:
+        conditions.append(f"{col} > {_sql_value(connector, rules['max'])}")
+    if "allowed_values" in rules:
+        values = ", ".join(_sql_value(connector, value) for value in rules["allowed_values"])
+        conditions.append(f"{col} IS NULL OR {col} NOT IN ({values})")
+    return " OR ".join(f"({condition})" for condition in conditions) or "FALSE"
+
+
+class GroupRun:
+    """Runs the planned access of a group once and answers each of its checks from the result."""
+
+    def __init__(self, plan: GroupPlan):
+        self.plan = plan
+        self._result = None
+
+    def run(self, check: DeclaredCheck):
+        """
+        Evaluate one declared check.
+
+        Raises:
+            AssertionError: If the check fails (a `ViolationError` for row-level violations).
+        """
+        plan = self.plan
+        if check in plan.unsupported:
+            raise AssertionError(
+                f"Check '{check.check}' needs table metadata, which {plan.group.connector} does not provide"
+            )
+        if check in plan.metadata_checks:
+            return self._run_metadata(check)
+        try:
+            if plan.mode == PUSHDOWN:
+                return self._run_pushdown(check)
+            return self._run_loaded(check)
+        except AssertionError as e:
+            note = window_note((plan.connector, plan.group.table_name))
+            if note and e.args and not isinstance(self._result, Exception):
+                e.args = (f"{e.args[0]}\nOnly rows{note} were checked.",) + e.args[1:]
+            raise
+
+    def _table(self):
+        if isinstance(self.plan.metadata, Exception):
+            raise AssertionError(
+                f"Table {self.plan.group.table_name} does not exist or is not accessible. Error: {self.plan.metadata}"
+            )
+        return self.plan.metadata
+
+    def _run_metadata(self, check):
+        table = self._table()
+        if check.check == "not_empty":
+            rows = table.num_rows or 0
+            if table.streaming_buffer is not None:
+                rows += table.streaming_buffer.estimated_rows or 0
+            min_rows = check.spec.get("min_rows", 1)
+            assert rows >= min_rows, f"Table {table.full_table_id} has {rows} rows, expected at least {min_rows}"
+        elif check.check == "schema":
+            DataQualityLibrary.check_table_schema(self.plan.connector, self.plan.group.table_name, check.spec["expected"])
+
+    def _data(self):
+        """Result of the group's single data access (the counts row, or the loaded DataFrame)."""
+        if self._result is None:
+            plan = self.plan
+            try:
+                if plan.mode == PUSHDOWN:
+                    self._result = plan.connector.get_data_sql(plan.pushdown_sql()).iloc[0].to_dict()
+                else:
+                    self._result = plan.connector.get_data_sql(plan.load_sql(), compact=True)
+            except Exception as e:
+                if not is_missing_table_error(e):
+                    raise
+                self._result = e
+        if isinstance(self._result, Exception):
+            raise AssertionError(
+                f"Table {self.plan.group.table_name} does not exist or is not accessible. Error: {self._result}"
+            )
+        return self._result
+
+    def _run_pushdown(self, check):
+        counts = self._data()
+        c = self.plan.connector
+        table = table_expression(c, self.plan.group.table_name)
+        alias = f"dq_check_{check.index}"
+        if check.check == "not_empty":
+            min_rows = check.spec.get("min_rows", 1)
+            assert counts["dq_rows"] >= min_rows, \
+                f"Table {self.plan.group.table_name} has {counts['dq_rows']} rows, expected at least {min_rows}"
+        elif check.check == "not_null":
+            null_columns = [col for i, col in enumerate(check.columns) if counts[f"{alias}_{i}"]]
+            assert not null_columns, (
+                f"Null values found in column{'s' if len(null_columns) > 1 else ''}: {', '.join(null_columns)}"
+            )
+        elif check.check == "duplicates":
+            each_column = check.spec.get("each_column")
+            keys = [[col] for col in check.columns] if each_column else [check.columns]
+            for i, key in enumerate(keys):
+                if counts[f"{alias}_{i}"]:
+                    # Details only for the failing key: the sample and the number of duplicated values,
+                    # reported as DataQualityLibrary.check_duplicates does
+                    key_list = ", ".join(quote_identifier(c, col) for col in key)
+                    sample = c.get_data_sql(
+                        f"SELECT {key_list}, COUNT(*) AS count, COUNT(*) OVER () AS dq_values FROM {table} "
+                        f"GROUP BY {key_list} HAVING COUNT(*) > 1 ORDER BY count DESC LIMIT {SAMPLE_SIZE}"
+                    )
+                    count = int(sample.pop("dq_values").iloc[0])
+                    message = f"Duplicate values found in column '{key[0]}':" if each_column \
+                        else f"Duplicate rows found on combination of columns {key}:"
+                    raise ViolationError(message, count, sample)
+        elif check.check == "column_validity":
+            failing = [
+                (col, rules, int(counts[f"{alias}_{i}"] or 0))
+                for i, (col, rules) in enumerate(check.spec["rules"].items())
+                if counts[f"{alias}_{i}"]
+            ]
+            if failing:
+                samples = " UNION ALL ".join(
+                    f"(SELECT {quote_literal(c, col)} AS invalid_column, "
+                    f"CAST({quote_identifier(c, col)} AS {'STRING' if c.dialect == 'bigquery' else 'text'}) AS value "
+                    f"FROM {table} WHERE {_invalid_condition(c, col, rules)} LIMIT {SAMPLE_SIZE})"
+                    for col, rules, _ in failing
+                )
+                sample = c.get_data_sql(samples).head(SAMPLE_SIZE)
+                raise ViolationError(
+                    "Invalid values found in the following columns:", sum(n for _, _, n in failing), sample
+                )
+
+    def _run_loaded(self, check):
+        df = self._data()
+        spec = check.spec
+        if check.check == "not_empty":
+            min_rows = spec.get("min_rows", 1)
+            assert len(df) >= min_rows, \
+                f"Table {self.plan.group.table_name} has {len(df)} rows, expected at least {min_rows}"
+        elif check.check == "not_null":
+            DataQualityLibrary.check_not_null_values(df, spec.get("columns"))
+        elif check.check == "duplicates":
+            DataQualityLibrary.check_duplicates(df, spec.get("columns"), spec.get("each_column", False))
+        elif check.check == "column_validity":
+            DataQualityLibrary.check_column_validity(df, spec["rules"])
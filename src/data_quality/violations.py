@@ -0,0 +1,128 @@
+import os
+import re
+import uuid
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+
+class ViolationError(AssertionError):
+    """
+    Check failure whose full list of violations is kept out of the message.
+
+    The message holds the violation count and a small sample; when a `ViolationSink` is
+    configured, all violations are in the Parquet file at `artifact_path`.
+    """
+
+    def __init__(self, message: str, count: int, sample: pd.DataFrame, artifact_path: str = None):
+        self.count = count
+        self.sample = sample
+        self.artifact_path = artifact_path
+        details = f"(Total {count} rows, all in {artifact_path})" if artifact_path else f"(Total {count} rows)"
+        super().__init__(f"{message}\n{sample.to_string(index=False)}\n{details}")
+
+
+def _tables(parts):
+    """Non-empty parts as pyarrow Tables."""
+    for part in parts:
+        table = part if isinstance(part, pa.Table) else pa.Table.from_pandas(part, preserve_index=False)
+        if table.num_rows:
+            yield table
+
+
+def _sample_frame(samples: list) -> pd.DataFrame:
+    if not samples:
+        return pd.DataFrame()
+    return pa.concat_tables(samples, promote_options="permissive").to_pandas()
+
+
+class ViolationSink:
+    """
+    Writes the full violation output of failing checks to compressed Parquet files, part by
+    part as the check produces it, so neither memory use nor the size of the failure message
+    and of the HTML report grows with the number of violations.
+    """
+
+    def __init__(self, directory: str = "reports/violations", sample_size: int = 20, compression: str = "zstd"):
+        """
+        :param directory: Directory for the Parquet artifacts.
+        :param sample_size: Rows of each failure shown in the assertion message.
+        :param compression: Parquet compression codec.
+        """
+        self.directory = directory
+        self.sample_size = sample_size
+        self.compression = compression
+        # Name of the running test, set by the pytest fixture; prefixes the artifact names
+        self.context = None
+
+    def _artifact_path(self, check_name: str) -> str:
+        name = f"{self.context}__{check_name}" if self.context else check_name
+        name = re.sub(r"[^A-Za-z0-9_.-]", "_", name)
+        return os.path.join(self.directory, f"{name}_{uuid.uuid4().hex[:8]}.parquet")
+
+    def write(self, check_name: str, parts) -> tuple:
+        """
+        Stream violation parts into one Parquet file.
+
+        Args:
+            check_name (str): Name of the check, used in the file name.
+            parts: Iterable of pandas DataFrames or pyarrow Tables with the same columns.
+
+        Returns:
+            tuple: Row count, sample DataFrame of up to `sample_size` rows and
+                artifact path (None if there were no rows).
+        """
+        os.makedirs(self.directory, exist_ok=True)
+        path = self._artifact_path(check_name)
+        tmp_path = f"{path}.tmp"
+        writer = None
+        count = 0
+        samples = []
+        try:
+            for table in _tables(parts):
+                if writer is None:
+                    writer = pq.ParquetWriter(tmp_path, table.schema, compression=self.compression)
+                elif table.schema != writer.schema:
+                    table = table.cast(writer.schema)
+                writer.write_table(table)
+                if count < self.sample_size:
+                    samples.append(table.slice(0, self.sample_size - count))
+                count += table.num_rows
+        finally:
+            if writer is not None:
+                writer.close()
+        if writer is None:
+            return 0, _sample_frame(samples), None
+        os.replace(tmp_path, path)
+        return count, _sample_frame(samples), path
+
+
+def raise_violations(message: str, parts, check_name: str, sink: ViolationSink = None, sample_size: int = 20):
+    """
+    Raise a `ViolationError` if `parts` contain any rows.
+
+    With a sink, all rows are written to a Parquet artifact; without one only the count and the
+    first `sample_size` rows are kept. Either way the message size does not depend on the row count.
+
+    Args:
+        message (str): First line of the failure message.
+        parts: Iterable of pandas DataFrames or pyarrow Tables with the violating rows.
+        check_name (str): Name of the check, used in the artifact name.
+        sink (ViolationSink, optional): Where to write the full output.
+        sample_size (int, optional): Rows shown in the message when there is no sink. Default is 20.
+
+    Raises:
+        ViolationError: If there is at least one violating row.
+    """
+    if sink is not None:
+        count, sample, path = sink.write(check_name, parts)
+    else:
+        count, samples, path = 0, [], None
+        for table in _tables(parts):
+            if count < sample_size:
+                samples.append(table.slice(0, sample_size - count))
+            count += table.num_rows
+        sample = _sample_frame(samples)
+    if count:
+        raise ViolationError(message, count, sample, path)
@@ -0,0 +1,9 @@
+"""
+Description: Data Quality checks declared in config/dq_suites.yaml
+Requirement(s): TICKET-1234
+Author(s): Name Surname
+"""
+
+
+def test_declared_check(declared_check, declared_suites, request):
+    declared_suites.run(declared_check, request)
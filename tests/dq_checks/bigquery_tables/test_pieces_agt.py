@@ -7,6 +7,9 @@ Author(s): Name Surname
 import pytest
 import pandas as pd
 
+from src.data_quality.sources import select_sql
+from src.data_quality.streaming import DuplicateState, NotNullState, RowCountState
+
 
 # -------------------- Table fixtures --------------------
 @pytest.fixture(scope="module")
@@ -21,20 +24,17 @@ def table_AGT_381(environment):
 
 # -------------------- Data fixtures --------------------
 @pytest.fixture(scope='module')
-def source_data(bq_connector, table_AGT):
-    """Load full data from AGT table."""
-    target_query = f"SELECT * FROM `{table_AGT}`"
-    df = bq_connector.get_data_sql(target_query)
+def source_data(bq_connector, table_AGT, shared_datasets):
+    """Load full data from AGT table (compact dtypes, the table is wide and STRING-heavy)."""
+    target_query = select_sql(bq_connector, table_AGT)
+    df = shared_datasets.get_or_load(target_query, lambda: bq_connector.get_data_sql(target_query, compact=True))
     return df
 
 
 @pytest.fixture(scope='module')
 def expected(bq_connector, table_AGT):
-    """Load filtered data from AGT table for comparison."""
-    target_query = f"""
-    SELECT * FROM `{table_AGT}`
-    WHERE Code LIKE '%732%'
-    """
+    """Load filtered data from AGT table for comparison (whole table: AGT_381 is compared in full)."""
+    target_query = select_sql(bq_connector, table_AGT, where="Code LIKE '%732%'", windowed=False)
     df = bq_connector.get_data_sql(target_query)
     return df
 
@@ -42,7 +42,7 @@ def expected(bq_connector, table_AGT):
 @pytest.fixture(scope='module')
 def actual(bq_connector, table_AGT_381):
     """Load full data from AGT_381 table for comparison."""
-    target_query = f"SELECT * FROM `{table_AGT_381}`"
+    target_query = select_sql(bq_connector, table_AGT_381, windowed=False)
     df = bq_connector.get_data_sql(target_query)
     return df
 
@@ -131,3 +131,27 @@ def test_counts(expected, actual, data_quality_library):
 @pytest.mark.tcid("TC-132")
 def test_datasets(expected, actual, data_quality_library):
     data_quality_library.check_data_full_data_set(expected, actual)
+
+
+@pytest.mark.tcid("TC-133")
+def test_thickness_distribution_drift(data_quality_library, bq_connector, table_AGT, baseline_store, pytestconfig):
+    data_quality_library.check_distribution_drift(
+        (bq_connector, table_AGT),
+        "Thickness",
+        baseline_store,
+        update_baseline=pytestconfig.getoption("dq_update_baselines")
+    )
+
+
+@pytest.mark.tcid("TC-134")
+def test_streaming_checks(data_quality_library, bq_connector, table_AGT):
+    """Same checks as TC-125/TC-126, read batch by batch instead of one full DataFrame."""
+    data_quality_library.check_stream(
+        bq_connector.iter_data_sql(select_sql(bq_connector, table_AGT, ["Code", "Kromka", "Thickness"])),
+        [
+            RowCountState(min_rows=1),
+            NotNullState(["Kromka", "Thickness"]),
+            DuplicateState(["Code"]),
+        ],
+        fail_fast=True
+    )
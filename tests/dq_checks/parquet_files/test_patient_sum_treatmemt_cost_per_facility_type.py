@@ -70,4 +70,33 @@ def test_check_column_validity(source_data, data_quality_library):
         column_rules={
             "sum_treatment_cost": {"min": 0},  # must be >= 0
         }
-    )
\ No newline at end of file
+    )
+
+@pytest.mark.validity
+def test_check_sum_treatment_cost_drift(source_data, data_quality_library, baseline_store, pytestconfig):
+    data_quality_library.check_distribution_drift(
+        source_data,
+        "sum_treatment_cost",
+        baseline_store,
+        baseline_name="patient_sum_treatment_cost_per_facility_type.sum_treatment_cost",
+        update_baseline=pytestconfig.getoption("dq_update_baselines")
+    )
+
+
+@pytest.mark.referential_integrity
+def test_check_visits_reference_facilities(db_connection, data_quality_library):
+    data_quality_library.check_referential_integrity(
+        child=(db_connection, "visits"),
+        child_cols=["facility_id"],
+        parent=(db_connection, "facilities"),
+        parent_cols=["id"]
+    )
+
+@pytest.mark.referential_integrity
+def test_check_visits_reference_patients(db_connection, data_quality_library):
+    data_quality_library.check_referential_integrity(
+        child=(db_connection, "visits"),
+        child_cols=["patient_id"],
+        parent=(db_connection, "patients"),
+        parent_cols=["id"]
+    )
@@ -1,4 +1,4 @@
-from src.connectors.bigquery.bigquery_connector import BigQueryConnectorContextManager
+from src.connectors.registry import get_connector_class
 import pytest
 import os
 
@@ -7,17 +7,42 @@ import os
 
 
 @pytest.fixture(scope="session")
-def bq_connector(environment):
+def bq_connector(environment, pytestconfig):
     """
     Pytest fixture that provides a BigQueryConnectorContextManager instance.
     Scope 'session' so it's created once per test session.
+
+    For an environment with `connector: local` an offline LocalConnectorContextManager over
+    `data_dir` is provided instead. With `--dq_record` the live connector is wrapped so every
+    query result is recorded to `recordings_dir` for later offline runs.
     """
+    data_dir = environment.get("data_dir", "local_data")
+    recordings_dir = environment.get("recordings_dir", os.path.join(data_dir, "recordings"))
+    if environment.get("connector") == "local":
+        with get_connector_class("local")(data_dir=data_dir, recordings_dir=recordings_dir) as connector:
+            yield connector
+        return
+
     os.environ["GOOGLE_APPLICATION_CREDENTIALS"] = environment["credentials"]
     project_id = environment["project"]
     credentials_path = environment["credentials"]
 
-    with BigQueryConnectorContextManager(
+    with get_connector_class("bigquery")(
             project_id=project_id,
-            credentials_path=credentials_path
+            credentials_path=credentials_path,
+            max_concurrent_jobs=environment.get("max_concurrent_jobs", 20),
+            batch_priority=pytestconfig.getoption("bq_batch_priority"),
+            temp_dataset=environment.get("temp_dataset"),
+            check_window=environment.get("check_window"),
+            require_pruning=environment.get("require_pruning", False),
+            max_scan_bytes=environment.get("max_scan_bytes")
     ) as connector:
-        yield connector
+        if pytestconfig.getoption("dq_record"):
+            with get_connector_class("local")(
+                    data_dir=data_dir,
+                    recordings_dir=recordings_dir,
+                    record_from=connector
+            ) as recorder:
+                yield recorder
+        else:
+            yield connector
@@ -1,8 +1,63 @@
-from src.data_quality.data_quality_validation_library import DataQualityLibrary
 import pytest
+import os
+
+
+def column_workers(config) -> int:
+    """
+    Threads for per-column checks from the `dq_column_workers` ini option (a number or "auto").
+    "auto" shares the CPUs between the pytest-xdist workers of the run.
+    """
+    workers = config.getini("dq_column_workers").strip()
+    if workers == "auto":
+        return max(1, (os.cpu_count() or 1) // int(os.environ.get("PYTEST_XDIST_WORKER_COUNT", 1)))
+    return int(workers or 1)
 
 
 @pytest.fixture(scope='session')
-def data_quality_library():
+def column_executor(pytestconfig):
+    """Thread pool the data quality library evaluates independent columns on (None for serial runs)."""
+    workers = column_workers(pytestconfig)
+    if workers < 2:
+        yield None
+        return
+    from src.data_quality.column_executor import ColumnExecutor
+
+    with ColumnExecutor(workers) as executor:
+        yield executor
+
+
+@pytest.fixture(scope='session')
+def data_quality_library(violation_sink, column_executor):
+    from src.data_quality.data_quality_validation_library import DataQualityLibrary
+
+    DataQualityLibrary.violation_sink = violation_sink
+    DataQualityLibrary.column_executor = column_executor
     dql = DataQualityLibrary()
     yield dql
+    DataQualityLibrary.violation_sink = None
+    DataQualityLibrary.column_executor = None
+
+
+@pytest.fixture(scope='session')
+def baseline_store(environment):
+    """
+    Distribution baselines for drift checks, stored per environment as JSON files in
+    `baselines_dir` (default "baselines"); create or refresh them with --dq_update_baselines.
+    """
+    from src.data_quality.distribution_drift import BaselineStore
+
+    store = BaselineStore(environment.get("baselines_dir", "baselines"))
+    yield store
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+    """Report a drift check without a baseline as skipped: there is nothing to compare with yet."""
+    try:
+        return (yield)
+    except AssertionError as e:
+        from src.data_quality.distribution_drift import MissingBaselineError
+
+        if isinstance(e, MissingBaselineError):
+            pytest.skip(str(e))
+        raise
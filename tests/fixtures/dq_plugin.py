@@ -0,0 +1,82 @@
+"""
+pytest plugin of the data quality suite: command-line options, the environment configuration
+and the fixture modules below. Connectors, pandas and the Google SDK are imported only when
+a fixture that needs them is set up, so collection and small marker-filtered runs start fast.
+"""
+from functools import lru_cache
+import pytest
+
+pytest_plugins = [
+    "tests.fixtures.bigquery_fixtures",
+    "tests.fixtures.postgress_fixtures",
+    "tests.fixtures.parquet_fixtures",
+    "tests.fixtures.data_quality_fixtures",
+    "tests.fixtures.parallel_fixtures",
+    "tests.fixtures.violation_fixtures",
+    "tests.fixtures.suite_fixtures",
+]
+
+ENV_CONFIG_PATH = "config/env_config.yaml"
+
+
+@lru_cache(maxsize=None)
+def load_env_config(path: str = ENV_CONFIG_PATH) -> dict:
+    """Parse the environment configuration once per process."""
+    import yaml
+
+    with open(path) as f:
+        return yaml.safe_load(f)
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--env",
+        action="store",
+        default="npd5",
+        help="Environment to run tests against (prd, ppd, npd1, npd2, ...)"
+    )
+    parser.addoption(
+        "--bq_batch_priority",
+        action="store_true",
+        default=False,
+        help="Run BigQuery queries with BATCH priority (for non-urgent runs)"
+    )
+    parser.addoption(
+        "--dq_record",
+        action="store_true",
+        default=False,
+        help="Record query results of the live run for offline runs with the 'local' environment"
+    )
+    parser.addoption(
+        "--dq_update_baselines",
+        action="store_true",
+        default=False,
+        help="Create missing distribution baselines and replace existing ones with the current data"
+    )
+    parser.addini(
+        "dq_workers",
+        default="",
+        help="pytest-xdist worker count (number or 'auto') used when -n is not given"
+    )
+    parser.addini(
+        "dq_column_workers",
+        default="1",
+        help="Threads evaluating the columns of per-column checks (number or 'auto')"
+    )
+
+
+@pytest.fixture(scope="session")
+def environment(pytestconfig):
+    env_name = pytestconfig.getoption("env")
+    config = load_env_config()
+
+    if env_name not in config:
+        raise ValueError(f"Unknown environment: {env_name}")
+
+    return config[env_name]
+
+
+def pytest_itemcollected(item):
+    tcid = item.get_closest_marker("tcid")
+    if tcid:
+        item._nodeid = f"{item.nodeid} [{tcid.args[0]}]"
@@ -0,0 +1,141 @@
+import pytest
+import uuid
+
+# Fixtures that open a data source; fixtures depending on them (directly or not) load datasets
+CONNECTOR_FIXTURES = {"bq_connector", "db_connection", "parquet_reader"}
+
+
+def configure_workers(config):
+    """
+    Enable pytest-xdist with the worker count from the `dq_workers` ini option
+    (a number or "auto"), unless `-n` was given on the command line or xdist is not installed.
+    Tests are distributed with `--dist loadgroup`, so the dataset groups below stay on one worker.
+    """
+    if hasattr(config, "workerinput"):
+        # Workers re-parse the original command line, so the distribution mode chosen here
+        # reaches them through `workerinput` (see `configure_node`)
+        if config.workerinput.get("dq_dist") == "loadgroup":
+            config.option.loadgroup = True
+        return
+    if not config.pluginmanager.hasplugin("xdist"):
+        return
+    if config.option.testrunuid is None:
+        # Known up front so the controller can clean up the shared datasets of its workers
+        config.option.testrunuid = uuid.uuid4().hex
+    if config.option.numprocesses is not None or config.getoption("collectonly") or config.getoption("usepdb"):
+        return
+
+    workers = config.getini("dq_workers").strip()
+    if not workers:
+        return
+    if workers in ("auto", "logical"):
+        config.option.numprocesses = workers
+        workers = config.hook.pytest_xdist_auto_num_workers(config=config)
+    workers = int(workers)
+    if workers < 2:
+        return
+
+    config.option.numprocesses = workers
+    config.option.tx = ["popen"] * workers
+    if config.option.dist == "no":
+        config.option.dist = "loadgroup"
+
+
+def configure_node(node):
+    """Pass the controller's distribution mode on to a starting worker."""
+    node.workerinput["dq_dist"] = node.config.option.dist
+
+
+def _loads_dataset(name, name2fixturedefs, seen=None):
+    """True if the fixture `name` depends, directly or transitively, on a connector fixture."""
+    seen = seen if seen is not None else set()
+    if name in seen or name not in name2fixturedefs:
+        return False
+    seen.add(name)
+    fixturedef = name2fixturedefs[name][-1]
+    return any(
+        arg in CONNECTOR_FIXTURES or _loads_dataset(arg, name2fixturedefs, seen)
+        for arg in fixturedef.argnames
+    )
+
+
+def assign_dataset_groups(items):
+    """
+    Put all tests that share a module- or session-scoped dataset fixture into one `xdist_group`,
+    so with `--dist loadgroup` every dataset is loaded by exactly one worker. Tests that load
+    no dataset are left ungrouped and balanced freely.
+    """
+    parent = {}
+
+    def find(key):
+        while parent.setdefault(key, key) != key:
+            parent[key] = parent[parent[key]]
+            key = parent[key]
+        return key
+
+    item_datasets = []
+    for item in items:
+        fixtureinfo = getattr(item, "_fixtureinfo", None)
+        datasets = []
+        if fixtureinfo is not None:
+            name2fixturedefs = fixtureinfo.name2fixturedefs
+            for name in fixtureinfo.names_closure:
+                if name in CONNECTOR_FIXTURES or name not in name2fixturedefs:
+                    continue
+                fixturedef = name2fixturedefs[name][-1]
+                if fixturedef.scope in ("module", "package", "session") \
+                        and _loads_dataset(name, name2fixturedefs):
+                    datasets.append(f"{fixturedef.baseid}::{name}")
+        for dataset in datasets[1:]:
+            parent[find(dataset)] = find(datasets[0])
+        item_datasets.append((item, datasets))
+
+    for item, datasets in item_datasets:
+        if datasets and not item.get_closest_marker("xdist_group"):
+            item.add_marker(pytest.mark.xdist_group(find(datasets[0])))
+
+
+def cleanup_shared_datasets(config):
+    """Remove the shared datasets of a distributed run (called on the controller)."""
+    if not hasattr(config, "workerinput") and getattr(config.option, "testrunuid", None):
+        from src.connectors.shared_dataset_cache import SharedDatasetCache
+
+        SharedDatasetCache(config.option.testrunuid).cleanup()
+
+
+def pytest_configure(config):
+    configure_workers(config)
+
+
+@pytest.hookimpl(optionalhook=True)
+def pytest_configure_node(node):
+    configure_node(node)
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    # Before xdist turns the groups into node id suffixes
+    if config.pluginmanager.hasplugin("xdist"):
+        assign_dataset_groups(items)
+
+
+def pytest_sessionfinish(session):
+    cleanup_shared_datasets(session.config)
+
+
+@pytest.fixture(scope="session")
+def shared_datasets(request):
+    """
+    Cross-worker dataset cache. Under pytest-xdist all workers share one cache per run, so
+    a dataset needed by several workers is queried once and memory-mapped by the others.
+    Without workers the datasets are loaded directly, bypassing the cache.
+    """
+    from src.connectors.shared_dataset_cache import LocalDatasetCache, SharedDatasetCache
+
+    workerinput = getattr(request.config, "workerinput", None)
+    run_id = workerinput.get("testrunuid") if workerinput else None
+    if run_id is None:
+        yield LocalDatasetCache()
+        return
+    # Removed by the controller at the end of the run (see `cleanup_shared_datasets`)
+    yield SharedDatasetCache(run_id)
@@ -1,8 +1,8 @@
-from src.connectors.file_system.parquet_reader import ParquetReader
+from src.connectors.registry import get_connector_class
 import pytest
 
 
 @pytest.fixture(scope='session')
 def parquet_reader():
-    reader = ParquetReader()
+    reader = get_connector_class("parquet")()
     yield reader
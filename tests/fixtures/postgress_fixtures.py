@@ -1,5 +1,6 @@
-from src.connectors.postgres.postgres_connector import PostgresConnectorContextManager
+from src.connectors.registry import get_connector_class
 import pytest
+import os
 
 
 def pytest_addoption(parser):
@@ -10,9 +11,10 @@ def pytest_addoption(parser):
     parser.addoption("--db_password", action="store", help="Database password")
 
 
-def pytest_configure(config):
+def validate_db_options(config):
     """
     Validates that all required command-line options are provided.
+    Called when a test needs the database, so runs without Postgres checks do not need them.
     """
     required_options = ["--db_user", "--db_password"]
     for option in required_options:
@@ -21,7 +23,24 @@ def pytest_configure(config):
 
 
 @pytest.fixture(scope='session')
-def db_connection(request):
+def db_connection(request, environment):
+    """
+    Postgres connector for the session. For an environment with `connector: local` an offline
+    LocalConnectorContextManager (Postgres dialect) over `data_dir` is provided instead, and with
+    `--dq_record` the live connection is wrapped so every query result is recorded.
+    """
+    data_dir = environment.get("data_dir", "local_data")
+    recordings_dir = environment.get("recordings_dir", os.path.join(data_dir, "recordings"))
+    if environment.get("connector") == "local":
+        with get_connector_class("local")(
+                data_dir=data_dir,
+                recordings_dir=recordings_dir,
+                dialect="postgres"
+        ) as connector:
+            yield connector
+        return
+
+    validate_db_options(request.config)
     db_host = request.config.getoption("--db_host")
     db_port = int(request.config.getoption("--db_port"))
     db_name = request.config.getoption("--db_name")
@@ -29,13 +48,21 @@ def db_connection(request):
     db_password = request.config.getoption("--db_password")
 
     try:
-        with PostgresConnectorContextManager(
+        with get_connector_class("postgres")(
                 db_host=db_host,
                 db_name=db_name,
                 db_user=db_user,
                 db_password=db_password,
                 db_port=db_port
         ) as db_connector:
-            yield db_connector
+            if request.config.getoption("dq_record"):
+                with get_connector_class("local")(
+                        data_dir=data_dir,
+                        recordings_dir=recordings_dir,
+                        record_from=db_connector
+                ) as recorder:
+                    yield recorder
+            else:
+                yield db_connector
     except Exception as e:
         pytest.fail(f"Failed to initialize PostgresConnectorContextManager: {e}")
@@ -0,0 +1,103 @@
+import os
+import pytest
+
+from tests.fixtures.dq_plugin import load_env_config
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--dq-explain",
+        action="store_true",
+        default=False,
+        help="Show the access plan of the declared check suites instead of running their checks"
+    )
+    parser.addini(
+        "dq_suites",
+        default="",
+        help="YAML file with the declarative check suites (none are run unless set, "
+             "e.g. -o dq_suites=config/dq_suites.yaml)"
+    )
+
+
+def _suites_path(config):
+    """The configured suites file, or None if no suites are configured."""
+    path = config.getini("dq_suites")
+    return path if path and os.path.exists(path) else None
+
+
+def pytest_generate_tests(metafunc):
+    """Turn every check of the declared suites into one test item."""
+    if "declared_check" not in metafunc.fixturenames:
+        return
+    config = metafunc.config
+    path = _suites_path(config)
+    if path is None:
+        # Deselected in pytest_collection_modifyitems
+        return
+    from src.data_quality.suites import build_groups, load_suites
+
+    suites = load_suites(path)
+    environment = load_env_config().get(config.getoption("env")) or {}
+
+    params = []
+    for group in build_groups(suites, environment.get("tables")):
+        for check in group.checks:
+            marks = [pytest.mark.tcid(check.tcid)] if check.tcid else []
+            if config.pluginmanager.hasplugin("xdist"):
+                # One worker per table, so the group's data is accessed once
+                marks.append(pytest.mark.xdist_group(group.key))
+            params.append(pytest.param(check, id=check.name, marks=marks))
+    metafunc.parametrize("declared_check", params)
+
+
+def pytest_collection_modifyitems(config, items):
+    """Without configured suites, leave out the declared-check test instead of reporting a skip."""
+    if _suites_path(config) is not None:
+        return
+    deselected = [item for item in items if "declared_check" in getattr(item, "fixturenames", ())]
+    if deselected:
+        items[:] = [item for item in items if item not in deselected]
+        config.hook.pytest_deselected(items=deselected)
+
+
+class DeclaredSuites:
+    """Plans each check group on first use and answers all its checks from that one run."""
+
+    def __init__(self, explain: bool):
+        self.explain = explain
+        self.runs = {}
+
+    def run(self, check, request):
+        from src.data_quality.suites import GroupPlan, GroupRun
+
+        group_run = self.runs.get(check.group.key)
+        if group_run is None:
+            connector = request.getfixturevalue(check.group.connector)
+            group_run = self.runs[check.group.key] = GroupRun(GroupPlan(check.group, connector))
+            if self.explain:
+                request.node.user_properties.append(("dq_plan", group_run.plan.explain()))
+        if self.explain:
+            pytest.skip("--dq-explain: plan only")
+        group_run.run(check)
+
+
+@pytest.fixture(scope="session")
+def declared_suites(pytestconfig):
+    yield DeclaredSuites(pytestconfig.getoption("dq_explain"))
+
+
+def pytest_terminal_summary(terminalreporter, config):
+    if not config.getoption("dq_explain"):
+        return
+    plans = [
+        value
+        for reports in terminalreporter.stats.values()
+        for report in reports
+        if getattr(report, "when", None) == "call"
+        for name, value in report.user_properties
+        if name == "dq_plan"
+    ]
+    if plans:
+        terminalreporter.section("data quality plan")
+        for plan in plans:
+            terminalreporter.write_line(plan)
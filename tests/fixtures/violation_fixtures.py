@@ -0,0 +1,48 @@
+import os
+import pytest
+
+
+def _report_dir(config) -> str:
+    """Directory of the pytest-html report, `reports` if no report is written."""
+    html_path = getattr(config.option, "htmlpath", None)
+    return os.path.dirname(os.path.abspath(html_path)) if html_path else os.path.abspath("reports")
+
+
+@pytest.fixture(scope="session")
+def violation_sink(pytestconfig):
+    """Parquet sink for the full output of failing checks, next to the HTML report."""
+    from src.data_quality.violations import ViolationSink
+
+    sink = ViolationSink(os.path.join(_report_dir(pytestconfig), "violations"))
+    yield sink
+
+
+@pytest.fixture(autouse=True)
+def violation_context(request):
+    """Name the violation artifacts of a test after the test."""
+    if "data_quality_library" not in request.fixturenames:
+        yield
+        return
+    sink = request.getfixturevalue("violation_sink")
+    sink.context = request.node.name
+    yield
+    sink.context = None
+
+
+@pytest.hookimpl(hookwrapper=True)
+def pytest_runtest_makereport(item, call):
+    """Link the violation artifact of a failed check in the HTML report and in the JUnit XML."""
+    outcome = yield
+    report = outcome.get_result()
+    artifact_path = getattr(call.excinfo.value, "artifact_path", None) if call.excinfo else None
+    if not artifact_path:
+        return
+
+    # Written to the JUnit XML with the teardown report
+    item.user_properties.append(("violation_artifact", artifact_path))
+    try:
+        import pytest_html
+    except ImportError:
+        return
+    link = os.path.relpath(artifact_path, _report_dir(item.config)).replace(os.sep, "/")
+    report.extras = getattr(report, "extras", []) + [pytest_html.extras.url(link, name="Violations (Parquet)")]
@@ -0,0 +1,70 @@
+"""
+Description: Unit tests for per-column evaluation on a thread pool (src/data_quality/column_executor.py)
+"""
+
+import time
+from concurrent.futures import Executor, Future
+
+import pytest
+
+from src.data_quality.column_executor import ColumnExecutor, map_columns
+
+
+class InlineExecutor(Executor):
+    """Executor without a worker count attribute that runs tasks when they are submitted."""
+
+    def __init__(self):
+        self.submitted = []
+
+    def submit(self, fn, *args):
+        self.submitted.append(args[0])
+        future = Future()
+        future.set_result(fn(*args))
+        return future
+
+
+def test_results_are_in_column_order():
+    with ColumnExecutor(4) as executor:
+        def slow_first(col):
+            time.sleep(0.02 if col == 0 else 0)
+            return col * 2
+
+        assert list(map_columns(slow_first, list(range(20)), executor)) == [col * 2 for col in range(20)]
+
+
+def test_window_defaults_to_the_worker_count():
+    executor = InlineExecutor()
+    executor.workers = 3
+
+    results = map_columns(lambda col: col, list(range(10)), executor)
+    assert next(results) == 0
+    # Three columns submitted up front, the next one once the first result was taken
+    assert executor.submitted == [0, 1, 2, 3]
+    assert list(results) == list(range(1, 10))
+
+
+def test_window_without_worker_count_and_early_stop():
+    executor = InlineExecutor()
+
+    results = map_columns(lambda col: col, list(range(10)), executor, window=2)
+    assert next(results) == 0
+    assert executor.submitted == [0, 1, 2]
+    results.close()
+    assert executor.submitted == [0, 1, 2]
+
+
+def test_column_error_is_raised_in_order():
+    def column(col):
+        if col == 3:
+            raise ValueError("bad column")
+        return col
+
+    with ColumnExecutor(2) as executor:
+        results = map_columns(column, list(range(6)), executor)
+        assert [next(results) for _ in range(3)] == [0, 1, 2]
+        with pytest.raises(ValueError, match="bad column"):
+            next(results)
+
+
+def test_serial_without_executor():
+    assert list(map_columns(str, [1, 2])) == ["1", "2"]
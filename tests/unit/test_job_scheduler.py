@@ -0,0 +1,202 @@
+"""
+Description: Unit tests for the adaptive BigQuery job scheduler (src/connectors/bigquery/job_scheduler.py)
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+from google.api_core import exceptions as api_exceptions
+
+from src.connectors.bigquery import job_scheduler
+from src.connectors.bigquery.bigquery_connector import BigQueryConnectorContextManager
+from src.connectors.bigquery.job_scheduler import BigQueryJobScheduler, BigQueryQueryError, QuotaExceededError
+
+
+def rate_limited():
+    return api_exceptions.Forbidden("Exceeded rate limits", errors=[{"reason": "rateLimitExceeded"}])
+
+
+def quota_exceeded():
+    return api_exceptions.Forbidden("Quota exceeded", errors=[{"reason": "quotaExceeded"}])
+
+
+class FakeClient:
+    """Fails the first queries with the given errors, then answers every query with its text."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.calls = 0
+
+    def query(self, sql):
+        self.calls += 1
+        if self.errors:
+            raise self.errors.pop(0)
+        return sql
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Backoff delays the scheduler waited, at the upper bound of their jitter range."""
+    delays = []
+    monkeypatch.setattr(job_scheduler.random, "uniform", lambda low, high: high)
+    monkeypatch.setattr(job_scheduler.time, "sleep", delays.append)
+    return delays
+
+
+def test_rate_limited_job_is_retried_with_backoff_and_halves_the_limit(sleeps):
+    scheduler = BigQueryJobScheduler(max_concurrent_jobs=8, base_delay=1.0, max_delay=3.0)
+    client = FakeClient(rate_limited(), rate_limited(), rate_limited())
+
+    assert scheduler.run(lambda: client.query("SELECT 1")) == "SELECT 1"
+
+    assert client.calls == 4
+    assert sleeps == [1.0, 2.0, 3.0]
+    # 8 -> 4 -> 2 -> 1, then the successful retry completes a window of one job
+    assert scheduler.limit == 2
+    assert scheduler.in_flight == 0
+
+
+def test_too_many_requests_is_retried(sleeps):
+    scheduler = BigQueryJobScheduler(max_concurrent_jobs=4)
+    client = FakeClient(api_exceptions.TooManyRequests("slow down"))
+
+    scheduler.run(lambda: client.query("SELECT 1"))
+
+    assert client.calls == 2
+    assert scheduler.limit == 2
+
+
+def test_exhausted_quota_fails_fast(sleeps):
+    scheduler = BigQueryJobScheduler(max_concurrent_jobs=4)
+    client = FakeClient(quota_exceeded())
+
+    with pytest.raises(api_exceptions.Forbidden, match="Quota exceeded"):
+        scheduler.run(lambda: client.query("SELECT 1"))
+
+    assert client.calls == 1
+    assert sleeps == []
+    assert scheduler.limit == 4
+    assert scheduler.in_flight == 0
+
+
+def test_other_errors_are_not_retried(sleeps):
+    scheduler = BigQueryJobScheduler()
+    client = FakeClient(api_exceptions.BadRequest("Syntax error"))
+
+    with pytest.raises(api_exceptions.BadRequest):
+        scheduler.run(lambda: client.query("SELEC 1"))
+
+    assert client.calls == 1
+    assert sleeps == []
+
+
+def test_gives_up_after_max_retries(sleeps):
+    scheduler = BigQueryJobScheduler(max_concurrent_jobs=4, max_retries=2)
+    client = FakeClient(*[rate_limited() for _ in range(5)])
+
+    with pytest.raises(QuotaExceededError, match="after 2 retries"):
+        scheduler.run(lambda: client.query("SELECT 1"))
+
+    assert client.calls == 3
+    assert len(sleeps) == 2
+    assert scheduler.limit == 1
+    assert scheduler.in_flight == 0
+
+
+def test_limit_never_drops_below_minimum(sleeps):
+    scheduler = BigQueryJobScheduler(max_concurrent_jobs=8, min_concurrent_jobs=3)
+    client = FakeClient(*[rate_limited() for _ in range(4)])
+
+    scheduler.run(lambda: client.query("SELECT 1"))
+
+    assert scheduler.limit == 3
+
+
+def test_limit_grows_by_one_after_a_window_of_successes(sleeps):
+    scheduler = BigQueryJobScheduler(max_concurrent_jobs=4)
+    client = FakeClient(rate_limited(), rate_limited())
+
+    scheduler.run(lambda: client.query("SELECT 1"))
+    assert scheduler.limit == 2
+
+    for expected_limit in (2, 3, 3, 3, 4, 4, 4, 4, 4):
+        scheduler.run(lambda: client.query("SELECT 1"))
+        assert scheduler.limit == expected_limit
+
+
+def test_jobs_in_flight_stay_within_the_limit():
+    scheduler = BigQueryJobScheduler(max_concurrent_jobs=3)
+    lock = threading.Lock()
+    running, peak = [0], [0]
+
+    def job():
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.01)
+        with lock:
+            running[0] -= 1
+
+    threads = [threading.Thread(target=scheduler.run, args=(job,)) for _ in range(12)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert peak[0] == 3
+    assert scheduler.in_flight == 0
+
+
+class FakeBigQueryClient:
+    """`bigquery.Client.query` stand-in: raises the given errors first, then returns finished jobs."""
+
+    def __init__(self, *errors):
+        self.errors = list(errors)
+        self.job_configs = []
+
+    def query(self, sql, job_config=None):
+        self.job_configs.append(job_config)
+        if self.errors:
+            raise self.errors.pop(0)
+        return SimpleNamespace(result=lambda: None, total_bytes_processed=1024)
+
+
+def connector_with(client, max_retries=8):
+    connector = BigQueryConnectorContextManager(project_id="proj", max_concurrent_jobs=4)
+    connector.client = client
+    connector.scheduler.max_retries = max_retries
+    return connector
+
+
+def test_connector_retries_rate_limited_queries(sleeps):
+    client = FakeBigQueryClient(rate_limited())
+
+    connector_with(client)._run_query("SELECT 1")
+
+    assert len(client.job_configs) == 2
+
+
+def test_connector_reports_exhausted_quota_without_retrying(sleeps):
+    client = FakeBigQueryClient(quota_exceeded())
+
+    with pytest.raises(BigQueryQueryError, match="Quota exceeded") as excinfo:
+        connector_with(client)._run_query("SELECT 1")
+
+    assert not isinstance(excinfo.value, QuotaExceededError)
+    assert len(client.job_configs) == 1
+
+
+def test_connector_gives_up_on_persistent_rate_limits(sleeps):
+    client = FakeBigQueryClient(*[rate_limited() for _ in range(3)])
+
+    with pytest.raises(QuotaExceededError):
+        connector_with(client, max_retries=2)._run_query("SELECT 1")
+
+
+def test_dry_run_goes_through_the_scheduler(sleeps):
+    client = FakeBigQueryClient(rate_limited())
+
+    assert connector_with(client).dry_run("SELECT 1") == 1024
+    assert [config.dry_run for config in client.job_configs] == [True, True]
@@ -0,0 +1,73 @@
+"""
+Description: Unit tests for recording and replay in the offline connector (src/connectors/local/local_connector.py)
+"""
+
+import os
+
+import pyarrow as pa
+import pytest
+
+from src.connectors.local.local_connector import LocalConnectorContextManager
+from src.data_quality.sources import select_sql
+
+QUERY = "SELECT code FROM `proj.ds.items`"
+
+
+class FakeLiveConnector:
+    """Live connector stand-in that knows only `proj.ds.items` and counts its queries."""
+
+    dialect = "bigquery"
+    source_id = ("bigquery", "proj")
+    client = object()
+
+    def __init__(self):
+        self.queries = []
+
+    def get_arrow_sql(self, sql):
+        self.queries.append(sql)
+        if "proj.ds.items" not in sql:
+            raise RuntimeError("404 Not found: Table")
+        return pa.table({"code": ["a", "b", str(len(self.queries))]})
+
+    def select_sql(self, table_name, columns=None, where=None):
+        return f"SELECT * FROM (SELECT * FROM `{table_name}` WHERE day >= DATE '2025-01-01')"
+
+
+@pytest.fixture
+def live():
+    return FakeLiveConnector()
+
+
+def recorder(tmp_path, live):
+    return LocalConnectorContextManager(str(tmp_path), str(tmp_path / "recordings"), record_from=live)
+
+
+def test_recording_always_queries_live_and_replaces_the_recording(tmp_path, live):
+    with recorder(tmp_path, live) as connector:
+        assert connector.get_data_sql(QUERY)["code"].tolist() == ["a", "b", "1"]
+        assert connector.get_data_sql(QUERY)["code"].tolist() == ["a", "b", "2"]
+
+    with LocalConnectorContextManager(str(tmp_path), str(tmp_path / "recordings")) as connector:
+        assert connector.get_data_sql(QUERY)["code"].tolist() == ["a", "b", "2"]
+    assert len(live.queries) == 2
+
+
+def test_materialized_tables_are_queried_locally_and_not_recorded(tmp_path, live):
+    with recorder(tmp_path, live) as connector:
+        handle = connector.materialize(QUERY)
+
+        assert handle.count() == 3
+        assert handle.get_data(["code"], where="code <> 'a'")["code"].tolist() == ["b", "1"]
+
+    assert live.queries == [QUERY]
+    # Only the materialized query itself is recorded (its result and its SQL)
+    assert sorted(os.path.splitext(name)[1] for name in os.listdir(tmp_path / "recordings")) == [".parquet", ".sql"]
+
+
+def test_recorder_generates_the_same_queries_as_offline_replay(tmp_path, live):
+    with recorder(tmp_path, live) as recording, \
+            LocalConnectorContextManager(str(tmp_path), str(tmp_path / "recordings")) as offline:
+        assert select_sql(recording, "proj.ds.items") == select_sql(offline, "proj.ds.items")
+        assert recording.source_id == offline.source_id
+        for name in ("client", "query_builder", "dry_run", "prefetch"):
+            assert not hasattr(recording, name)
@@ -0,0 +1,130 @@
+"""
+Description: Unit tests for partition pruning of BigQuery check queries (src/connectors/bigquery/query_builder.py)
+"""
+
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+
+from src.connectors.bigquery.query_builder import PartitionAwareQueryBuilder, UnprunedQueryError
+from src.data_quality.data_quality_validation_library import DataQualityLibrary
+from src.data_quality.sources import window_note
+
+WINDOW = {"start": "2025-01-01", "end": "2025-01-08"}
+
+
+def make_table(schema: dict, time_partitioning=None, range_partitioning=None, require_partition_filter=False):
+    """Stand-in for `google.cloud.bigquery.Table` with the attributes `TableLayout` reads."""
+    return SimpleNamespace(
+        project="proj", dataset_id="ds", table_id="t",
+        schema=[SimpleNamespace(name=name, field_type=field_type) for name, field_type in schema.items()],
+        clustering_fields=None,
+        require_partition_filter=require_partition_filter,
+        time_partitioning=time_partitioning,
+        range_partitioning=range_partitioning,
+    )
+
+
+class FakeClient:
+    def __init__(self, table):
+        self.table = table
+        self.calls = 0
+
+    def get_table(self, table_name):
+        self.calls += 1
+        return self.table
+
+
+def builder(table, window=WINDOW, require_pruning=False):
+    return PartitionAwareQueryBuilder(FakeClient(table), window, require_pruning)
+
+
+def test_partition_filter_date_column():
+    table = make_table({"day": "DATE", "v": "INT64"}, time_partitioning=SimpleNamespace(type_="DAY", field="day"))
+
+    assert builder(table).partition_filter("proj.ds.t") == \
+        "`day` >= DATE '2025-01-01' AND `day` < DATE '2025-01-08'"
+
+
+def test_partition_filter_datetime_column():
+    table = make_table({"dt": "DATETIME"}, time_partitioning=SimpleNamespace(type_="HOUR", field="dt"))
+
+    assert builder(table).partition_filter("proj.ds.t") == \
+        "`dt` >= DATETIME '2025-01-01 00:00:00' AND `dt` < DATETIME '2025-01-08 00:00:00'"
+
+
+def test_partition_filter_timestamp_column_is_utc():
+    table = make_table({"ts": "TIMESTAMP"}, time_partitioning=SimpleNamespace(type_="DAY", field="ts"))
+
+    assert builder(table, {"start": "2025-01-01"}).partition_filter("proj.ds.t") == \
+        "`ts` >= TIMESTAMP '2025-01-01 00:00:00+00:00'"
+
+
+def test_partition_filter_ingestion_time():
+    table = make_table({"v": "STRING"}, time_partitioning=SimpleNamespace(type_="DAY", field=None))
+
+    assert builder(table).partition_filter("proj.ds.t") == (
+        "_PARTITIONTIME >= TIMESTAMP '2025-01-01 00:00:00+00:00' "
+        "AND _PARTITIONTIME < TIMESTAMP '2025-01-08 00:00:00+00:00'"
+    )
+
+
+def test_partition_filter_days_window():
+    table = make_table({"day": "DATE"}, time_partitioning=SimpleNamespace(type_="DAY", field="day"))
+    query_builder = builder(table, {"days": 7})
+    start, end = query_builder.window_bounds()
+
+    assert end is None
+    assert query_builder.partition_filter("proj.ds.t") == f"`day` >= DATE '{start.date().isoformat()}'"
+
+
+def test_partition_filter_range_partitioning():
+    table = make_table({"id": "INT64"}, range_partitioning=SimpleNamespace(field="id"))
+    query_builder = builder(table)
+
+    assert query_builder.partition_filter("proj.ds.t") is None
+    assert query_builder.table_expression("proj.ds.t") == "`proj.ds.t`"
+    with pytest.raises(UnprunedQueryError):
+        builder(table, require_pruning=True).table_expression("proj.ds.t")
+
+
+def test_partition_filter_without_window_or_partitioning():
+    partitioned = make_table({"day": "DATE"}, time_partitioning=SimpleNamespace(type_="DAY", field="day"))
+    plain = make_table({"day": "DATE"})
+
+    assert builder(partitioned, window=None).partition_filter("proj.ds.t") is None
+    assert builder(plain).partition_filter("proj.ds.t") is None
+    assert builder(plain, require_pruning=True).table_expression("proj.ds.t") == "`proj.ds.t`"
+
+
+def test_select_restricts_to_window_and_columns():
+    table = make_table({"day": "DATE", "v": "INT64"}, time_partitioning=SimpleNamespace(type_="DAY", field="day"))
+    query_builder = builder(table, {"start": "2025-01-01"})
+
+    assert query_builder.select("proj.ds.t", ["v"], "v > 0") == (
+        "SELECT `v` FROM (SELECT * FROM `proj.ds.t` WHERE `day` >= DATE '2025-01-01') WHERE v > 0"
+    )
+    assert query_builder.client.calls == 1
+
+
+def test_windowed_failures_say_so():
+    table = make_table({"day": "DATE"}, time_partitioning=SimpleNamespace(type_="DAY", field="day"))
+
+    class Connector:
+        dialect = "bigquery"
+
+        def __init__(self, window):
+            self.query_builder = builder(table, window)
+
+        def table_expression(self, table_name):
+            return self.query_builder.table_expression(table_name)
+
+        def get_data_sql(self, sql, compact=False):
+            return pd.DataFrame()
+
+    with pytest.raises(AssertionError, match=r"^Table proj.ds.t is empty within the check window$"):
+        DataQualityLibrary.check_table_is_not_empty(Connector(WINDOW), "proj.ds.t")
+    with pytest.raises(AssertionError, match=r"^Table proj.ds.t is empty$"):
+        DataQualityLibrary.check_table_is_not_empty(Connector(None), "proj.ds.t")
+    assert window_note(pd.DataFrame()) == ""
@@ -0,0 +1,111 @@
+"""
+Description: Unit tests for type alignment of compared datasets (src/data_quality/schema_alignment.py)
+"""
+
+import gc
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pytest
+
+from src.data_quality.schema_alignment import SOURCE_SCHEMA_ATTR, TIMESTAMP, SchemaAligner, align
+
+
+def test_align_does_not_modify_inputs():
+    df1 = pd.DataFrame({"id": [1, 2, 3], "value": ["1.5", "2", None]})
+    df2 = pd.DataFrame({"id": [1.0, 2.0, 3.0], "value": [1.5, 2.0, np.nan]})
+    before1, before2 = df1.copy(), df2.copy()
+
+    aligned1, aligned2 = align(df1, df2, ["id", "value"])
+
+    pd.testing.assert_frame_equal(df1, before1)
+    pd.testing.assert_frame_equal(df2, before2)
+    assert aligned1["id"].dtype == aligned2["id"].dtype == "float64"
+    assert aligned1["value"].tolist()[:2] == aligned2["value"].tolist()[:2] == [1.5, 2.0]
+
+
+def test_align_returns_inputs_when_nothing_is_cast():
+    df1 = pd.DataFrame({"id": [1, 2]})
+    df2 = pd.DataFrame({"id": [2, 3]})
+
+    aligned1, aligned2 = align(df1, df2, ["id"])
+
+    assert aligned1 is df1 and aligned2 is df2
+
+
+def test_align_compares_tz_aware_and_naive_timestamps_in_utc():
+    aware = pd.DataFrame({"ts": pd.to_datetime(["2025-01-01 10:00", "2025-01-02 00:00"]).tz_localize("UTC")})
+    naive = pd.DataFrame({"ts": pd.to_datetime(["2025-01-01 10:00", "2025-01-02 00:00"])})
+
+    aligned1, aligned2 = align(aware, naive, ["ts"])
+
+    assert str(aligned1["ts"].dt.tz) == str(aligned2["ts"].dt.tz) == "UTC"
+    assert aligned1["ts"].equals(aligned2["ts"])
+    assert naive["ts"].dt.tz is None
+
+
+def test_align_uses_source_schema_over_pandas_dtype():
+    # A DATE column read as strings on one side is still compared as a timestamp
+    df1 = pd.DataFrame({"day": ["2025-01-01", "2025-01-02"]})
+    df1.attrs[SOURCE_SCHEMA_ATTR] = {"day": TIMESTAMP}
+    df2 = pd.DataFrame({"day": pd.to_datetime(["2025-01-01", "2025-01-02"])})
+
+    aligned1, aligned2 = align(df1, df2, ["day"])
+
+    assert aligned1["day"].equals(aligned2["day"])
+
+
+def test_align_keeps_missing_strings_missing():
+    # Object column with None against an Arrow-backed string column (e.g. a compact load) with NaN
+    df1 = pd.DataFrame({"code": ["a", None, "c"]})
+    df2 = pd.DataFrame({"code": pd.Series(["a", np.nan, "c"], dtype=pd.StringDtype("pyarrow"))})
+
+    aligned1, aligned2 = align(df1, df2, ["code"])
+
+    assert aligned1["code"].dtype == aligned2["code"].dtype
+    assert aligned1["code"].isna().tolist() == aligned2["code"].isna().tolist() == [False, True, False]
+    assert aligned1["code"].equals(aligned2["code"])
+
+
+def test_align_arrow_tables():
+    table1 = pa.table({"ts": pa.array([0, 60_000_000], pa.timestamp("us", tz="UTC")), "n": pa.array([1, 2])})
+    table2 = pa.table({"ts": pa.array([0, 60_000_000], pa.timestamp("us")), "n": pa.array([1.0, 2.0])})
+
+    aligned1, aligned2 = align(table1, table2, ["ts", "n"])
+
+    assert aligned1.schema == aligned2.schema
+    assert aligned1.schema.field("ts").type == pa.timestamp("us", tz="UTC")
+    assert aligned1.equals(aligned2)
+
+
+def test_align_missing_column():
+    with pytest.raises(ValueError, match="Column 'b' not found in df2"):
+        align(pd.DataFrame({"a": [1], "b": [2]}), pd.DataFrame({"a": [1]}), ["a", "b"])
+
+
+def test_aligner_caches_views_until_an_input_is_collected():
+    aligner = SchemaAligner()
+    df1 = pd.DataFrame({"id": [1, 2, 3]})
+    df2 = pd.DataFrame({"id": ["1", "2", "3"]})
+
+    views = aligner.align(df1, df2, ["id"])
+
+    assert aligner.align(df1, df2, ["id"]) is views
+    assert len(aligner._views) == 1
+
+    del df1, views
+    gc.collect()
+
+    assert aligner._views == {}
+
+
+def test_aligner_does_not_cache_uncast_inputs():
+    aligner = SchemaAligner()
+    df1 = pd.DataFrame({"id": [1, 2]})
+    df2 = pd.DataFrame({"id": [1, 2]})
+
+    aligned1, aligned2 = aligner.align(df1, df2, ["id"])
+
+    assert aligned1 is df1 and aligned2 is df2
+    assert aligner._views == {}
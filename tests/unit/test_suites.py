@@ -0,0 +1,150 @@
+"""
+Description: Unit tests for the planner of declarative check suites (src/data_quality/suites.py)
+"""
+
+from types import SimpleNamespace
+
+import pandas as pd
+import pytest
+from google.api_core import exceptions as api_exceptions
+
+from src.connectors.bigquery.job_scheduler import BigQueryQueryError, QuotaExceededError
+from src.connectors.local.local_connector import LocalConnectorContextManager
+from src.data_quality.suites import PUSHDOWN, SAMPLE, GroupPlan, GroupRun, build_groups, is_missing_table_error
+from src.data_quality.violations import ViolationError
+
+TABLE = "proj.ds.items"
+
+CHECKS = [
+    {"check": "not_empty"},
+    {"check": "not_null", "columns": ["code", "size"]},
+    {"check": "duplicates", "columns": ["code", "size"], "each_column": True},
+    {"check": "column_validity", "rules": {"size": {"min": 0, "max": 10}, "kind": {"allowed_values": ["a", "b"]}}},
+]
+
+
+def plan_for(connector, checks=CHECKS, sample_rows=None):
+    suites = {"items": {"table": TABLE, "sample_rows": sample_rows, "checks": checks}}
+    return GroupPlan(build_groups(suites)[0], connector)
+
+
+@pytest.fixture
+def local_connector(tmp_path):
+    pd.DataFrame({
+        "code": ["x1", "x2", "x2", None],
+        "size": [1, 5, 12, 3],
+        "kind": ["a", "b", "c", None],
+    }).to_parquet(tmp_path / f"{TABLE}.parquet", index=False)
+    with LocalConnectorContextManager(str(tmp_path)) as connector:
+        yield connector
+
+
+def test_pushdown_sql_has_one_aggregate_per_check_column():
+    plan = plan_for(SimpleNamespace(dialect="bigquery"))
+
+    assert plan.mode == PUSHDOWN
+    assert plan.columns == ["code", "size", "kind"]
+    assert plan.pushdown_sql() == (
+        "WITH src AS (SELECT `code`, `size`, `kind`, "
+        "COUNT(*) OVER (PARTITION BY `code`) AS dq_check_2_0, "
+        "COUNT(*) OVER (PARTITION BY `size`) AS dq_check_2_1 "
+        f"FROM `{TABLE}`) "
+        "SELECT COUNT(*) AS dq_rows, "
+        "SUM(CASE WHEN `code` IS NULL THEN 1 ELSE 0 END) AS dq_check_1_0, "
+        "SUM(CASE WHEN `size` IS NULL THEN 1 ELSE 0 END) AS dq_check_1_1, "
+        "SUM(CASE WHEN dq_check_2_0 > 1 THEN 1 ELSE 0 END) AS dq_check_2_0, "
+        "SUM(CASE WHEN dq_check_2_1 > 1 THEN 1 ELSE 0 END) AS dq_check_2_1, "
+        "SUM(CASE WHEN (`size` < 0) OR (`size` > 10) THEN 1 ELSE 0 END) AS dq_check_3_0, "
+        "SUM(CASE WHEN (`kind` IS NULL OR `kind` NOT IN ('a', 'b')) THEN 1 ELSE 0 END) AS dq_check_3_1 "
+        "FROM src"
+    )
+
+
+def test_pushdown_sql_without_columns_selects_a_constant():
+    plan = plan_for(SimpleNamespace(dialect="postgres"), checks=[{"check": "not_empty", "min_rows": 5}])
+
+    assert plan.pushdown_sql() == \
+        f"WITH src AS (SELECT 1 AS dq_one FROM {TABLE}) SELECT COUNT(*) AS dq_rows FROM src"
+
+
+def test_pushdown_counts_answer_every_check(local_connector):
+    plan = plan_for(local_connector)
+    counts = local_connector.get_data_sql(plan.pushdown_sql()).iloc[0].to_dict()
+
+    assert counts == {
+        "dq_rows": 4,
+        "dq_check_1_0": 1, "dq_check_1_1": 0,
+        "dq_check_2_0": 2, "dq_check_2_1": 0,
+        "dq_check_3_0": 1, "dq_check_3_1": 2,
+    }
+
+    group_run = GroupRun(plan)
+    checks = {check.check: check for check in plan.group.checks}
+    group_run.run(checks["not_empty"])
+    with pytest.raises(AssertionError, match="Null values found in column: code"):
+        group_run.run(checks["not_null"])
+    with pytest.raises(ViolationError, match="Duplicate values found in column 'code'"):
+        group_run.run(checks["duplicates"])
+    with pytest.raises(ViolationError, match="Invalid values found"):
+        group_run.run(checks["column_validity"])
+
+
+def test_sample_percentage_uses_rows_in_window():
+    class Client:
+        def get_table(self, table_name):
+            schema = [SimpleNamespace(name=name, field_type="STRING") for name in ("code", "size", "kind", "day")]
+            return SimpleNamespace(table_type="TABLE", num_rows=1_000_000, num_bytes=10 ** 9, schema=schema)
+
+    queries = []
+
+    class Connector:
+        dialect = "bigquery"
+        client = Client()
+        query_builder = SimpleNamespace(partition_filter=lambda table_name: "`day` >= DATE '2025-01-01'")
+
+        def get_data_sql(self, sql, compact=False):
+            queries.append(sql)
+            return pd.DataFrame({"dq_rows": [10_000]})
+
+    plan = plan_for(Connector(), checks=[{"check": "not_null", "columns": ["code"]}], sample_rows=100)
+    plan.mode = SAMPLE
+
+    assert plan.load_sql() == (
+        f"SELECT `code` FROM `{TABLE}` TABLESAMPLE SYSTEM (1.0000 PERCENT) "
+        "WHERE `day` >= DATE '2025-01-01' LIMIT 100"
+    )
+    assert queries == [f"SELECT COUNT(*) AS dq_rows FROM `{TABLE}` WHERE `day` >= DATE '2025-01-01'"]
+
+
+def raised_from(cause, error):
+    try:
+        raise error from cause
+    except Exception as e:
+        return e
+
+
+@pytest.mark.parametrize("error, missing", [
+    (api_exceptions.NotFound("Not found: Table proj:ds.items"), True),
+    (api_exceptions.Forbidden("Access Denied", errors=[{"reason": "accessDenied"}]), True),
+    (raised_from(api_exceptions.NotFound("Not found"), BigQueryQueryError("Failed to execute SQL query")), True),
+    (api_exceptions.Forbidden("Exceeded rate limits", errors=[{"reason": "rateLimitExceeded"}]), False),
+    (api_exceptions.Forbidden("Quota exceeded", errors=[{"reason": "quotaExceeded"}]), False),
+    (raised_from(api_exceptions.Forbidden("Exceeded rate limits", errors=[{"reason": "rateLimitExceeded"}]),
+                 QuotaExceededError("BigQuery rate limit still exceeded")), False),
+    (api_exceptions.BadRequest("Syntax error"), False),
+])
+def test_is_missing_table_error(error, missing):
+    assert is_missing_table_error(error) is missing
+
+
+def test_other_errors_are_raised_instead_of_reported_as_missing_table():
+    class Connector:
+        dialect = "bigquery"
+
+        def get_data_sql(self, sql, compact=False):
+            raise QuotaExceededError("BigQuery rate limit still exceeded after 8 retries")
+
+    plan = plan_for(Connector(), checks=[{"check": "not_null", "columns": ["code"]}])
+
+    with pytest.raises(QuotaExceededError):
+        GroupRun(plan).run(plan.group.checks[0])
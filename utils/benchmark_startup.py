@@ -0,0 +1,61 @@
+# utils/benchmark_startup.py
+
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+# Modules whose import cost matters for suite startup
+MODULES = [
+    "tests.fixtures.dq_plugin",
+    "src.data_quality.data_quality_validation_library",
+    "src.connectors.bigquery.bigquery_connector",
+    "src.connectors.local.local_connector",
+    "pandas",
+    "pyarrow",
+    "google.cloud.bigquery",
+]
+
+
+def import_time_ms(module: str) -> float:
+    """
+    Cumulative import time of `module` in a fresh interpreter, in milliseconds
+    (from `python -X importtime`, so only the import itself is measured).
+    """
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        return float("nan")
+    for line in reversed(result.stderr.splitlines()):
+        # "import time: self [us] | cumulative | imported package"
+        parts = line.split("|")
+        if len(parts) == 3 and parts[2].strip() == module:
+            return int(parts[1]) / 1000
+    return float("nan")
+
+
+def command_time_s(args: list, runs: int = 5) -> float:
+    """Median wall time of a command over `runs` runs, in seconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(args, cwd=REPO_ROOT, capture_output=True)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings)
+
+
+if __name__ == "__main__":
+    print("Import time (fresh interpreter):")
+    for module in MODULES:
+        print(f"   {module:<50} {import_time_ms(module):8.1f} ms")
+
+    pytest_cmd = [sys.executable, "-m", "pytest", "-p", "no:cacheprovider", "-q"]
+    print("Suite startup (median of 5 runs):")
+    print(f"   {'pytest --collect-only':<50} {command_time_s(pytest_cmd + ['--collect-only']):8.2f} s")
+    print(f"   {'pytest -m smoke (collection + deselection)':<50} "
+          f"{command_time_s(pytest_cmd + ['-m', 'smoke', '-p', 'no:xdist']):8.2f} s")